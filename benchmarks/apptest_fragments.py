@@ -0,0 +1,63 @@
+"""
+Fragment-scoped reruns for the AppTest-based benchmarks.
+
+AppTest.run() always re-executes the whole script, but in the browser an interaction
+with a widget inside an @st.fragment asks the script runner to rerun only that
+fragment. fragment_rerun() sends the script runner that same request (a rerun with
+the fragment's id in RerunData.fragment_id_queue), so a benchmark times the rerun a
+user actually triggers instead of a stand-in script.
+
+Relies on AppTest internals (streamlit.testing.v1.app_test.LocalScriptRunner); tested
+with the streamlit version in requirements.txt.
+"""
+import dataclasses
+
+import streamlit.testing.v1.app_test as app_test_module
+from streamlit.runtime.scriptrunner_utils.script_requests import ScriptRequests
+from streamlit.testing.v1.local_script_runner import LocalScriptRunner
+
+_fragment_ids = None  # fragment ids of the rerun in progress; None for a full run
+_last_messages = []   # forward messages of the last run, to find which fragment holds a widget
+
+
+class _FragmentScriptRunner(LocalScriptRunner):
+    def request_rerun(self, rerun_data):
+        if _fragment_ids:
+            self._requests = ScriptRequests()  # drop the full run queued when the runner was created
+            rerun_data = dataclasses.replace(rerun_data, fragment_id_queue=list(_fragment_ids),
+                                             is_fragment_scoped_rerun=True)
+        return super().request_rerun(rerun_data)
+
+    def run(self, *args, **kwargs):
+        global _last_messages
+        tree = super().run(*args, **kwargs)
+        _last_messages = list(self.forward_msgs())
+        return tree
+
+
+app_test_module.LocalScriptRunner = _FragmentScriptRunner
+
+
+def fragment_of(widget_key):
+    """Id of the fragment that rendered the widget with `widget_key` in the last run, or None."""
+    for msg in _last_messages:
+        if msg.WhichOneof("type") != "delta" or msg.delta.WhichOneof("type") != "new_element":
+            continue
+        element = msg.delta.new_element
+        widget_id = getattr(getattr(element, element.WhichOneof("type")), "id", "")
+        if isinstance(widget_id, str) and widget_id.endswith(f"-{widget_key}"):
+            return msg.delta.fragment_id or None
+    return None
+
+
+def fragment_rerun(app_test, widget_key):
+    """Rerun only the fragment holding `widget_key`, as a browser interaction with it would."""
+    global _fragment_ids
+    fragment_id = fragment_of(widget_key)
+    if fragment_id is None:
+        raise ValueError(f"No fragment renders a widget with key {widget_key!r}")
+    _fragment_ids = [fragment_id]
+    try:
+        return app_test.run()
+    finally:
+        _fragment_ids = None
@@ -0,0 +1,160 @@
+"""
+Benchmark: art forms transform throughput, legacy iterrows loop vs column-wise transform.
+
+Generates synthetic DANCE_FINAL / CRAFT_IMAGE frames (90% crafts, a third of them
+without a description) and reports rows/sec for each size. The legacy loop is a copy
+of the pre-vectorization get_art_forms_combined body and is only run up to
+--legacy-max rows because it takes minutes at 1M rows.
+
+Run from the repository root:
+    python benchmarks/bench_art_forms_transform.py --sizes 10000 100000 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.art_forms import transform_region_art_forms, transform_crafts, combine_art_forms  # noqa: E402
+from utils.states import resolve_states, state_centroids  # noqa: E402
+
+STATE_COORDS = {
+    'Bihar': [25.4, 85.4], 'Odisha': [20.3, 85.8], 'Uttar Pradesh': [26.8, 80.9], 'Kerala': [10.8, 76.3],
+    'Jammu and Kashmir': [34.1, 74.8], 'Odisha, West Bengal': [21.5, 87.0],
+}
+STATES = list(STATE_COORDS) + ['Orissa', 'Jammu & Kashmir', 'N/A']
+
+
+def make_raw_frames(num_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    num_dances = num_rows // 10
+    num_crafts = num_rows - num_dances
+    state_idx = rng.integers(0, len(STATES), num_rows)
+    states = np.array(STATES, dtype=object)[state_idx]
+    dances = pd.DataFrame({
+        'DANCE_NAME_SF': [f'Dance {i}' for i in range(num_dances)],
+        'DANCE_REGION_STATE': states[:num_dances],
+        'DANCE_DESC': [f'Folk dance number {i}.' for i in range(num_dances)],
+        'DANCE_IMAGE_URL_SF': np.where(rng.random(num_dances) < 0.5, 'https://example.org/dance.png', None),
+    })
+    crafts = pd.DataFrame({
+        'CRAFT_NAME_SF': [f'Craft {i % 5000} / Weave' for i in range(num_crafts)],
+        'CRAFT_DESCRIPTION_SF': np.where(rng.random(num_crafts) < 0.33, '', 'Handmade in the village.'),
+        'CRAFT_STATE_SF': states[num_dances:],
+        'CRAFT_DISTRICT_SF': np.array([f'District {i}' for i in range(40)], dtype=object)[rng.integers(0, 40, num_crafts)],
+        'CRAFT_VILLAGE_SF': np.where(rng.random(num_crafts) < 0.2, 'N/A', 'Village'),
+        'CRAFT_IMAGE_URL_SF': np.where(rng.random(num_crafts) < 0.5, ' https://example.org/craft.png ', None),
+    })
+    return dances, crafts
+
+
+def legacy_combine(dances_sf_df_raw, crafts_sf_df_raw, state_coords_dict, overrides):
+    """Reference copy of the previous row-by-row implementation."""
+    def get_image_url(name, default_text, sf_image_url_value=None):
+        if sf_image_url_value and pd.notna(sf_image_url_value) and str(sf_image_url_value).strip():
+            return str(sf_image_url_value).strip()
+        if name in overrides:
+            return overrides[name]
+        image_text = name.replace(" ", "+").replace("/", "_") if pd.notna(name) else default_text
+        return f'https://via.placeholder.com/300x200.png?text={image_text}'
+
+    all_data_frames = []
+    transformed_dances_list = []
+    for _, row in dances_sf_df_raw.iterrows():
+        state = row.get('DANCE_REGION_STATE', None)
+        name = row.get('DANCE_NAME_SF', 'Unknown Dance')
+        desc = row.get('DANCE_DESC', f'Traditional dance form from {state if state else "India"}.')
+        image_to_use = get_image_url(name, "Dance", row.get('DANCE_IMAGE_URL_SF', None))
+        lat, lon = (state_coords_dict.get(state, [None, None])) if state else (None, None)
+        transformed_dances_list.append({
+            'name': name, 'type': 'Dance', 'state': state, 'gi_tag': False,
+            'description': desc, 'image_url': image_to_use, 'latitude': lat, 'longitude': lon,
+            'govt_scheme': 'To be updated', 'allocation_amount': 'N/A', 'artisan_cooperative': 'To be updated',
+            'district': 'N/A', 'village_equivalent': 'N/A'
+        })
+    all_data_frames.append(pd.DataFrame(transformed_dances_list))
+
+    transformed_crafts_list = []
+    for _, row in crafts_sf_df_raw.iterrows():
+        name = row.get('CRAFT_NAME_SF', 'Unknown Craft')
+        description_from_sf = row.get('CRAFT_DESCRIPTION_SF', '')
+        state_from_sf = row.get('CRAFT_STATE_SF', 'N/A')
+        district_from_sf = row.get('CRAFT_DISTRICT_SF', 'N/A')
+        village_from_sf = row.get('CRAFT_VILLAGE_SF', 'N/A')
+        image_to_use = get_image_url(name, "Craft", row.get('CRAFT_IMAGE_URL_SF', None))
+        lat, lon = (state_coords_dict.get(state_from_sf, [None, None])) if state_from_sf and pd.notna(state_from_sf) else (None, None)
+        final_description = description_from_sf
+        if not (pd.notna(description_from_sf) and description_from_sf.strip()):
+            loc_parts = []
+            if village_from_sf and village_from_sf != 'N/A': loc_parts.append(village_from_sf)
+            if district_from_sf and district_from_sf != 'N/A': loc_parts.append(district_from_sf)
+            if state_from_sf and state_from_sf != 'N/A': loc_parts.append(state_from_sf)
+            final_description = f"A traditional {name} from {', '.join(loc_parts)}." if loc_parts else f"A traditional {name} from India."
+        transformed_crafts_list.append({
+            'name': name, 'type': 'Craft', 'state': state_from_sf, 'gi_tag': False,
+            'description': final_description, 'image_url': image_to_use, 'latitude': lat, 'longitude': lon,
+            'govt_scheme': 'To be updated', 'allocation_amount': 'N/A', 'artisan_cooperative': 'To be updated',
+            'district': district_from_sf, 'village_equivalent': village_from_sf
+        })
+    all_data_frames.append(pd.DataFrame(transformed_crafts_list))
+
+    combined_df = pd.concat(all_data_frames, ignore_index=True)
+    combined_df['state'] = combined_df['state'].astype(str)
+    combined_df.drop_duplicates(subset=['name', 'state'], keep='first', inplace=True)
+    return combined_df
+
+
+def vectorized_combine(dances, crafts, state_coords, overrides):
+    return combine_art_forms([
+        transform_region_art_forms(dances, 'Dance', 'DANCE_NAME_SF', 'DANCE_REGION_STATE', 'DANCE_DESC',
+                                   'DANCE_IMAGE_URL_SF', state_coords, overrides,
+                                   default_description='Traditional dance form from {}.'),
+        transform_crafts(crafts, state_coords, overrides),
+    ])
+
+
+def check_equivalence(num_rows=5000):
+    dances, crafts = make_raw_frames(num_rows, seed=1)
+    overrides = {'Dance 3': 'https://example.org/override.png'}
+    # The legacy loop predates the state dimension: give it canonical labels and centroids.
+    canonical_dances = dances.assign(DANCE_REGION_STATE=resolve_states(dances['DANCE_REGION_STATE'])['label'])
+    canonical_crafts = crafts.assign(CRAFT_STATE_SF=resolve_states(crafts['CRAFT_STATE_SF'])['label'])
+    legacy_coords = {**state_centroids(), **STATE_COORDS}
+    expected = legacy_combine(canonical_dances, canonical_crafts, legacy_coords, overrides).reset_index(drop=True)
+    actual = vectorized_combine(dances, crafts, STATE_COORDS, overrides).reset_index(drop=True)
+    actual = actual.drop(columns=['state_id', 'state_mask', 'region'])
+    for col in ['latitude', 'longitude']:
+        expected[col] = pd.to_numeric(expected[col])
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+    print(f"equivalence check passed on {num_rows:,} rows")
+
+
+def time_it(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--legacy-max", type=int, default=100_000, help="Largest size to run the legacy loop on.")
+    args = parser.parse_args()
+
+    check_equivalence()
+    print(f"{'rows':>10} {'legacy rows/s':>15} {'vectorized rows/s':>18} {'speedup':>8}")
+    for size in args.sizes:
+        dances, crafts = make_raw_frames(size)
+        vectorized = time_it(vectorized_combine, dances, crafts, STATE_COORDS, {})
+        if size <= args.legacy_max:
+            legacy = time_it(legacy_combine, dances, crafts, STATE_COORDS, {})
+            print(f"{size:>10,} {size / legacy:>15,.0f} {size / vectorized:>18,.0f} {legacy / vectorized:>7.1f}x")
+        else:
+            print(f"{size:>10,} {'(skipped)':>15} {size / vectorized:>18,.0f} {'-':>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark: latency of the pages' CULTURE_HERITAGE queries on each data backend.
+
+Runs each loader's SQL (copied from the pages, plus an Art Forms pushdown page) directly
+against the connection of each requested backend (see utils/connection.py), bypassing
+the stale-while-revalidate cache, and reports the first-call latency and the median and
+p95 of the warm calls. --scale replicates the fixture rows to load-test the embedded
+engine at production-like sizes.
+
+Run from the repository root (the live backend needs the app's Snowflake secrets):
+    python benchmarks/bench_backend_latency.py --backends fixtures offline live --runs 20
+    python benchmarks/bench_backend_latency.py --scale 1000
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import pyarrow as pa
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.art_form_queries import build_art_forms_page_query, normalize_art_form_filters  # noqa: E402
+from utils.connection import get_culture_heritage_connection  # noqa: E402
+from utils.local_engine import FixtureConnection  # noqa: E402
+
+LOADER_QUERIES = {
+    "tourism_trends": """
+        SELECT YEAR, DOMESTIC_TOURIST_VISITS, FOREIGN_TOURIST_VISITS,
+               ANNUAL_GROWTH_RATE_DOMESTIC, ANNUAL_GROWTH_RATE_FOREIGN
+        FROM CULTURE_HERITAGE.PUBLIC.TOURISM_TRENDS ORDER BY YEAR ASC;""",
+    "crafts": """
+        SELECT "CRAFT" AS CRAFT_NAME_SF, "DESCRIPTION" AS CRAFT_DESCRIPTION_SF, "STATE" AS CRAFT_STATE_SF,
+               "DISTRICT" AS CRAFT_DISTRICT_SF, "SUB_DISTRICT" AS CRAFT_VILLAGE_SF, "IMAGE_URL" AS CRAFT_IMAGE_URL_SF
+        FROM "CULTURE_HERITAGE"."PUBLIC"."CRAFT_IMAGE";""",
+    "dances": """
+        SELECT "DANCE" AS DANCE_NAME_SF, "REGION_STATE" AS DANCE_REGION_STATE, "DESCRIPTION" AS DANCE_DESC,
+               "IMAGE_URL" AS DANCE_IMAGE_URL_SF
+        FROM "CULTURE_HERITAGE"."PUBLIC"."DANCE_FINAL";""",
+    "unesco_sites": """
+        SELECT NAME AS "Name", CITY AS "City", DISTRICT AS "District", STATE_UT AS "State/UT",
+               DESCRIPTION AS "Short Description", LATITUDE AS "Latitude", LONGITUDE AS "Longitude"
+        FROM UNESCO_INDIA_SITES;""",
+    "festivals": """
+        SELECT "STATE", "FESTIVAL_NAME", "TIME_OF_YEAR", "SHORT_DESCRIPTION", "IMAGE_URL"
+        FROM "CULTURE_HERITAGE"."PUBLIC"."FESTIVALS_FINAL";""",
+}
+
+
+class ScaledFixtureConnection(FixtureConnection):
+    """Fixture engine with every table's rows repeated `scale` times."""
+
+    def __init__(self, scale):
+        self.scale = scale
+        super().__init__()
+
+    def load_tables(self):
+        tables, version = super().load_tables()
+        return {name: pa.concat_tables([table] * self.scale) for name, table in tables.items()}, version
+
+
+def benchmark_queries():
+    queries = [(name, sql, None) for name, sql in LOADER_QUERIES.items()]
+    filters = normalize_art_form_filters("All States", "All Types", "weav")
+    sql, params = build_art_forms_page_query(filters, page_size=24)
+    queries.append(("art_forms_page (pushdown)", sql, params))
+    return queries
+
+
+def time_query(conn, sql, params, runs):
+    timings = []
+    rows = 0
+    for _ in range(runs + 1):
+        start = time.perf_counter()
+        df = conn.query(sql, ttl=0, params=params)
+        timings.append(time.perf_counter() - start)
+        rows = len(df)
+    warm = sorted(timings[1:])
+    p95 = warm[min(len(warm) - 1, int(round(0.95 * (len(warm) - 1))))]
+    return rows, timings[0], statistics.median(warm), p95
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=["fixtures"],
+                        help="Data modes to compare: live, snapshot, offline, fixtures.")
+    parser.add_argument("--runs", type=int, default=20, help="Warm runs per query.")
+    parser.add_argument("--scale", type=int, default=1, help="Repeat the fixture rows this many times.")
+    args = parser.parse_args()
+
+    print(f"{'backend':<10} {'query':<26} {'rows':>9} {'first ms':>9} {'p50 ms':>8} {'p95 ms':>8}")
+    for backend in args.backends:
+        try:
+            if backend == "fixtures" and args.scale > 1:
+                conn = ScaledFixtureConnection(args.scale)
+            else:
+                conn = get_culture_heritage_connection(backend)
+        except Exception as e:
+            print(f"{backend:<10} unavailable: {e}")
+            continue
+        for name, sql, params in benchmark_queries():
+            rows, first, p50, p95 = time_query(conn, sql, params, args.runs)
+            print(f"{backend:<10} {name:<26} {rows:>9,} {first * 1000:>9.2f} {p50 * 1000:>8.2f} {p95 * 1000:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark: cost of a slide change on the home page, full rerun vs fragment rerun.
+
+Before the slideshow and featured art form card were fragments, every prev/next click
+re-executed all of home.py. Now a click only re-executes the fragment it belongs to.
+This script times both with Streamlit's AppTest harness (no browser, no Snowflake):
+
+  * full rerun     - AppTest run of the whole home.py script
+  * fragment rerun - the slideshow fragment alone, rerun the way the script runner
+                     reruns it after a click in the browser (benchmarks/apptest_fragments.py)
+
+Run from the repository root:
+    python benchmarks/bench_home_reruns.py --runs 30
+"""
+import argparse
+import os
+import statistics
+import time
+
+from apptest_fragments import fragment_rerun
+from streamlit.testing.v1 import AppTest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HOME_SCRIPT = os.path.join(REPO_ROOT, "home.py")
+
+
+def time_reruns(app_test, runs, click_key, fragment=False):
+    """Run the app once, then time `runs` reruns triggered by clicking `click_key`.
+
+    With `fragment`, each click reruns only the fragment holding the button.
+    """
+    app_test.run()
+    app_test.toggle(key="slideshow_autoplay").set_value(False).run()
+    timings = []
+    for _ in range(runs):
+        app_test.button(key=click_key).click()
+        start = time.perf_counter()
+        if fragment:
+            fragment_rerun(app_test, click_key)
+        else:
+            app_test.run()
+        timings.append((time.perf_counter() - start) * 1000)
+        if app_test.exception:
+            raise RuntimeError(app_test.exception[0].value)
+    return timings
+
+
+def report(label, timings):
+    print(f"{label:<16} median {statistics.median(timings):8.2f} ms   "
+          f"p90 {sorted(timings)[int(len(timings) * 0.9) - 1]:8.2f} ms   n={len(timings)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=30, help="Number of slide changes to time per mode.")
+    args = parser.parse_args()
+
+    os.chdir(REPO_ROOT)
+    full = time_reruns(AppTest.from_file(HOME_SCRIPT, default_timeout=60), args.runs, "next_side_btn")
+    fragment = time_reruns(AppTest.from_file(HOME_SCRIPT, default_timeout=60), args.runs, "next_side_btn",
+                           fragment=True)
+
+    report("full rerun", full)
+    report("fragment rerun", fragment)
+    print(f"speedup          {statistics.median(full) / statistics.median(fragment):8.2f}x per slide change")
+
+
+if __name__ == "__main__":
+    main()
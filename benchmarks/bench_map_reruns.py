@@ -0,0 +1,141 @@
+"""
+Benchmark: server reruns caused by one user session on the Cultural Hotspots map.
+
+The map component sends its state back (and Streamlit reruns the script) whenever one
+of its returned values changes. Before, the map returned everything, so every pan and
+zoom reran the whole page: map, UNESCO statistics chart, ASI trend tables and top
+monument charts. Now the map, search and site details are one fragment, and every
+rendering returns clicks only (utils/site_map.returned_map_events): a marker click, or
+in viewport mode an explicit "Search this area" click, which reports the view.
+
+Rerun counts are estimates: without a browser, this script replays a simulated session
+(a random walk of pans and zooms with a few marker clicks and area searches) through a
+copy of the component's send rule (it sends when the returned values change). Rerun
+times are measured with Streamlit's AppTest harness on the fixture backend (no
+browser, no Snowflake): a full page rerun, and a rerun of the map fragment alone
+issued the way the browser requests it (benchmarks/apptest_fragments.py).
+
+  * before           - every interaction, full page rerun
+  * after (markers)  - marker clicks only, fragment rerun
+  * after (viewport) - marker clicks and area searches, fragment rerun
+
+Run from the repository root:
+    python benchmarks/bench_map_reruns.py --interactions 60 --clicks 5 --searches 5 --runs 10
+"""
+import argparse
+import glob
+import os
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault("CULTURAL_CANVAS_DATA_MODE", "fixtures")
+
+from apptest_fragments import fragment_rerun  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+from utils.site_map import SEARCH_AREA_PREFIX, returned_map_events  # noqa: E402
+
+PAGE_SCRIPT = glob.glob(os.path.join(REPO_ROOT, "pages", "2_*Cultural_Hotspots_Map.py"))[0]
+FRAGMENT_WIDGET_KEY = "unesco_map_mode"  # a widget inside the map fragment
+
+
+def simulate_session(interactions, clicks, searches, seed=0):
+    """Full map state on load and after each interaction.
+
+    A pan/zoom random walk with `clicks` marker clicks and `searches` "Search this area" clicks.
+    """
+    rng = random.Random(seed)
+    lat, lng, zoom = 20.6, 79.0, 5
+    special = rng.sample(range(interactions), min(clicks + searches, interactions))
+    click_at, search_at = set(special[:clicks]), set(special[clicks:])
+    span = 40.0 / 2 ** (zoom - 4)
+    state = {"last_object_clicked": None, "last_object_clicked_tooltip": None, "zoom": zoom,
+             "bounds": {"_southWest": {"lat": lat - span / 2, "lng": lng - span},
+                        "_northEast": {"lat": lat + span / 2, "lng": lng + span}}}
+    states = [dict(state)]
+    for step in range(interactions):
+        if step in click_at:
+            state["last_object_clicked"] = {"lat": lat, "lng": lng}
+            state["last_object_clicked_tooltip"] = f"site-{step}"
+        elif step in search_at:
+            box = state["bounds"]
+            state["last_object_clicked"] = {"lat": lat, "lng": lng}
+            state["last_object_clicked_tooltip"] = SEARCH_AREA_PREFIX + ",".join(
+                f"{v:.5f}" for v in (box["_southWest"]["lat"], box["_southWest"]["lng"],
+                                     box["_northEast"]["lat"], box["_northEast"]["lng"])) + f",{zoom}"
+        elif rng.random() < 0.3:
+            zoom = min(max(zoom + rng.choice([-1, 1]), 4), 12)
+        else:
+            span = 40.0 / 2 ** (zoom - 4)
+            lat, lng = lat + rng.uniform(-0.3, 0.3) * span, lng + rng.uniform(-0.3, 0.3) * span
+        span = 40.0 / 2 ** (zoom - 4)
+        state = dict(state, zoom=zoom, bounds={"_southWest": {"lat": lat - span / 2, "lng": lng - span},
+                                               "_northEast": {"lat": lat + span / 2, "lng": lng + span}})
+        states.append(dict(state))
+    return states
+
+
+def count_reruns(states, returned_objects):
+    """Reruns the component triggers after load: it sends whenever its returned values change."""
+    def returned(state):
+        return state if returned_objects is None else {k: v for k, v in state.items() if k in returned_objects}
+
+    reruns, previous = 0, returned(states[0])
+    for state in states[1:]:
+        if returned(state) != previous:
+            reruns, previous = reruns + 1, returned(state)
+    return reruns
+
+
+def time_reruns(app_test, runs, fragment=False):
+    """Run the app once, then time `runs` reruns: of the whole page, or with `fragment` of the map fragment only."""
+    app_test.run()
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        if fragment:
+            fragment_rerun(app_test, FRAGMENT_WIDGET_KEY)
+        else:
+            app_test.run()
+        timings.append((time.perf_counter() - start) * 1000)
+        if app_test.exception:
+            raise RuntimeError(app_test.exception[0].value)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--interactions", type=int, default=60, help="Map interactions in the simulated session.")
+    parser.add_argument("--clicks", type=int, default=5, help="How many of them are marker clicks.")
+    parser.add_argument("--searches", type=int, default=5, help='How many of them are "Search this area" clicks.')
+    parser.add_argument("--runs", type=int, default=10, help="Reruns to time per setup.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    os.chdir(REPO_ROOT)
+    # Only the viewport rendering has the "Search this area" button; the others see pans and zooms instead.
+    states = simulate_session(args.interactions, args.clicks, 0, args.seed)
+    viewport_states = simulate_session(args.interactions, args.clicks, args.searches, args.seed)
+    full_ms = statistics.median(time_reruns(AppTest.from_file(PAGE_SCRIPT, default_timeout=60), args.runs))
+    fragment_ms = statistics.median(time_reruns(AppTest.from_file(PAGE_SCRIPT, default_timeout=60), args.runs,
+                                                fragment=True))
+
+    print(f"session: {args.interactions} interactions ({args.clicks} marker clicks; "
+          f"{args.searches} area searches in viewport mode)")
+    print(f"full page rerun  median {full_ms:8.2f} ms (measured)")
+    print(f"fragment rerun   median {fragment_ms:8.2f} ms (measured)")
+    print(f"{'setup':<18}{'reruns (est.)':>14}{'server time (est.)':>20}")
+    for label, session, returned_objects, rerun_ms in [
+            ("before", states, None, full_ms),
+            ("after (markers)", states, returned_map_events("markers"), fragment_ms),
+            ("after (viewport)", viewport_states, returned_map_events("viewport"), fragment_ms)]:
+        reruns = count_reruns(session, returned_objects)
+        print(f"{label:<18}{reruns:>14}{reruns * rerun_ms / 1000:>18.2f} s")
+
+
+if __name__ == "__main__":
+    main()
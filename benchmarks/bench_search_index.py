@@ -0,0 +1,90 @@
+"""
+Benchmark: Art Forms Explorer search latency, str.contains scan vs inverted index,
+plus the trigram fuzzy-name fallback.
+
+Builds a synthetic art forms frame (default 1M rows) with names and descriptions drawn
+from a craft vocabulary, then times a mix of prefix, multi-term and no-match queries,
+and misspelled/transliterated queries against the trigram name index.
+
+Run from the repository root:
+    python benchmarks/bench_search_index.py --rows 1000000
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.search import ArtFormSearchIndex, TrigramNameIndex  # noqa: E402
+
+WORDS = [
+    'madhubani', 'kantha', 'chikankari', 'phulkari', 'bidriware', 'dhokra', 'pattachitra', 'warli',
+    'kalamkari', 'bandhani', 'ikat', 'pashmina', 'zari', 'terracotta', 'bamboo', 'cane', 'brass',
+    'embroidery', 'painting', 'weaving', 'handloom', 'pottery', 'woodcraft', 'lacquer', 'silk',
+    'cotton', 'village', 'tribal', 'temple', 'festival', 'traditional', 'artisan', 'metal', 'stone',
+]
+QUERIES = ['madhu', 'kantha embroidery', 'chikan', 'silk weaving village', 'craft 4242', 'bid', 'nomatch']
+FUZZY_QUERIES = ['Madhubni', 'Chikan kari', 'pattachitr', 'kalamkri weaving', 'Bandhni craft 77', 'qqqq']
+
+
+def make_art_forms(num_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    words = np.array(WORDS, dtype=object)
+    first, second = words[rng.integers(0, len(words), num_rows)], words[rng.integers(0, len(words), num_rows)]
+    names = pd.Series(first).str.title() + ' ' + pd.Series(second) + ' craft ' + pd.Series(np.arange(num_rows)).astype(str)
+    desc_words = words[rng.integers(0, len(words), (num_rows, 8))]
+    descriptions = pd.Series([' '.join(row) for row in desc_words])
+    return pd.DataFrame({'name': names, 'description': descriptions})
+
+
+def contains_search(df, term):
+    """The previous filter: case-insensitive substring scan over name and description."""
+    name_condition = df['name'].astype(str).str.contains(term, case=False, na=False)
+    desc_condition = df['description'].astype(str).str.contains(term, case=False, na=False)
+    return df[name_condition | desc_condition]
+
+
+def time_query(func, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), len(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeats", type=int, default=7)
+    args = parser.parse_args()
+
+    df = make_art_forms(args.rows)
+    start = time.perf_counter()
+    index = ArtFormSearchIndex(df, version="bench")
+    print(f"index build: {time.perf_counter() - start:.2f}s for {args.rows:,} rows, "
+          f"{len(index.vocab):,} tokens, {len(index.postings):,} postings")
+
+    print(f"{'query':<24} {'contains ms':>12} {'index ms':>10} {'index hits':>11}")
+    for query in QUERIES:
+        contains_ms, _ = time_query(lambda: contains_search(df, query), repeats=1)
+        index_ms, hits = time_query(lambda: index.search(query), repeats=args.repeats)
+        print(f"{query:<24} {contains_ms:>12.1f} {index_ms:>10.2f} {hits:>11,}")
+
+    start = time.perf_counter()
+    name_index = TrigramNameIndex(df['name'], version="bench")
+    print(f"\ntrigram name index build: {time.perf_counter() - start:.2f}s, "
+          f"{len(name_index.display_names):,} distinct names, {len(name_index.postings):,} trigrams")
+    print(f"{'fuzzy query':<24} {'ms':>10} {'top match':>28}")
+    for query in FUZZY_QUERIES:
+        fuzzy_ms, _ = time_query(lambda: name_index.search(query)[0], repeats=args.repeats)
+        names = name_index.search(query)[1]
+        print(f"{query:<24} {fuzzy_ms:>10.2f} {names[0] if names else '-':>28}")
+
+
+if __name__ == "__main__":
+    main()
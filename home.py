@@ -1,8 +1,12 @@
 import streamlit as st
-import time
 import pandas as pd
 import random
 from datetime import datetime
+from utils.swr_cache import culture_heritage_cache
+from utils.connection import get_culture_heritage_connection, table_fingerprint
+from utils.dtypes import compact_dtypes
+from utils.telemetry import instrument_loader, render_telemetry_panel
+from utils.state_profiles import load_state_profiles
 
 # --- Global Configuration ---
 AUTOPLAY_INTERVAL = 5 # seconds
@@ -106,10 +110,11 @@ def get_upcoming_festival():
         return upcoming_festivals[0]
     return {"name": "No Upcoming Festivals Found", "date": "", "location": "", "image": "", "description": ""}
 
-@st.cache_data(ttl=3600)
+@instrument_loader("tourism_trends")
 def load_tourism_trends_data():
+    """Tourism trends from Snowflake, served stale-while-revalidate (shared across sessions; read-only)."""
     try:
-        conn = st.connection("snowflake")
+        conn = get_culture_heritage_connection()
         query = """
             SELECT 
                 YEAR, 
@@ -120,19 +125,63 @@ def load_tourism_trends_data():
             FROM CULTURE_HERITAGE.PUBLIC.TOURISM_TRENDS
             ORDER BY YEAR ASC;
         """
-        df = conn.query(query)
-        if not df.empty:
-            df['YEAR_NUM'] = df['YEAR']
-            df['YEAR'] = pd.to_datetime(df['YEAR'].astype(str), format='%Y')
-            for col in ['DOMESTIC_TOURIST_VISITS', 'FOREIGN_TOURIST_VISITS']:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-            for col in ['ANNUAL_GROWTH_RATE_DOMESTIC', 'ANNUAL_GROWTH_RATE_FOREIGN']:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-        return df
+        def fetch_trends():
+            df = conn.query(query, ttl=0)
+            if not df.empty:
+                df['YEAR_NUM'] = df['YEAR']
+                df['YEAR'] = pd.to_datetime(df['YEAR'].astype(str), format='%Y')
+                for col in ['DOMESTIC_TOURIST_VISITS', 'FOREIGN_TOURIST_VISITS']:
+                    df[col] = pd.to_numeric(df[col], errors='coerce')
+                for col in ['ANNUAL_GROWTH_RATE_DOMESTIC', 'ANNUAL_GROWTH_RATE_FOREIGN']:
+                    df[col] = pd.to_numeric(df[col], errors='coerce')
+            return compact_dtypes(df, "tourism_trends")
+        return culture_heritage_cache.get(query, fetch_trends,
+                                          fingerprint=lambda: table_fingerprint(conn, "TOURISM_TRENDS"))
     except Exception as e:
         st.error(f"Error loading tourism trends data from Snowflake: {e}")
         return pd.DataFrame()
 
+def build_slide_carousel_html(slides, interval=AUTOPLAY_INTERVAL):
+    """Build a CSS-animated carousel that cycles through all slides in the browser.
+
+    Every slide is emitted once and stacked in the same grid cell; a keyframe animation
+    with a per-slide negative delay fades each one in for `interval` seconds, so advancing
+    slides never round-trips to the server.
+    """
+    num_slides = len(slides)
+    cycle_seconds = num_slides * interval
+    visible_pct = 100 / num_slides
+    fade_pct = min(visible_pct / 4, 0.8 / cycle_seconds * 100)
+    slide_items = []
+    for i, slide in enumerate(slides):
+        delay = -(num_slides - i) * interval
+        slide_items.append(f"""
+        <div class="slide-display-container slide-carousel-item" style="animation-delay: {delay}s;">
+            <div class="slide-image-wrapper">
+                <img src="{slide['imgSrc']}" alt="{slide['title']}" class="slide-image">
+            </div>
+            <div class="slide-text-content">
+                <h3>{slide['title']}</h3>
+                <p>{slide['description']}</p>
+                <a href="/{slide['cta_link']}" target="_self" class="slide-cta-button">
+                    {slide['cta_button_text']}
+                </a>
+            </div>
+        </div>""")
+    return f"""
+    <style>
+    @keyframes slideCarouselCycle {{
+        0% {{ opacity: 0; visibility: visible; z-index: 2; }}
+        {fade_pct:.3f}% {{ opacity: 1; }}
+        {visible_pct - fade_pct:.3f}% {{ opacity: 1; }}
+        {visible_pct:.3f}% {{ opacity: 0; visibility: hidden; z-index: 1; }}
+        100% {{ opacity: 0; visibility: hidden; z-index: 1; }}
+    }}
+    .slide-carousel-item {{ animation: slideCarouselCycle {cycle_seconds}s linear infinite; }}
+    </style>
+    <div class="slide-carousel">{''.join(slide_items)}</div>
+    """
+
 # --- CSS Styling ---
 st.markdown("""
 <style>
@@ -150,6 +199,10 @@ body { display: flex; flex-direction: column; align-items: center; padding-top:
 .slide-text-content p { font-size: 1.4rem; color: #4a5568 !important; line-height: 1.7; margin-bottom: 20px; }
 .slide-cta-button { background-color: #FF6347; color: white !important; padding: 12px 25px; border-radius: 8px; text-decoration: none; font-weight: bold; margin-top: 10px; display: inline-block; border: none; cursor: pointer; transition: background-color 0.3s ease; }
 .slide-cta-button:hover { background-color: #E5533D; }
+/* Autoplay Carousel (browser-side, no reruns) */
+.slide-carousel { display: grid; width: 100%; }
+.slide-carousel .slide-carousel-item { grid-area: 1 / 1; opacity: 0; margin: 10px auto 30px auto; }
+.slide-carousel:hover .slide-carousel-item { animation-play-state: paused; }
 @media (min-width: 768px) { .slide-display-container { flex-direction: row; align-items: center; padding: 50px; } .slide-image-wrapper { flex: 0 0 50%; padding-right: 40px; margin-bottom: 0; } .slide-text-content { flex: 1; padding-left: 0; text-align: left; } .slide-text-content h3 { font-size: 3rem; } .slide-text-content p { font-size: 1.6rem; } }
 /* Slideshow Navigation Buttons */
 div[data-testid="stButton-prev_side_btn"] > button, div[data-testid="stButton-next_side_btn"] > button { border-radius: 50% !important; width: 50px !important; height: 50px !important; min-width: 50px !important; padding: 0 !important; font-size: 1.5rem !important; line-height: 50px !important; text-align: center !important; background-color: #fff !important; box-shadow: 0 5px 15px rgba(0,0,0,0.12) !important; border: 1px solid #dde1e6 !important; color: #2d3748 !important; transition: background-color 0.2s ease, transform 0.2s ease, box-shadow 0.2s ease; }
@@ -185,8 +238,10 @@ div[data-testid="stButton-prev_side_btn"] > button:active, div[data-testid="stBu
 # --- Session State Initialization ---
 if 'slide_index' not in st.session_state:
     st.session_state.slide_index = 0
-if 'last_user_action_time' not in st.session_state:
-    st.session_state.last_user_action_time = time.time() - AUTOPLAY_INTERVAL
+if 'slideshow_autoplay' not in st.session_state:
+    st.session_state.slideshow_autoplay = True
+if 'featured_art_index' not in st.session_state:
+    st.session_state.featured_art_index = 0
 
 # --- App Welcome ---
 st.markdown("""
@@ -205,42 +260,54 @@ top_states = get_top_cultural_states()
 all_gi_art_forms = get_all_gi_art_forms()
 upcoming_festival = get_upcoming_festival()
 tourism_trends_df = load_tourism_trends_data()
+try:
+    state_profiles = load_state_profiles()
+except Exception as e:
+    state_profiles = None
+    st.error(f"Error loading state profiles from Snowflake: {e}")
 
 # --- Navigation Functions ---
-def next_slide_action():
-    if slides_data and len(slides_data) > 0:
-        st.session_state.slide_index = (st.session_state.slide_index + 1) % len(slides_data)
-    st.session_state.last_user_action_time = time.time()
-
-def prev_slide_action():
-    if slides_data and len(slides_data) > 0:
-        st.session_state.slide_index = (st.session_state.slide_index - 1 + len(slides_data)) % len(slides_data)
-    st.session_state.last_user_action_time = time.time()
-
-# --- Determine current featured GI art form based on slide_index ---
-featured_art_form = None 
-if all_gi_art_forms and len(all_gi_art_forms) > 0 :
-    current_gi_art_index = st.session_state.slide_index % len(all_gi_art_forms)
-    featured_art_form = all_gi_art_forms[current_gi_art_index]
-else:
-    featured_art_form = {"name": "No Art Form Data", "region": "", "image": "https://via.placeholder.com/300x200.png?text=No+Image", "description": "Please check data source.", "learn_more_url": "#"}
-
-# --- Display Current Slide and Side Navigation ---
-if slides_data:
-    if st.session_state.slide_index >= len(slides_data): 
+def next_slide_action(num_slides):
+    st.session_state.slide_index = (st.session_state.slide_index + 1) % num_slides
+
+def prev_slide_action(num_slides):
+    st.session_state.slide_index = (st.session_state.slide_index - 1 + num_slides) % num_slides
+
+def next_featured_art_action(num_art_forms):
+    st.session_state.featured_art_index = (st.session_state.featured_art_index + 1) % num_art_forms
+
+def prev_featured_art_action(num_art_forms):
+    st.session_state.featured_art_index = (st.session_state.featured_art_index - 1 + num_art_forms) % num_art_forms
+
+# --- Fragments ---
+# Slide and art-form navigation only rerun their own fragment, so a click no longer
+# re-renders the tourism charts, raw-data expanders and footer below.
+@st.fragment
+def render_slideshow(slides):
+    """Render the slideshow with its autoplay toggle and side navigation."""
+    if not slides:
+        st.warning("Slideshow data is currently unavailable.")
+        return
+    if st.session_state.slide_index >= len(slides): 
         st.session_state.slide_index = 0
-        
-    current_slide_data = slides_data[st.session_state.slide_index]
-    
+
+    st.toggle("Autoplay slideshow", key="slideshow_autoplay",
+              help=f"Cycle through slides every {AUTOPLAY_INTERVAL} seconds in the browser. Hover over a slide to pause.")
+
+    if st.session_state.slideshow_autoplay:
+        # The carousel animates client-side, so an idle tab costs no server reruns.
+        st.markdown(build_slide_carousel_html(slides), unsafe_allow_html=True)
+        return
+
+    current_slide_data = slides[st.session_state.slide_index]
     col_prev, col_content, col_next = st.columns([1, 20, 1], vertical_alignment="center")
 
     with col_prev:
-        st.button("⬅️", on_click=prev_slide_action, key="prev_side_btn", help="Previous slide", use_container_width=True)
+        st.button("⬅️", on_click=prev_slide_action, args=(len(slides),), key="prev_side_btn", help="Previous slide", use_container_width=True)
 
     with col_content:
-        # Removed 'key' from st.markdown() call
         st.markdown(f""" 
-        <div class="slide-display-container" key="html_div_key_slide_wrapper_{st.session_state.slide_index}"> 
+        <div class="slide-display-container"> 
             <div class="slide-image-wrapper">
                 <img src="{current_slide_data['imgSrc']}" alt="{current_slide_data['title']}" class="slide-image">
             </div>
@@ -255,9 +322,59 @@ if slides_data:
         """, unsafe_allow_html=True) 
 
     with col_next:
-        st.button("➡️", on_click=next_slide_action, key="next_side_btn", help="Next slide", use_container_width=True)
-else:
-    st.warning("Slideshow data is currently unavailable.")
+        st.button("➡️", on_click=next_slide_action, args=(len(slides),), key="next_side_btn", help="Next slide", use_container_width=True)
+
+@st.fragment
+def render_featured_art_form(art_forms):
+    """Render the featured GI-tagged art form card with its own previous/next controls."""
+    if not art_forms:
+        st.info("Featured art form data is currently unavailable or no art forms found.")
+        return
+    if st.session_state.featured_art_index >= len(art_forms):
+        st.session_state.featured_art_index = 0
+    featured_art_form = art_forms[st.session_state.featured_art_index]
+
+    art_cols = st.columns([2, 3])
+    with art_cols[0]: st.image(featured_art_form['image'], caption=featured_art_form['name'], use_container_width=True)
+    with art_cols[1]:
+        st.markdown(f"""
+        <div class="data-card">
+            <h4>{featured_art_form['name']}</h4><p class="stat">Region: {featured_art_form['region']}</p>
+            <p class="description">{featured_art_form['description']}</p>
+            <form action="{featured_art_form['learn_more_url']}" target="_blank"><button type="submit">Learn More</button></form>
+        </div>""", unsafe_allow_html=True)
+        nav_cols = st.columns(2)
+        with nav_cols[0]:
+            st.button("⬅️ Previous", on_click=prev_featured_art_action, args=(len(art_forms),), key="prev_art_btn", use_container_width=True)
+        with nav_cols[1]:
+            st.button("Next ➡️", on_click=next_featured_art_action, args=(len(art_forms),), key="next_art_btn", use_container_width=True)
+
+@st.fragment
+def render_state_profile(profiles):
+    """Render one state's heritage at a glance; picking another state only reruns this fragment."""
+    represented = profiles.represented() if profiles is not None else []
+    if not represented:
+        st.info("State profiles are currently unavailable.")
+        return
+    state_name = st.selectbox("Choose a state or union territory", [p['state'] for p in represented], key="state_profile_select")
+    profile = profiles.by_name(state_name)
+    metric_cols = st.columns(4)
+    for col, (label, key) in zip(metric_cols, [("Crafts", 'crafts'), ("Dances", 'dances'), ("Festivals", 'festivals'), ("UNESCO Sites", 'unesco_sites')]):
+        with col: st.metric(label, profile[key])
+    highlights = [f"<p><strong>{label}:</strong> {', '.join(profile[f'top_{key}'])}</p>"
+                  for label, key in [("Crafts", 'crafts'), ("Dances", 'dances'), ("Festivals", 'festivals'), ("UNESCO Sites", 'unesco_sites')]
+                  if profile[f'top_{key}']]
+    st.markdown(f"""
+    <div class="data-card"><h4>{profile['state']}</h4><p class="stat">{profile['kind']} • {profile['region']} India</p>
+        {''.join(highlights)}
+    </div>""", unsafe_allow_html=True)
+    national = profiles.national
+    if national is not None and pd.notna(national['domestic_visits']):
+        st.caption(f"India recorded {national['domestic_visits'] / 1e6:,.1f}M domestic tourist visits in {national['year']} "
+                   "(TOURISM_TRENDS is national; no per-state breakdown).")
+
+# --- Display Current Slide and Side Navigation ---
+render_slideshow(slides_data)
 
 # --- Apply a wrapper for Part 2 content ---
 st.markdown("<div class='part2-content-wrapper'>", unsafe_allow_html=True)
@@ -281,20 +398,15 @@ if top_states:
             </div>""", unsafe_allow_html=True)
 else: st.info("Top cultural states data is currently unavailable.")
 
+# --- State Profile Section ---
+st.subheader("Explore a State")
+st.markdown("Crafts, dances, festivals and UNESCO sites of each state at a glance")
+render_state_profile(state_profiles)
+
 # --- Featured Art Form Section ---
 st.subheader("Featured GI-Tagged Art Form")
 st.markdown("Geographical Indication protected traditional crafts")
-if featured_art_form and featured_art_form.get("name") != "No Art Form Data":
-    art_cols = st.columns([2, 3])
-    with art_cols[0]: st.image(featured_art_form['image'], caption=featured_art_form['name'], use_container_width=True)
-    with art_cols[1]:
-        st.markdown(f"""
-        <div class="data-card">
-            <h4>{featured_art_form['name']}</h4><p class="stat">Region: {featured_art_form['region']}</p>
-            <p class="description">{featured_art_form['description']}</p>
-            <form action="{featured_art_form['learn_more_url']}" target="_blank"><button type="submit">Learn More</button></form>
-        </div>""", unsafe_allow_html=True)
-else: st.info("Featured art form data is currently unavailable or no art forms found.")
+render_featured_art_form(all_gi_art_forms)
 
 # --- Upcoming Festival Section ---
 st.subheader("Upcoming Cultural Festival")
@@ -370,21 +482,4 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-# --- Autoplay Logic ---
-if slides_data and len(slides_data) > 0:
-    next_autoplay_event_time = st.session_state.last_user_action_time + AUTOPLAY_INTERVAL
-    current_time = time.time()
-    time_to_wait = next_autoplay_event_time - current_time
-
-    if time_to_wait <= 0:
-        st.session_state.slide_index = (st.session_state.slide_index + 1) % len(slides_data)
-        st.session_state.last_user_action_time = time.time()
-        st.rerun()
-    else:
-        time.sleep(0.1) 
-        st.rerun()
-else:
-    if 'initial_load_done' not in st.session_state:
-        st.session_state.initial_load_done = True
-        if not slides_data: 
-             st.rerun()
\ No newline at end of file
+render_telemetry_panel()
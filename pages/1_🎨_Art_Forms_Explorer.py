@@ -1,7 +1,22 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 import folium
+from collections import namedtuple
+from datetime import datetime
 from streamlit_folium import folium_static
+from utils.art_forms import ART_FORM_COLUMNS, transform_region_art_forms, transform_crafts, combine_art_forms
+from utils.art_form_queries import (ART_FORM_SOURCES, normalize_art_form_filters, build_art_forms_page_query,
+                                    build_art_form_states_query, transform_art_forms_page)
+from utils.search import ArtFormSearchIndex, TrigramNameIndex
+from utils.concurrency import run_loaders_concurrently
+from utils.swr_cache import culture_heritage_cache
+from utils.connection import get_culture_heritage_connection, table_fingerprint
+from utils.dtypes import compact_dtypes
+from utils.telemetry import instrument_loader, note_cache_outcome, render_telemetry_panel
+from utils.states import STATE_IDS, build_state_row_index, resolve_states, state_centroids, state_names
+from utils.state_profiles import load_state_profiles
+from utils.lookup import PrimaryKeyIndex
 
 # --- Page Configuration ---
 st.set_page_config(
@@ -13,7 +28,8 @@ st.set_page_config(
 
 # --- Snowflake Connection ---
 def get_snowflake_connection():
-    return st.connection("snowflake")
+    # Live Snowflake, or a local backend in snapshot/offline/fixtures data mode.
+    return get_culture_heritage_connection()
 
 # --- Image Overrides ---
 ART_FORM_IMAGE_OVERRIDES = {
@@ -23,6 +39,7 @@ ART_FORM_IMAGE_OVERRIDES = {
 
 # --- Data Fetching Functions ---
 
+@instrument_loader("crafts")
 def get_crafts_from_snowflake():
     """Fetch crafts data directly from Snowflake CRAFT_IMAGE table."""
     try:
@@ -38,7 +55,8 @@ def get_crafts_from_snowflake():
         FROM
             "CULTURE_HERITAGE"."PUBLIC"."CRAFT_IMAGE";
         """
-        df = conn.query(query, ttl=3600)
+        df = culture_heritage_cache.get(query, lambda: compact_dtypes(conn.query(query, ttl=0), "crafts"),
+                                        fingerprint=lambda: table_fingerprint(conn, "CRAFT_IMAGE"))
         return df
     except Exception as e:
         st.error(f"Error fetching crafts from Snowflake (CRAFT_IMAGE table): {e}")
@@ -50,12 +68,13 @@ def get_crafts_from_snowflake():
 #         conn = get_snowflake_connection()
 #         # Image URL is not fetched from Snowflake here; will rely on ART_FORM_IMAGE_OVERRIDES or placeholder
 #         query = 'SELECT "PAINTING" AS PAINTING_NAME_SF, "REGION_STATE" AS PAINTING_REGION_STATE, "DESCRIPTION" AS PAINTING_DESC FROM "PAINTING";'
-#         df = conn.query(query, ttl=3600)
+#         df = culture_heritage_cache.get(query, lambda: conn.query(query, ttl=0))
 #         return df
 #     except Exception as e:
 #         st.error(f"Error fetching paintings from Snowflake: {e}")
 #         return pd.DataFrame()
 
+@instrument_loader("dances")
 def get_dances_from_snowflake():
     """Fetch dance data from Snowflake DANCE_FINAL table."""
     try:
@@ -69,18 +88,34 @@ def get_dances_from_snowflake():
         FROM
             "CULTURE_HERITAGE"."PUBLIC"."DANCE_FINAL";
         """
-        df = conn.query(query, ttl=3600)
+        df = culture_heritage_cache.get(query, lambda: compact_dtypes(conn.query(query, ttl=0), "dances"),
+                                        fingerprint=lambda: table_fingerprint(conn, "DANCE_FINAL"))
         return df
     except Exception as e:
         st.error(f"Error fetching dances from Snowflake (DANCE_FINAL table): {e}")
         return pd.DataFrame()
 
-def get_art_forms_combined():
+def get_raw_art_form_tables():
+    """Raw art form tables from Snowflake, keyed by source.
+
+    The queries are issued concurrently, so cold-load latency is that of the slowest table;
+    once warm, each table is served from the stale-while-revalidate cache without waiting.
+    """
+    return run_loaders_concurrently({
+        # 'paintings': get_paintings_from_snowflake,  -- COMMENTED OUT with the PAINTING loader
+        'dances': get_dances_from_snowflake,
+        'crafts': get_crafts_from_snowflake,
+    })
+
+def get_art_forms_combined(raw_tables=None):
     """
     Fetch art forms data, combining hardcoded data with data from Snowflake.
+    Rows are transformed column-wise by utils.art_forms (no per-row iteration).
     """
     all_data_frames = []
     state_coords_dict = get_state_coordinates()
+    if raw_tables is None:
+        raw_tables = get_raw_art_form_tables()
 
     # # 1. Get hardcoded art forms -- COMMENTED OUT
     # hardcoded_art_forms_df = pd.DataFrame({
@@ -123,114 +158,112 @@ def get_art_forms_combined():
     # if not hardcoded_art_forms_df.empty:
     #     all_data_frames.append(hardcoded_art_forms_df)
 
-    # Helper function for image URL
-    def get_image_url(name, default_text, sf_image_url_value=None):
-        if sf_image_url_value and pd.notna(sf_image_url_value) and str(sf_image_url_value).strip():
-            return str(sf_image_url_value).strip()
-        if name in ART_FORM_IMAGE_OVERRIDES:
-            return ART_FORM_IMAGE_OVERRIDES[name]
-        image_text = name.replace(" ", "+").replace("/", "_") if pd.notna(name) else default_text
-        return f'https://via.placeholder.com/300x200.png?text={image_text}'
-
     # # 2. Get PAINTINGS from Snowflake -- COMMENTED OUT
-    # paintings_sf_df_raw = get_paintings_from_snowflake()
+    # paintings_sf_df_raw = raw_tables['paintings']
     # if not paintings_sf_df_raw.empty:
-    #     transformed_paintings_list = []
-    #     for _, row in paintings_sf_df_raw.iterrows():
-    #         state = row.get('PAINTING_REGION_STATE', None)
-    #         name = row.get('PAINTING_NAME_SF', 'Unknown Painting')
-    #         desc = row.get('PAINTING_DESC', f'Traditional painting style from {state if state else "India"}.')
-    #         sf_image_url = row.get('PAINTING_IMAGE_URL_SF', None)
-    #         image_to_use = get_image_url(name, "Painting", sf_image_url)
-    #         lat, lon = (state_coords_dict.get(state, [None, None])) if state else (None, None)
-    #         transformed_paintings_list.append({
-    #             'name': name, 'type': 'Painting', 'state': state, 'gi_tag': False,
-    #             'description': desc, 'image_url': image_to_use,
-    #             'latitude': lat, 'longitude': lon,
-    #             'govt_scheme': 'To be updated', 'allocation_amount': 'N/A', 'artisan_cooperative': 'To be updated',
-    #             'district': 'N/A', 'village_equivalent': 'N/A'
-    #         })
-    #     all_data_frames.append(pd.DataFrame(transformed_paintings_list))
+    #     all_data_frames.append(transform_region_art_forms(
+    #         paintings_sf_df_raw, 'Painting', 'PAINTING_NAME_SF', 'PAINTING_REGION_STATE', 'PAINTING_DESC',
+    #         'PAINTING_IMAGE_URL_SF', state_coords_dict, ART_FORM_IMAGE_OVERRIDES,
+    #         default_description='Traditional painting style from {}.'))
 
     # 3. Get DANCES from Snowflake (using DANCE_FINAL)
-    dances_sf_df_raw = get_dances_from_snowflake()
+    dances_sf_df_raw = raw_tables['dances']
     if not dances_sf_df_raw.empty:
-        transformed_dances_list = []
-        for _, row in dances_sf_df_raw.iterrows():
-            state = row.get('DANCE_REGION_STATE', None)
-            name = row.get('DANCE_NAME_SF', 'Unknown Dance')
-            desc = row.get('DANCE_DESC', f'Traditional dance form from {state if state else "India"}.')
-            sf_image_url = row.get('DANCE_IMAGE_URL_SF', None)
-            image_to_use = get_image_url(name, "Dance", sf_image_url)
-            lat, lon = (state_coords_dict.get(state, [None, None])) if state else (None, None)
-            transformed_dances_list.append({
-                'name': name, 'type': 'Dance', 'state': state, 'gi_tag': False,
-                'description': desc, 'image_url': image_to_use,
-                'latitude': lat, 'longitude': lon,
-                'govt_scheme': 'To be updated', 'allocation_amount': 'N/A', 'artisan_cooperative': 'To be updated',
-                'district': 'N/A', 'village_equivalent': 'N/A' # Dances typically don't have district/village level specifics here
-            })
-        all_data_frames.append(pd.DataFrame(transformed_dances_list))
+        # Dances typically don't have district/village level specifics here
+        all_data_frames.append(transform_region_art_forms(
+            dances_sf_df_raw, 'Dance', 'DANCE_NAME_SF', 'DANCE_REGION_STATE', 'DANCE_DESC',
+            'DANCE_IMAGE_URL_SF', state_coords_dict, ART_FORM_IMAGE_OVERRIDES,
+            default_description='Traditional dance form from {}.'))
 
     # 4. Process CRAFTS data from CRAFT_IMAGE table
-    crafts_sf_df_raw = get_crafts_from_snowflake()
+    crafts_sf_df_raw = raw_tables['crafts']
     if not crafts_sf_df_raw.empty:
-        transformed_crafts_list = []
-        for _, row in crafts_sf_df_raw.iterrows():
-            name = row.get('CRAFT_NAME_SF', 'Unknown Craft')
-            description_from_sf = row.get('CRAFT_DESCRIPTION_SF', '')
-            state_from_sf = row.get('CRAFT_STATE_SF', 'N/A')
-            district_from_sf = row.get('CRAFT_DISTRICT_SF', 'N/A')
-            village_from_sf = row.get('CRAFT_VILLAGE_SF', 'N/A')
-            sf_image_url = row.get('CRAFT_IMAGE_URL_SF', None)
-
-            image_to_use = get_image_url(name, "Craft", sf_image_url)
-            lat, lon = (state_coords_dict.get(state_from_sf, [None, None])) if state_from_sf and pd.notna(state_from_sf) else (None, None)
-
-            final_description = description_from_sf
-            if not (pd.notna(description_from_sf) and description_from_sf.strip()):
-                loc_parts = []
-                if village_from_sf and village_from_sf != 'N/A': loc_parts.append(village_from_sf)
-                if district_from_sf and district_from_sf != 'N/A': loc_parts.append(district_from_sf)
-                if state_from_sf and state_from_sf != 'N/A': loc_parts.append(state_from_sf)
-                final_description = f"A traditional {name} from {', '.join(loc_parts)}." if loc_parts else f"A traditional {name} from India."
-
-            transformed_crafts_list.append({
-                'name': name, 'type': 'Craft', 'state': state_from_sf, 'gi_tag': False,
-                'description': final_description, 'image_url': image_to_use,
-                'latitude': lat, 'longitude': lon,
-                'govt_scheme': 'To be updated', 'allocation_amount': 'N/A', 'artisan_cooperative': 'To be updated',
-                'district': district_from_sf, 'village_equivalent': village_from_sf
-            })
-        all_data_frames.append(pd.DataFrame(transformed_crafts_list))
-
-    if not all_data_frames: # If no data from any source
-        return pd.DataFrame(columns=['name', 'type', 'state', 'gi_tag', 'description', 'image_url', 'latitude', 'longitude', 'govt_scheme', 'allocation_amount', 'artisan_cooperative', 'district', 'village_equivalent'])
-
-    combined_df = pd.concat(all_data_frames, ignore_index=True)
-    if not combined_df.empty and 'name' in combined_df.columns and 'state' in combined_df.columns:
-        combined_df['state'] = combined_df['state'].astype(str)
-        combined_df.drop_duplicates(subset=['name', 'state'], keep='first', inplace=True)
-    return combined_df
+        all_data_frames.append(transform_crafts(crafts_sf_df_raw, state_coords_dict, ART_FORM_IMAGE_OVERRIDES))
+
+    return compact_dtypes(combine_art_forms(all_data_frames), "art_forms")
 
 def get_state_coordinates():
-    """Get approximate coordinates for Indian states."""
-    return {
-        'Andhra Pradesh': [16.5, 80.6], 'Arunachal Pradesh': [27.1004, 93.6167], 'Assam': [26.2006, 92.9376],
-        'Bihar': [25.4, 85.4], 'Chhattisgarh': [21.3, 81.6], 'Goa': [15.2993, 74.1240],
-        'Gujarat': [22.3, 72.6], 'Haryana': [29.0588, 76.0856],
-        'Himachal Pradesh': [31.1048, 77.1734], 'Jharkhand': [23.6102, 85.2799],
-        'Jammu & Kashmir': [34.1, 74.8], 'Karnataka': [15.3, 75.7], 'Kerala': [10.8, 76.3],
-        'Madhya Pradesh': [23.2, 77.4], 'Maharashtra': [19.2, 73.2], 'Manipur': [24.6637, 93.9063],
-        'Meghalaya': [25.4670, 91.3662], 'Mizoram': [23.1645, 92.9376], 'Nagaland': [26.1584, 94.5624],
-        'Odisha': [20.3, 85.8], 'Punjab': [31.1, 75.3], 'Rajasthan': [27.0, 74.2],
-        'Sikkim': [27.5330, 88.5122], 'Tamil Nadu': [11.1, 78.7], 'Telangana': [18.1124, 79.0193],
-        'Tripura': [23.9408, 91.9882], 'Uttar Pradesh': [26.8, 80.9], 'Uttarakhand': [30.0668, 79.0193],
-        'West Bengal': [22.6, 88.4],
-        'Odisha, West Bengal': [21.5, 87.0], 'Odisha, Jharkhand, West Bengal': [22.5, 87.0],
-        'Gujarat, Madhya Pradesh': [22.8, 73.0], 'Rajasthan, Himachal Pradesh': [29.0, 76.0],
-        'Andhra Pradesh, Telangana': [17.0, 79.5]
-    }
+    """Centroids of Indian states/UTs by canonical name, from the shared state dimension."""
+    return state_centroids()
+
+# --- Shared Dataset ---
+# One read-only copy of the combined art forms per server process, shared by every session.
+ArtFormsDataset = namedtuple("ArtFormsDataset", ["df", "version", "loaded_at"])
+
+def compute_dataset_version(df):
+    """Short content hash identifying a dataset snapshot; derived caches key on it."""
+    if df.empty:
+        return "empty"
+    try:
+        return format(int(pd.util.hash_pandas_object(df, index=False).sum()) & 0xFFFFFFFFFFFF, "012x")
+    except TypeError:
+        return format(hash(tuple(df.columns)) & 0xFFFFFFFFFFFF, "012x") + f"-{len(df)}"
+
+@st.cache_resource(max_entries=2, show_spinner="Loading art forms...")
+def load_shared_art_forms(raw_versions, _raw_tables):
+    """Build the combined art forms dataset once per change of the raw Snowflake tables.
+
+    `raw_versions` are the stale-while-revalidate cache versions of the raw tables; they
+    only key the cache.
+
+    The frame is shared by all sessions, so callers must treat it as read-only and
+    derive filtered views instead of mutating it in place.
+    """
+    df = get_art_forms_combined(_raw_tables)
+    return ArtFormsDataset(df=df, version=compute_dataset_version(df), loaded_at=datetime.now())
+
+@st.cache_resource(max_entries=2, show_spinner="Indexing art forms for search...")
+def get_search_index(version, _df):
+    """Inverted search index over name/description, built once per dataset version."""
+    return ArtFormSearchIndex(_df, version=version)
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def get_name_trigram_index(version, _df):
+    """Typo-tolerant trigram index over art form names, built once per dataset version."""
+    return TrigramNameIndex(_df['name'], version=version)
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def get_art_form_detail_index(version, _df):
+    """Art form name -> row position for the detail view, built once per dataset version."""
+    return PrimaryKeyIndex(_df, 'name', version=version)
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def get_state_row_index(version, _df):
+    """state_id -> row positions of the art forms in that state, built once per dataset version."""
+    return build_state_row_index(_df)
+
+# --- Snowflake Filter Pushdown ---
+@instrument_loader("art_form_states")
+@st.cache_data(ttl=3600, show_spinner=False)
+def get_art_form_states_from_snowflake():
+    """Distinct states across the art form tables, for the state filter in pushdown mode."""
+    note_cache_outcome("miss")  # the body only runs when st.cache_data misses
+    try:
+        conn = get_snowflake_connection()
+        df = conn.query(build_art_form_states_query(), ttl=3600)
+        return [s for s in df.iloc[:, 0].astype(str) if s.strip() and s != 'N/A'] if not df.empty else []
+    except Exception as e:
+        st.error(f"Error fetching art form states from Snowflake: {e}")
+        return []
+
+@instrument_loader("art_forms_page")
+@st.cache_data(ttl=3600, max_entries=500, show_spinner="Querying Snowflake...")
+def get_art_forms_page_from_snowflake(filters, page_size, after=None):
+    """One page of art forms filtered in Snowflake, cached per normalized filter tuple and cursor.
+
+    Returns the page and the cursor of the next page (None on the last page).
+    """
+    note_cache_outcome("miss")
+    query, params = build_art_forms_page_query(filters, page_size, after)
+    if query is None:
+        return pd.DataFrame(columns=ART_FORM_COLUMNS), None
+    try:
+        conn = get_snowflake_connection()
+        raw_df = conn.query(query, params=params, ttl=3600)
+    except Exception as e:
+        st.error(f"Error fetching filtered art forms from Snowflake: {e}")
+        return pd.DataFrame(columns=ART_FORM_COLUMNS), None
+    return transform_art_forms_page(raw_df, page_size, get_state_coordinates(), ART_FORM_IMAGE_OVERRIDES)
 
 # --- CSS Styling ---
 st.markdown("""
@@ -275,59 +308,151 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-# --- Load Data (with caching in session_state) ---
-if 'art_forms_df' not in st.session_state:
-    st.session_state.art_forms_df = get_art_forms_combined()
-art_forms_df = st.session_state.art_forms_df
+# --- Load Data (shared across sessions via st.cache_resource) ---
+# In pushdown mode the full catalogue is never loaded; each grid page is queried on demand.
+pushdown_mode = st.toggle("Filter in Snowflake", key="art_forms_pushdown",
+                          help="Send the filters to Snowflake and fetch only the page of art forms being viewed.")
+if pushdown_mode:
+    art_forms_dataset = None
+    art_forms_df = pd.DataFrame(columns=ART_FORM_COLUMNS)
+else:
+    # Once warm this never waits on Snowflake: stale tables are refreshed in the background
+    # and the dataset is rebuilt on the first rerun after a refresh brings changed data.
+    raw_tables = get_raw_art_form_tables()
+    raw_versions = tuple(culture_heritage_cache.version_of(table) for table in raw_tables.values())
+    art_forms_dataset = load_shared_art_forms(raw_versions, raw_tables)
+    art_forms_df = art_forms_dataset.df
 
 # --- Filters ---
 st.markdown('<div class="filter-section">', unsafe_allow_html=True)
 filter_cols = st.columns(3)
 with filter_cols[0]:
-    unique_states = []
-    if not art_forms_df.empty and 'state' in art_forms_df.columns:
-        valid_states = [s for s in art_forms_df['state'].dropna().unique() if s and str(s).strip() and str(s) != 'N/A']
-        unique_states = sorted(list(set(valid_states)))
+    # One option per canonical state; rows naming several states appear under each of them.
+    unique_states, art_form_state_labels = [], []
+    if pushdown_mode:
+        art_form_state_labels = get_art_form_states_from_snowflake()
+        unique_states = state_names(resolve_states(art_form_state_labels)['mask'])
+    elif not art_forms_df.empty and 'state_mask' in art_forms_df.columns:
+        unique_states = state_names(art_forms_df['state_mask'])
     selected_state = st.selectbox("Filter by State", ["All States"] + unique_states, key="state_filter_select_main")
 
 with filter_cols[1]:
     unique_types = []
-    if not art_forms_df.empty and 'type' in art_forms_df.columns:
+    if pushdown_mode:
+        unique_types = sorted(ART_FORM_SOURCES)
+    elif not art_forms_df.empty and 'type' in art_forms_df.columns:
         valid_types = [t for t in art_forms_df['type'].dropna().unique() if t and str(t).strip()] # Ensure types are valid strings
         unique_types = sorted(list(set(valid_types)))
     selected_type = st.selectbox("Filter by Art Type", ["All Types"] + unique_types, key="type_filter_select_main")
 
 with filter_cols[2]:
     search_term = st.text_input("Search Art Forms", key="search_art_forms_input_main")
+if pushdown_mode:
+    st.caption("Filtering in Snowflake • only the visible page of art forms is fetched")
+else:
+    st.caption(f"Dataset version {art_forms_dataset.version} • loaded {art_forms_dataset.loaded_at:%d %b %Y %H:%M}")
+if selected_state != "All States":
+    # Cross-dataset counts come from the precomputed state profile, not from the other pages' loaders.
+    try:
+        state_profile = load_state_profiles().by_name(selected_state)
+    except Exception as e:
+        state_profile = None
+        st.error(f"Error loading the {selected_state} state profile: {e}")
+    if state_profile:
+        st.caption(f"{selected_state} ({state_profile['region']}): {state_profile['crafts']} crafts • "
+                   f"{state_profile['dances']} dances • {state_profile['festivals']} festivals • "
+                   f"{state_profile['unesco_sites']} UNESCO sites")
 st.markdown('</div>', unsafe_allow_html=True)
 
 # --- Apply Filters ---
-filtered_df = art_forms_df.copy()
+# Indexing below always yields new frames, so the shared dataset is never modified.
+art_form_filters = normalize_art_form_filters(selected_state, selected_type, search_term, art_form_state_labels)
+filtered_df = art_forms_df
+if search_term and not filtered_df.empty:
+    # Prefix match on every search word, ranked by relevance (name hits before description hits).
+    search_index = get_search_index(art_forms_dataset.version, art_forms_df)
+    search_positions = search_index.search(search_term)
+    if len(search_positions) == 0:
+        # Nothing matched exactly: fall back to names with similar spelling ("Madhubni" -> "Madhubani").
+        search_positions, similar_names = get_name_trigram_index(art_forms_dataset.version, art_forms_df).search(search_term)
+        if similar_names:
+            st.info(f"No exact matches for '{search_term}'. Showing similar names: {', '.join(similar_names[:5])}")
+    filtered_df = filtered_df.iloc[search_positions]
 if selected_state != "All States":
-    if not filtered_df.empty and 'state' in filtered_df.columns:
-        filtered_df = filtered_df[filtered_df['state'].astype(str) == selected_state]
+    if not filtered_df.empty and 'state_mask' in filtered_df.columns:
+        # The state's rows are looked up in a per-version index instead of scanning the column.
+        state_positions = get_state_row_index(art_forms_dataset.version, art_forms_df).get(
+            STATE_IDS[selected_state], np.empty(0, dtype=np.intp))
+        if search_term:
+            filtered_df = filtered_df[np.isin(search_positions, state_positions)]  # keeps the relevance order
+        else:
+            filtered_df = art_forms_df.iloc[state_positions]
 if selected_type != "All Types":
     if not filtered_df.empty and 'type' in filtered_df.columns:
-        filtered_df = filtered_df[filtered_df['type'].astype(str) == selected_type]
-if search_term:
-    if not filtered_df.empty:
-        name_series = filtered_df['name'].astype(str) if 'name' in filtered_df.columns else pd.Series(dtype=str)
-        desc_series = filtered_df['description'].astype(str) if 'description' in filtered_df.columns else pd.Series(dtype=str)
-        
-        name_condition = name_series.str.contains(search_term, case=False, na=False)
-        desc_condition = desc_series.str.contains(search_term, case=False, na=False)
-        filtered_df = filtered_df[name_condition | desc_condition]
+        filtered_df = filtered_df[filtered_df['type'] == selected_type]
 
 # --- Display Art Forms Grid ---
-if filtered_df.empty:
+# Only the visible window of cards is rendered, so a rerun emits the same number of
+# widgets whether the filters match twelve art forms or the whole catalogue.
+GRID_COLUMNS = 3
+GRID_PAGE_SIZES = [12, 24, 48, 96]
+
+grid_controls = st.columns([2, 1])
+with grid_controls[0]:
+    grid_mode = st.radio("Browse mode", ["Pages", "Load more"], horizontal=True, key="art_grid_mode")
+with grid_controls[1]:
+    page_size = st.selectbox("Cards per page", GRID_PAGE_SIZES, key="art_grid_page_size")
+
+# Start again from the first window whenever the filters, mode or page size change.
+grid_filter_key = (pushdown_mode, art_forms_dataset.version if art_forms_dataset else None,
+                   art_form_filters, grid_mode, page_size)
+if st.session_state.get('art_grid_filter_key') != grid_filter_key:
+    st.session_state.art_grid_filter_key = grid_filter_key
+    st.session_state.art_grid_page = 0
+    st.session_state.art_grid_visible = page_size
+    st.session_state.art_grid_cursors = [None]  # keyset cursor of each page visited (pushdown mode)
+
+total_cards = None  # unknown when paging through Snowflake
+if pushdown_mode:
+    if grid_mode == "Pages":
+        page = st.session_state.art_grid_page
+        visible_df, next_cursor = get_art_forms_page_from_snowflake(
+            art_form_filters, page_size, st.session_state.art_grid_cursors[page])
+        st.session_state.art_grid_cursors[page + 1:] = [next_cursor]
+        window_start = page * page_size
+    else:
+        pages, next_cursor = [], None
+        for _ in range(st.session_state.art_grid_visible // page_size):
+            page_df, next_cursor = get_art_forms_page_from_snowflake(art_form_filters, page_size, next_cursor)
+            pages.append(page_df)
+            if next_cursor is None:
+                break
+        visible_df = pd.concat(pages) if len(pages) > 1 else pages[0]
+        window_start = 0
+    has_next_page = next_cursor is not None
+else:
+    total_cards = len(filtered_df)
+    num_pages = max(1, -(-total_cards // page_size))
+    if grid_mode == "Pages":
+        st.session_state.art_grid_page = min(st.session_state.art_grid_page, num_pages - 1)
+        window_start = st.session_state.art_grid_page * page_size
+    else:
+        window_start = 0
+    window_size = page_size if grid_mode == "Pages" else st.session_state.art_grid_visible
+    visible_df = filtered_df.iloc[window_start:window_start + window_size]
+    has_next_page = window_start + len(visible_df) < total_cards
+window_end = window_start + len(visible_df)
+
+if visible_df.empty:
     st.info("No art forms match your filters. Try adjusting your criteria, or check if data is available from the sources.")
 else:
-    num_columns = 3
-    for i in range(0, len(filtered_df), num_columns):
-        cols = st.columns(num_columns)
-        for j in range(num_columns):
-            if i + j < len(filtered_df):
-                art = filtered_df.iloc[i + j]
+    st.caption(f"Showing {window_start + 1:,}–{window_end:,}" + (f" of {total_cards:,} art forms" if total_cards is not None else " art forms"))
+
+    for i in range(0, len(visible_df), GRID_COLUMNS):
+        cols = st.columns(GRID_COLUMNS)
+        for j in range(GRID_COLUMNS):
+            if i + j < len(visible_df):
+                art = visible_df.iloc[i + j]
                 with cols[j]:
                     art_description_text = str(art.get('description', 'No description available.'))
                     if len(art_description_text) > 100:
@@ -351,18 +476,42 @@ else:
                     </div>
                     """, unsafe_allow_html=True)
                     
-                    button_key = f"view_details_{art_name_for_key_val}_{i}_{j}"
+                    button_key = f"view_details_{art_name_for_key_val}_{window_start + i}_{j}"
                     if st.button(f"View Details: {art_name_val}", key=button_key):
                         st.session_state.selected_art = art_name_val
                         st.rerun()
 
+    if grid_mode == "Pages":
+        nav_cols = st.columns([1, 2, 1])
+        with nav_cols[0]:
+            if st.button("← Previous", key="art_grid_prev_page", disabled=st.session_state.art_grid_page == 0):
+                st.session_state.art_grid_page -= 1
+                st.rerun()
+        with nav_cols[1]:
+            page_label = f"Page {st.session_state.art_grid_page + 1}" + (f" of {num_pages}" if total_cards is not None else "")
+            st.markdown(f"<div style='text-align: center;'>{page_label}</div>", unsafe_allow_html=True)
+        with nav_cols[2]:
+            if st.button("Next →", key="art_grid_next_page", disabled=not has_next_page):
+                st.session_state.art_grid_page += 1
+                st.rerun()
+    elif has_next_page:
+        more_count = min(page_size, total_cards - window_end) if total_cards is not None else page_size
+        if st.button(f"Load {more_count} more", key="art_grid_load_more"):
+            st.session_state.art_grid_visible += page_size
+            st.rerun()
+
 # --- Detailed View ---
 if 'selected_art' in st.session_state and st.session_state.selected_art:
     selected_art_name = st.session_state.selected_art
-    if not art_forms_df.empty and 'name' in art_forms_df.columns:
-        art_series_list = art_forms_df[art_forms_df['name'] == selected_art_name]
-        if not art_series_list.empty:
-            art = art_series_list.iloc[0]
+    # In pushdown mode only the visible page is in memory; the selected card is on it.
+    detail_source_df = visible_df if pushdown_mode else art_forms_df
+    if not detail_source_df.empty and 'name' in detail_source_df.columns:
+        if pushdown_mode:
+            detail_index = PrimaryKeyIndex(visible_df, 'name')  # one page of cards
+        else:
+            detail_index = get_art_form_detail_index(art_forms_dataset.version, art_forms_df)
+        art = detail_index.row(selected_art_name)
+        if art is not None:
 
             st.markdown('<div class="detail-container">', unsafe_allow_html=True)
             if st.button("← Back to Art Forms", key="detail_view_back_button"):
@@ -453,6 +602,8 @@ if 'selected_art' in st.session_state and st.session_state.selected_art:
             st.warning(f"Details for '{selected_art_name}' could not be found in the current dataset.")
     elif selected_art_name:
         st.warning(f"Art forms data is not available. Cannot display details for '{selected_art_name}'.")
+
+render_telemetry_panel()
 # import streamlit as st
 # import pandas as pd
 # import folium
@@ -1,9 +1,18 @@
 import streamlit as st
 import pandas as pd
-import folium
-from streamlit_folium import st_folium
 import plotly.express as px
 import plotly.graph_objects as go
+from utils.swr_cache import culture_heritage_cache
+from utils.connection import get_culture_heritage_connection, table_fingerprint
+from utils.dtypes import compact_dtypes
+from utils.states import apply_state_dimension
+from utils.lookup import PrimaryKeyIndex
+from utils.site_map import (CLUSTER_THRESHOLD, MAP_MODES, build_itinerary_layer, build_site_grid, build_sites_map,
+                            build_viewport_layer, parse_search_area, returned_map_events)
+from utils.itinerary import MAX_STOPS, plan_itinerary
+from utils.map_document import MapDocument, show_map_document
+from utils.nearby import NEARBY_RADIUS_KM, load_nearby_places
+from utils.telemetry import instrument_loader, render_telemetry_panel
 # from datetime import datetime # Not used in the provided snippet
 # import random # Not used in the provided snippet
 
@@ -17,12 +26,13 @@ st.set_page_config(
 
 # --- Snowflake Connection ---
 def get_snowflake_connection():
-    """Helper function to get Snowflake connection."""
-    return st.connection("snowflake")
+    """Helper function to get Snowflake connection (or a local backend in snapshot/offline/fixtures data mode)."""
+    return get_culture_heritage_connection()
 
 # --- Load UNESCO Sites Data from Snowflake ---
+@instrument_loader("unesco_sites")
 def load_unesco_sites_from_snowflake():
-    """Load UNESCO World Heritage Sites data from Snowflake."""
+    """Load UNESCO World Heritage Sites data from Snowflake (shared across sessions; read-only)."""
     try:
         conn = get_snowflake_connection()
         query = """
@@ -36,17 +46,59 @@ def load_unesco_sites_from_snowflake():
             LONGITUDE AS "Longitude"
         FROM UNESCO_INDIA_SITES;
         """
-        df = conn.query(query, ttl=3600)
-        if "Latitude" in df.columns:
-            df["Latitude"] = pd.to_numeric(df["Latitude"], errors='coerce')
-        if "Longitude" in df.columns:
-            df["Longitude"] = pd.to_numeric(df["Longitude"], errors='coerce')
-        df.dropna(subset=["Latitude", "Longitude"], inplace=True)
-        return df
+        def fetch_sites():
+            df = conn.query(query, ttl=0)
+            if "Latitude" in df.columns:
+                df["Latitude"] = pd.to_numeric(df["Latitude"], errors='coerce')
+            if "Longitude" in df.columns:
+                df["Longitude"] = pd.to_numeric(df["Longitude"], errors='coerce')
+            df.dropna(subset=["Latitude", "Longitude"], inplace=True)
+            return compact_dtypes(apply_state_dimension(df, "State/UT"), "unesco_sites")
+        return culture_heritage_cache.get(query, fetch_sites,
+                                          fingerprint=lambda: table_fingerprint(conn, "UNESCO_INDIA_SITES"))
     except Exception as e:
         st.error(f"Error loading UNESCO sites from Snowflake: {e}")
         return pd.DataFrame()
 
+@st.cache_resource(max_entries=2, show_spinner=False)
+def get_site_detail_index(sites_version, _sites_df):
+    """Site name -> row position for the detail panel, built once per version of the sites table."""
+    return PrimaryKeyIndex(_sites_df, 'Name', version=sites_version)
+
+@st.cache_resource(max_entries=6, show_spinner="Drawing the map...")
+def get_sites_map_document(sites_version, map_mode, _sites_df):
+    """Rendered sites map, built once per (sites table version, map mode) and reused by every rerun."""
+    m, rendering, skipped = build_sites_map(_sites_df, map_mode)
+    return MapDocument(m), rendering, skipped
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def get_site_grid(sites_version, _sites_df):
+    """Grid index over the site rows for the viewport rendering, built once per version of the sites table."""
+    grid, rows, _ = build_site_grid(_sites_df)
+    return grid, rows
+
+@st.cache_resource(max_entries=16, show_spinner="Planning the itinerary...")
+def get_itinerary(sites_version, stop_names, round_trip, _sites_df):
+    """Visiting order of the named sites, planned once per (sites table version, stops, round trip).
+
+    Returns (Itinerary, ordered stops as [lat, lon, name], itinerary table).
+    """
+    index = get_site_detail_index(sites_version, _sites_df)
+    sites = [index.row(name) for name in stop_names]
+    sites = [site for site in sites if site is not None]
+    itinerary = plan_itinerary([site["Latitude"] for site in sites], [site["Longitude"] for site in sites], round_trip)
+    ordered = [sites[position] for position in itinerary.order]
+    stops = [[float(site["Latitude"]), float(site["Longitude"]), site["Name"]] for site in ordered]
+    legs = [0.0] + itinerary.legs_km[:len(ordered) - 1]
+    table = pd.DataFrame({
+        "Stop": range(1, len(ordered) + 1),
+        "UNESCO Site": [site["Name"] for site in ordered],
+        "State/UT": [site.get("State/UT", "N/A") for site in ordered],
+        "Leg (km)": [round(leg) for leg in legs],
+        "Cumulative (km)": [round(total) for total in pd.Series(legs, dtype=float).cumsum()],
+    })
+    return itinerary, stops, table
+
 # --- Dummy Data Loaders for ASI Visitor Statistics ---
 # !!! IMPORTANT: Replace these with your actual data loading functions !!!
 def load_asi_visitor_trends_data():
@@ -199,83 +251,168 @@ st.markdown("""
 
 # --- Load UNESCO Data ---
 sites_df = load_unesco_sites_from_snowflake()
-
-# --- Create Map (UNESCO Sites) ---
-st.markdown('<div class="map-container">', unsafe_allow_html=True)
-if sites_df.empty:
-    st.warning("Could not load UNESCO site data for the map. Please check the connection or data source.")
-else:
-    m = folium.Map(location=[20.5937, 78.9629], zoom_start=5, tiles="cartodbpositron", control_scale=True)
-    def create_custom_icon():
-        return """<div style="background-color: #3498db; width: 12px; height: 12px; border-radius: 50%; border: 2px solid white; box-shadow: 0 0 4px rgba(0,0,0,0.3); position: relative;"><div style="position: absolute; top: 50%; left: 50%; transform: translate(-50%, -50%); width: 4px; height: 4px; background-color: white; border-radius: 50%;"></div></div>"""
-    for _, site_row in sites_df.iterrows():
-        icon_html = create_custom_icon()
-        site_name_from_df = site_row.get("Name", "Unknown Site")
-        official_url = UNESCO_SITE_URLS.get(site_name_from_df) # Match against the 'Name' column from DataFrame
-        popup_html = f"""<div style="width: 250px; padding: 10px;"><h3 style="margin: 0 0 10px 0; color: #2c3e50; font-size: 16px;">{site_name_from_df}</h3><div style="margin-bottom: 10px;"><span style="background-color: #f8f9fa; padding: 3px 8px; border-radius: 4px; font-size: 12px; color: #666;">{site_row.get("City", "N/A")} • {site_row.get("State/UT", "N/A")}</span></div><p style="margin: 0 0 10px 0; font-size: 13px; color: #555; line-height: 1.4;">{site_row.get("Short Description", "No description available.")}</p><div style="margin-bottom: 10px;"><span class="badge badge-unesco">UNESCO World Heritage Site</span></div>{f'<a href="{official_url}" target="_blank" style="display: inline-block; background-color: #3498db; color: white; padding: 5px 10px; text-decoration: none; border-radius: 4px; font-size: 12px;">View Full Details</a>' if official_url else ''}</div>"""
-        icon = folium.DivIcon(html=icon_html, icon_size=(12, 12), icon_anchor=(6, 6))
-        try:
-            lat = float(site_row["Latitude"]); lon = float(site_row["Longitude"])
-            folium.Marker([lat, lon], popup=folium.Popup(popup_html, max_width=300), tooltip=site_name_from_df, icon=icon).add_to(m)
-        except (ValueError, TypeError):
-            st.warning(f"Skipping UNESCO site '{site_name_from_df}' due to invalid coordinates.")
-    st_folium(m, width=1200, height=550, key="unesco_map_from_sf_v2")
-st.markdown('</div>', unsafe_allow_html=True)
-
-# --- Handle UNESCO site search (Placed after map) ---
-if not sites_df.empty:
-    search_site_name = st.text_input(
-        "Search for a UNESCO World Heritage Site by name:", "",
-        key="unesco_site_search_input_v2",
-        help="Type part of the UNESCO site name to see details below."
-    )
-    if search_site_name:
-        matching_sites = sites_df[sites_df['Name'].str.contains(search_site_name, case=False, na=False)]
-        if not matching_sites.empty:
-            st.session_state.selected_site = matching_sites.iloc[0]['Name']
-            # Consider if rerun is needed or if UI updates implicitly:
-            # st.rerun()
-        elif st.session_state.get('selected_site'): # Clear selection if search yields no results
-            del st.session_state.selected_site
-            # st.rerun() # Optionally rerun to clear details
-        else: # Only show warning if no match and nothing was previously selected or search is active
-            if search_site_name: # Avoid warning on initial empty search
-                 st.warning(f"No UNESCO sites found matching '{search_site_name}'")
-
-
-# --- UNESCO Site Details ---
-if 'selected_site' in st.session_state and st.session_state.selected_site:
+sites_version = culture_heritage_cache.version_of(sites_df)  # changes only with the data; keys the map caches
+
+# --- Nearby Places (Site Details) ---
+def render_nearby_places(sites_df, site_detail):
+    """List the UNESCO sites within NEARBY_RADIUS_KM of a site, and the crafts and festivals of the nearest states."""
+    latitude, longitude = site_detail.get("Latitude"), site_detail.get("Longitude")
+    if pd.isna(latitude) or pd.isna(longitude):
+        return
+    try:
+        nearby = load_nearby_places(sites_df)
+    except Exception as e:
+        st.error(f"Error loading nearby places from Snowflake: {e}")
+        return
+
+    st.subheader(f"Within {NEARBY_RADIUS_KM} km")
+    nearby_sites = nearby.within("unesco_sites", latitude, longitude)
+    nearby_sites = nearby_sites[nearby_sites["name"] != site_detail.get("Name")]
+    if nearby_sites.empty:
+        nearest_sites = nearby.nearest("unesco_sites", latitude, longitude, k=4)
+        nearest_sites = nearest_sites[nearest_sites["name"] != site_detail.get("Name")].head(3)
+        st.caption(f"No other UNESCO sites within {NEARBY_RADIUS_KM} km. Nearest: " +
+                   ", ".join(f"{row.name} ({row.distance_km:,.0f} km)" for row in nearest_sites.itertuples()))
+    else:
+        st.dataframe(nearby_sites[["name", "state", "distance_km"]].rename(
+            columns={"name": "UNESCO Site", "state": "State/UT", "distance_km": "Distance (km)"}),
+            use_container_width=True, hide_index=True)
+
+    col_crafts, col_festivals = st.columns(2)
+    for column, kind, title in [(col_crafts, "crafts", "Crafts"), (col_festivals, "festivals", "Festivals")]:
+        with column:
+            st.markdown(f"##### {title} Nearby")
+            places = nearby.nearest(kind, latitude, longitude, k=5)
+            if places.empty:
+                st.caption(f"No {title.lower()} data available.")
+            for place in places.itertuples():
+                st.markdown(f"- **{place.name}** ({place.state}, ~{place.distance_km:,.0f} km)")
+    st.caption("Crafts and festivals are located by state; distances are to the centre of their state.")
+
+# --- UNESCO Map, Search and Site Details (Fragment) ---
+# Map clicks, mode changes, searches and the viewport's pans and zooms only rerun this
+# fragment; the statistics, ASI tables and charts below are not rebuilt.
+@st.fragment
+def render_sites_explorer(sites_version, sites_df):
+    """Render the UNESCO sites map with the site search and the selected site's details."""
+    # --- Create Map (UNESCO Sites) ---
+    st.markdown('<div class="map-container">', unsafe_allow_html=True)
+    if sites_df.empty:
+        st.warning("Could not load UNESCO site data for the map. Please check the connection or data source.")
+    else:
+        map_mode_label = st.radio("Map rendering", list(MAP_MODES), horizontal=True, key="unesco_map_mode",
+                                  help="Clustered ships all sites as one data layer and groups them in the browser; "
+                                       "Viewport draws only the sites in view and groups them when zoomed out; "
+                                       f"Auto clusters maps with more than {CLUSTER_THRESHOLD} sites.")
+        map_document, map_rendering, skipped_sites = get_sites_map_document(
+            sites_version, MAP_MODES[map_mode_label], sites_df)
+        for skipped_site in skipped_sites:
+            st.warning(f"Skipping UNESCO site '{skipped_site}' due to invalid coordinates.")
+        with st.expander("🧭 Plan a Multi-Site Itinerary"):
+            itinerary_sites = st.multiselect(
+                "Sites to visit (the first one is the starting point)", sorted(sites_df["Name"].dropna().unique()),
+                key="itinerary_sites", max_selections=MAX_STOPS)
+            itinerary_round_trip = st.checkbox("Return to the starting site", key="itinerary_round_trip")
+        map_layers = []
+        itinerary = None
+        if len(itinerary_sites) >= 2:
+            itinerary, itinerary_stops, itinerary_table = get_itinerary(
+                sites_version, tuple(itinerary_sites), itinerary_round_trip, sites_df)
+            map_layers.append(build_itinerary_layer(itinerary_stops, itinerary_round_trip))
+        if map_rendering == "viewport":
+            site_grid, site_grid_rows = get_site_grid(sites_version, sites_df)
+            # The layer follows the last "Search this area" click; it is kept in session_state because a later
+            # site click replaces the tooltip the area arrived in.
+            last_click = (st.session_state.get("unesco_map_from_sf_v2") or {}).get("last_object_clicked_tooltip")
+            search_area = parse_search_area(last_click)
+            if search_area is not None:
+                st.session_state.unesco_map_search_area = search_area
+            area_bounds, area_zoom = st.session_state.get("unesco_map_search_area", (None, None))
+            viewport_layer, viewport_markers, viewport_bubbles = build_viewport_layer(
+                site_grid, site_grid_rows, area_bounds, area_zoom)
+            map_layers.insert(0, viewport_layer)
+            st.caption(f"Showing {viewport_markers} sites and {viewport_bubbles} grouped areas. "
+                       "Pan or zoom, then press \"Search this area\" on the map to update them.")
+        map_state = show_map_document(map_document, key="unesco_map_from_sf_v2", width=1200, height=550,
+                                      returned_objects=returned_map_events(map_rendering),
+                                      feature_group=map_layers)
+        clicked_site = (map_state or {}).get("last_object_clicked_tooltip")
+        if clicked_site and clicked_site != st.session_state.get("unesco_map_clicked_site"):
+            st.session_state.unesco_map_clicked_site = clicked_site  # handle each click once
+            if clicked_site in get_site_detail_index(sites_version, sites_df):
+                st.session_state.selected_site = clicked_site
+        if itinerary is not None:
+            st.markdown(f"##### 🧭 Your Itinerary: {len(itinerary_stops)} sites, {itinerary.total_km:,.0f} km")
+            st.dataframe(itinerary_table, use_container_width=True, hide_index=True)
+            distances_note = ("Straight-line distances; the total includes the way back to the start."
+                              if itinerary_round_trip else "Straight-line distances.")
+            planning_note = ("every order compared" if itinerary.method == "exact" else
+                             f"nearest neighbour, then {itinerary.improvements} 2-opt improvements")
+            st.caption(f"{distances_note} Order planned in {itinerary.elapsed_ms:.0f} ms ({planning_note}).")
+    st.markdown('</div>', unsafe_allow_html=True)
+
+    # --- Handle UNESCO site search (Placed after map) ---
     if not sites_df.empty:
-        # Ensure selected_site is valid within the current sites_df
-        selected_site_data_list = sites_df[sites_df['Name'] == st.session_state.selected_site]
-        if not selected_site_data_list.empty:
-            site_detail = selected_site_data_list.iloc[0]
-            st.markdown('<div class="site-details">', unsafe_allow_html=True)
-            site_name_detail = site_detail.get("Name", "N/A")
-            st.markdown(f'<div class="site-title">{site_name_detail}</div>', unsafe_allow_html=True)
-            st.markdown(f'<div class="site-subtitle">{site_detail.get("City", "N/A")} • {site_detail.get("State/UT", "N/A")}</div>', unsafe_allow_html=True)
-            st.markdown('<span class="badge badge-unesco">UNESCO World Heritage Site</span>', unsafe_allow_html=True)
-            st.markdown(f'<div class="site-description">{site_detail.get("Short Description", "No description available.")}</div>', unsafe_allow_html=True)
-
-            st.subheader("Location Details")
-            col1_loc, col2_loc = st.columns(2)
-            with col1_loc: st.markdown(f"""<div class="stats-card"><h4>City</h4><p>{site_detail.get('City', "N/A")}</p></div>""", unsafe_allow_html=True)
-            with col2_loc: st.markdown(f"""<div class="stats-card"><h4>District</h4><p>{site_detail.get('District', "N/A")}</p></div>""", unsafe_allow_html=True)
-
-            st.subheader("Coordinates")
-            st.markdown(f"""<div class="stats-card"><p>Latitude: {site_detail.get('Latitude', "N/A")}<br>Longitude: {site_detail.get('Longitude', "N/A")}</p></div>""", unsafe_allow_html=True)
-
-            if st.button("Clear Selection / Back to Map Overview", key="clear_selection_button"):
-                del st.session_state.selected_site
-                st.rerun()
-            st.markdown('</div>', unsafe_allow_html=True)
-        else: # Selected site name not found in current df (e.g., after data refresh)
-            if st.session_state.get('selected_site'):
-                st.warning(f"Details for '{st.session_state.selected_site}' no longer found. Clearing selection.")
-                del st.session_state.selected_site
-                st.rerun()
-elif not sites_df.empty:
-    st.info("👆 Click on a marker on the map or use the search above to view detailed information about a UNESCO World Heritage Site.")
+        search_site_name = st.text_input(
+            "Search for a UNESCO World Heritage Site by name:", "",
+            key="unesco_site_search_input_v2",
+            help="Type part of the UNESCO site name to see details below."
+        )
+        # Apply the search only when it changed since the last run, so a later marker click wins.
+        search_changed = search_site_name != st.session_state.get("unesco_site_search_applied", "")
+        st.session_state.unesco_site_search_applied = search_site_name
+        if search_site_name:
+            matching_sites = sites_df[sites_df['Name'].str.contains(search_site_name, case=False, na=False)]
+            if not matching_sites.empty:
+                if search_changed:
+                    st.session_state.selected_site = matching_sites.iloc[0]['Name']
+            else:
+                if search_changed and st.session_state.get('selected_site'): # Clear selection if search yields no results
+                    del st.session_state.selected_site
+                if not st.session_state.get('selected_site'): # Only warn if nothing is selected
+                    st.warning(f"No UNESCO sites found matching '{search_site_name}'")
+
+
+    # --- UNESCO Site Details ---
+    if 'selected_site' in st.session_state and st.session_state.selected_site:
+        if not sites_df.empty:
+            # Ensure selected_site is valid within the current sites_df
+            site_detail = get_site_detail_index(sites_version, sites_df).row(st.session_state.selected_site)
+            if site_detail is not None:
+                st.markdown('<div class="site-details">', unsafe_allow_html=True)
+                site_name_detail = site_detail.get("Name", "N/A")
+                st.markdown(f'<div class="site-title">{site_name_detail}</div>', unsafe_allow_html=True)
+                st.markdown(f'<div class="site-subtitle">{site_detail.get("City", "N/A")} • {site_detail.get("State/UT", "N/A")}</div>', unsafe_allow_html=True)
+                st.markdown('<span class="badge badge-unesco">UNESCO World Heritage Site</span>', unsafe_allow_html=True)
+                st.markdown(f'<div class="site-description">{site_detail.get("Short Description", "No description available.")}</div>', unsafe_allow_html=True)
+                official_url = UNESCO_SITE_URLS.get(site_name_detail)
+                if official_url:  # was the map popup's button; the map no longer carries popups
+                    st.markdown(f'<a href="{official_url}" target="_blank" style="display: inline-block; background-color: #3498db; color: white; padding: 5px 10px; text-decoration: none; border-radius: 4px; font-size: 12px;">View Full Details</a>', unsafe_allow_html=True)
+
+                st.subheader("Location Details")
+                col1_loc, col2_loc = st.columns(2)
+                with col1_loc: st.markdown(f"""<div class="stats-card"><h4>City</h4><p>{site_detail.get('City', "N/A")}</p></div>""", unsafe_allow_html=True)
+                with col2_loc: st.markdown(f"""<div class="stats-card"><h4>District</h4><p>{site_detail.get('District', "N/A")}</p></div>""", unsafe_allow_html=True)
+
+                st.subheader("Coordinates")
+                st.markdown(f"""<div class="stats-card"><p>Latitude: {site_detail.get('Latitude', "N/A")}<br>Longitude: {site_detail.get('Longitude', "N/A")}</p></div>""", unsafe_allow_html=True)
+
+                render_nearby_places(sites_df, site_detail)
+
+                if st.button("Clear Selection / Back to Map Overview", key="clear_selection_button"):
+                    del st.session_state.selected_site
+                    st.rerun(scope="fragment")
+                st.markdown('</div>', unsafe_allow_html=True)
+            else: # Selected site name not found in current df (e.g., after data refresh)
+                if st.session_state.get('selected_site'):
+                    st.warning(f"Details for '{st.session_state.selected_site}' no longer found. Clearing selection.")
+                    del st.session_state.selected_site
+                    st.rerun(scope="fragment")
+    elif not sites_df.empty:
+        st.info("👆 Click on a marker on the map or use the search above to view detailed information about a UNESCO World Heritage Site.")
+
+
+render_sites_explorer(sites_version, sites_df)
 
 
 # --- UNESCO Site Statistics Dashboard ---
@@ -412,6 +549,8 @@ else:
     st.warning("ASI top monuments data could not be loaded (currently using dummy data placeholders).")
 
 
+render_telemetry_panel()
+
 # --- Footer ---
 st.markdown("---")
 st.markdown(
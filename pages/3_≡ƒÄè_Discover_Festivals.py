@@ -1,5 +1,10 @@
 import streamlit as st
 import pandas as pd
+from utils.swr_cache import culture_heritage_cache
+from utils.connection import get_culture_heritage_connection, table_fingerprint
+from utils.dtypes import compact_dtypes
+from utils.states import apply_state_dimension
+from utils.telemetry import instrument_loader, render_telemetry_panel
 
 # --- Page Configuration ---
 st.set_page_config(
@@ -9,8 +14,10 @@ st.set_page_config(
     page_icon="🎉"
 )
 def get_snowflake_connection():
-    return st.connection("snowflake")
+    # Live Snowflake, or a local backend in snapshot/offline/fixtures data mode.
+    return get_culture_heritage_connection()
 # --- Function to fetch festivals from Snowflake ---
+@instrument_loader("festivals")
 def get_festivals_from_snowflake():
     """Fetch festival data from Snowflake FESTIVALS_FINAL table."""
     try:
@@ -25,7 +32,8 @@ def get_festivals_from_snowflake():
         FROM
             "CULTURE_HERITAGE"."PUBLIC"."FESTIVALS_FINAL";
         """
-        df = conn.query(query, ttl=3600)
+        df = culture_heritage_cache.get(query, lambda: compact_dtypes(apply_state_dimension(conn.query(query, ttl=0), "STATE"), "festivals"),
+                                        fingerprint=lambda: table_fingerprint(conn, "FESTIVALS_FINAL"))
         return df
     except Exception as e:
         st.error(f"Error fetching festivals from Snowflake: {e}")
@@ -54,3 +62,5 @@ if not df.empty:
                 st.markdown("---")
 else:
     st.warning("No festival data available.")
+
+render_telemetry_panel()
@@ -4,6 +4,7 @@ import plotly.express as px
 import plotly.graph_objects as go
 import random
 from datetime import datetime
+from utils.states import STATE_IDS, apply_state_dimension
 
 # --- Page Configuration ---
 st.set_page_config(
@@ -314,9 +315,10 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # --- Load Data ---
-funding_df = get_government_funding()
-artisan_df = get_artisan_registrations()
-tourism_df = get_tourism_impact()
+# State names are resolved to the shared state dimension, so the datasets filter and join on state_id.
+funding_df = apply_state_dimension(get_government_funding(), 'state')
+artisan_df = apply_state_dimension(get_artisan_registrations(), 'state')
+tourism_df = apply_state_dimension(get_tourism_impact(), 'state')
 
 # --- Filters ---
 st.markdown('<div class="filter-section">', unsafe_allow_html=True)
@@ -334,6 +336,7 @@ with col2:
         "Select State",
         ["All States"] + all_states
     )
+    selected_state_id = STATE_IDS.get(selected_state)
 
 with col3:
     all_schemes = sorted(funding_df['scheme'].unique())
@@ -356,9 +359,9 @@ filtered_tourism = filtered_tourism[filtered_tourism['year'] == selected_year]
 
 # Apply state filter if not "All States"
 if selected_state != "All States":
-    filtered_funding = filtered_funding[filtered_funding['state'] == selected_state]
-    filtered_artisan = filtered_artisan[filtered_artisan['state'] == selected_state]
-    filtered_tourism = filtered_tourism[filtered_tourism['state'] == selected_state]
+    filtered_funding = filtered_funding[filtered_funding['state_id'] == selected_state_id]
+    filtered_artisan = filtered_artisan[filtered_artisan['state_id'] == selected_state_id]
+    filtered_tourism = filtered_tourism[filtered_tourism['state_id'] == selected_state_id]
 
 # Apply scheme filter if not "All Schemes"
 if selected_scheme != "All Schemes":
@@ -384,9 +387,9 @@ prev_tourism = tourism_df[tourism_df['year'] == prev_year]
 
 # Apply state filter to previous year data if needed
 if selected_state != "All States":
-    prev_funding = prev_funding[prev_funding['state'] == selected_state]
-    prev_artisan = prev_artisan[prev_artisan['state'] == selected_state]
-    prev_tourism = prev_tourism[prev_tourism['state'] == selected_state]
+    prev_funding = prev_funding[prev_funding['state_id'] == selected_state_id]
+    prev_artisan = prev_artisan[prev_artisan['state_id'] == selected_state_id]
+    prev_tourism = prev_tourism[prev_tourism['state_id'] == selected_state_id]
 
 # Apply scheme filter to previous year data if needed
 if selected_scheme != "All Schemes":
@@ -629,7 +632,7 @@ col1, col2 = st.columns(2)
 with col1:
     # Artisan registration trend over years
     if selected_state != "All States":
-        artisan_trend = artisan_df[artisan_df['state'] == selected_state].groupby('year').agg({
+        artisan_trend = artisan_df[artisan_df['state_id'] == selected_state_id].groupby('year').agg({
             'registered_artisans': 'sum',
             'women_percentage': 'mean',
             'digital_percentage': 'mean'
@@ -730,10 +733,10 @@ if selected_state == "All States":
 # Correlation between funding and artisan growth
 if selected_state == "All States":
     # Prepare data for correlation analysis
-    funding_by_state = filtered_funding.groupby('state')['funding_lakhs'].sum().reset_index()
-    artisan_by_state = filtered_artisan.groupby('state')['registered_artisans'].sum().reset_index()
+    funding_by_state = filtered_funding.groupby(['state_id', 'state'])['funding_lakhs'].sum().reset_index()
+    artisan_by_state = filtered_artisan.groupby('state_id')['registered_artisans'].sum().reset_index()
     
-    correlation_data = pd.merge(funding_by_state, artisan_by_state, on='state')
+    correlation_data = pd.merge(funding_by_state, artisan_by_state, on='state_id')
     
     fig = px.scatter(
         correlation_data,
@@ -793,7 +796,7 @@ col1, col2 = st.columns(2)
 with col1:
     # Tourism revenue trend
     if selected_state != "All States":
-        tourism_trend = tourism_df[tourism_df['state'] == selected_state].groupby('year').agg({
+        tourism_trend = tourism_df[tourism_df['state_id'] == selected_state_id].groupby('year').agg({
             'tourism_revenue_crores': 'sum',
             'tourism_employment': 'sum',
             'tourist_arrivals': 'sum',
@@ -924,10 +927,10 @@ if selected_state == "All States":
 # Correlation between funding and tourism revenue
 if selected_state == "All States":
     # Prepare data for correlation analysis
-    funding_by_state = filtered_funding.groupby('state')['funding_lakhs'].sum().reset_index()
-    tourism_by_state = filtered_tourism.groupby('state')['tourism_revenue_crores'].sum().reset_index()
+    funding_by_state = filtered_funding.groupby(['state_id', 'state'])['funding_lakhs'].sum().reset_index()
+    tourism_by_state = filtered_tourism.groupby('state_id')['tourism_revenue_crores'].sum().reset_index()
     
-    correlation_data_tourism = pd.merge(funding_by_state, tourism_by_state, on='state')
+    correlation_data_tourism = pd.merge(funding_by_state, tourism_by_state, on='state_id')
     
     fig = px.scatter(
         correlation_data_tourism,
@@ -0,0 +1,52 @@
+import pandas as pd
+import pytest
+
+from utils.art_form_queries import build_art_forms_page_query, normalize_art_form_filters
+from utils.local_engine import FixtureConnection
+from utils.search import ArtFormSearchIndex
+
+QUERIES = ["a", "or", "ka", "pai", "madhu pai", "weav", "art", "dance", "zzz"]
+
+
+@pytest.fixture(scope="module")
+def conn():
+    return FixtureConnection()
+
+
+@pytest.fixture(scope="module")
+def all_art_forms(conn):
+    query, params = build_art_forms_page_query(normalize_art_form_filters("All States", "All Types", ""), 100_000)
+    return conn.query(query, params=params).rename(columns=str.upper)
+
+
+def pushdown_pages(conn, term, page_size):
+    """Every row the paged query returns for `term`, following the keyset cursor page by page."""
+    filters = normalize_art_form_filters("All States", "All Types", term)
+    rows, after = [], None
+    while True:
+        query, params = build_art_forms_page_query(filters, page_size, after)
+        page = conn.query(query, params=params).rename(columns=str.upper)
+        rows += list(zip(page["NAME_RANK"][:page_size], page["SORT_NAME"][:page_size], page["SORT_STATE"][:page_size]))
+        if len(page) <= page_size:
+            return rows
+        last = page.iloc[page_size - 1]
+        after = (int(last["NAME_RANK"]), last["SORT_NAME"], last["SORT_STATE"])
+
+
+@pytest.mark.parametrize("term", QUERIES)
+def test_pushdown_matches_local_search_index(conn, all_art_forms, term):
+    index = ArtFormSearchIndex(pd.DataFrame({"name": all_art_forms["NAME"],
+                                             "description": all_art_forms["DESCRIPTION"]}))
+    matches = all_art_forms.iloc[index.search(term)]
+    expected = set(zip(matches["SORT_NAME"], matches["SORT_STATE"]))
+    rows = pushdown_pages(conn, term, page_size=3)
+    keys = [(name, state) for _, name, state in rows]
+    assert set(keys) == expected
+    assert len(keys) == len(set(keys))  # no row repeated across page boundaries
+    assert [rank for rank, _, _ in rows] == sorted(rank for rank, _, _ in rows)
+
+
+@pytest.mark.parametrize("page_size", [1, 2, 7])
+def test_keyset_pages_concatenate_to_one_page(conn, page_size):
+    for term in QUERIES:
+        assert pushdown_pages(conn, term, page_size) == pushdown_pages(conn, term, 100_000), term
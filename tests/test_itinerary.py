@@ -0,0 +1,43 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from utils.itinerary import EXACT_MAX_STOPS, plan_itinerary
+from utils.spatial import haversine_matrix_km
+
+
+def brute_force_km(latitudes, longitudes, round_trip):
+    distances = haversine_matrix_km(latitudes, longitudes)
+    best = np.inf
+    for rest in itertools.permutations(range(1, len(latitudes))):
+        stops = (0,) + rest + ((0,) if round_trip else ())
+        best = min(best, sum(distances[a, b] for a, b in zip(stops, stops[1:])))
+    return best
+
+
+@pytest.mark.parametrize("round_trip", [False, True])
+def test_small_itineraries_match_brute_force(round_trip):
+    rng = np.random.default_rng(17)
+    for _ in range(100):
+        n = int(rng.integers(1, 8))
+        latitudes, longitudes = rng.uniform(8, 34, n), rng.uniform(69, 95, n)
+        itinerary = plan_itinerary(latitudes, longitudes, round_trip)
+        assert itinerary.order[0] == 0 and sorted(itinerary.order) == list(range(n))
+        assert itinerary.total_km == pytest.approx(brute_force_km(latitudes, longitudes, round_trip))
+        assert itinerary.total_km == pytest.approx(sum(itinerary.legs_km))
+
+
+@pytest.mark.parametrize("round_trip", [False, True])
+def test_large_itineraries_visit_every_stop(round_trip):
+    rng = np.random.default_rng(23)
+    n = EXACT_MAX_STOPS + 40
+    latitudes, longitudes = rng.uniform(8, 34, n), rng.uniform(69, 95, n)
+    itinerary = plan_itinerary(latitudes, longitudes, round_trip)
+    assert itinerary.method == "2-opt"
+    assert itinerary.order[0] == 0 and sorted(itinerary.order) == list(range(n))
+    assert len(itinerary.legs_km) == (n if round_trip else n - 1)
+
+
+def test_empty_itinerary():
+    assert plan_itinerary([], []).order == []
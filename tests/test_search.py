@@ -0,0 +1,57 @@
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.search import (DESCRIPTION_WEIGHT, EXACT_TOKEN_BONUS, NAME_WEIGHT, ArtFormSearchIndex,
+                          tokenize_query)
+
+
+def random_words(rng, count, alphabet="abcdef"):
+    return " ".join("".join(rng.choice(list(alphabet), int(rng.integers(1, 6)))) for _ in range(count))
+
+
+@pytest.fixture(scope="module")
+def art_forms():
+    # A small alphabet gives both narrow prefixes and ones spanning hundreds of tokens.
+    rng = np.random.default_rng(19)
+    names = [random_words(rng, int(rng.integers(1, 4))).title() for _ in range(1_500)]
+    descriptions = [None if rng.random() < 0.1 else random_words(rng, int(rng.integers(0, 8))) + "."
+                    for _ in range(1_500)]
+    return pd.DataFrame({"name": names, "description": descriptions})
+
+
+def linear_search(df, query):
+    """Score every row: per term, the best of name/description token prefix matches, exact tokens first."""
+    terms = tokenize_query(query)
+    if not terms:
+        return []
+    scored = []
+    for position, (name, description) in enumerate(zip(df["name"], df["description"])):
+        tokens = [(token, NAME_WEIGHT) for token in re.findall(r"\w+", str(name).lower())]
+        tokens += [(token, DESCRIPTION_WEIGHT) for token in re.findall(r"\w+", str(description or "").lower())]
+        total = 0
+        for term in terms:
+            best = max((weight + (EXACT_TOKEN_BONUS if token == term else 0)
+                        for token, weight in tokens if token.startswith(term)), default=0)
+            if best == 0:
+                break
+            total += best
+        else:
+            scored.append((-total, position))
+    return [position for _, position in sorted(scored)]
+
+
+def test_search_matches_linear_scan(art_forms):
+    index = ArtFormSearchIndex(art_forms)
+    rng = np.random.default_rng(29)
+    queries = ["a", "ab", "Abc", "fed cab", "a-b", "zzz", "", "  "]
+    queries += [random_words(rng, int(rng.integers(1, 4))) for _ in range(100)]
+    for query in queries:
+        assert index.search(query).tolist() == linear_search(art_forms, query), query
+
+
+def test_search_limit(art_forms):
+    index = ArtFormSearchIndex(art_forms)
+    assert index.search("a", limit=10).tolist() == linear_search(art_forms, "a")[:10]
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from utils.spatial import GridIndex, haversine_km
+
+
+@pytest.fixture(scope="module")
+def india_points():
+    rng = np.random.default_rng(7)
+    return rng.uniform(6, 37, 20_000), rng.uniform(68, 98, 20_000)
+
+
+def test_within_matches_brute_force(india_points):
+    latitudes, longitudes = india_points
+    grid = GridIndex(latitudes, longitudes)
+    rng = np.random.default_rng(11)
+    for _ in range(200):
+        latitude, longitude, radius = rng.uniform(5, 38), rng.uniform(66, 100), rng.uniform(1, 400)
+        expected = np.flatnonzero(haversine_km(latitude, longitude, latitudes, longitudes) <= radius)
+        positions, distances = grid.within(latitude, longitude, radius)
+        assert sorted(positions) == sorted(expected)
+        assert np.all(np.diff(distances) >= 0)
+
+
+def test_nearest_matches_brute_force(india_points):
+    latitudes, longitudes = india_points
+    grid = GridIndex(latitudes, longitudes)
+    rng = np.random.default_rng(13)
+    for _ in range(100):
+        latitude, longitude, k = rng.uniform(0, 45), rng.uniform(60, 105), int(rng.integers(1, 30))
+        expected = np.sort(haversine_km(latitude, longitude, latitudes, longitudes))[:k]
+        positions, distances = grid.nearest(latitude, longitude, k)
+        assert np.allclose(distances, expected)
+        assert np.allclose(haversine_km(latitude, longitude, latitudes[positions], longitudes[positions]), distances)
+
+
+def test_nearest_with_fewer_points_than_k():
+    grid = GridIndex([10.0, 20.0, 30.0], [70.0, 80.0, 90.0])
+    positions, distances = grid.nearest(-40, -100, 5)
+    assert sorted(positions) == [0, 1, 2]
+    assert np.all(np.diff(distances) >= 0)
+
+
+def test_within_high_latitudes_and_poles():
+    rng = np.random.default_rng(3)
+    latitudes, longitudes = rng.uniform(60, 90, 5_000), rng.uniform(-180, 180, 5_000)
+    grid = GridIndex(latitudes, longitudes)
+    for latitude, longitude, radius in [(80, 10, 900), (89.5, -170, 300), (70, 179.5, 200), (65, 0, 2_000)]:
+        expected = np.flatnonzero(haversine_km(latitude, longitude, latitudes, longitudes) <= radius)
+        assert sorted(grid.within(latitude, longitude, radius)[0]) == sorted(expected)
+
+
+def test_within_empty_index():
+    positions, distances = GridIndex([], []).within(20, 78, 50)
+    assert len(positions) == 0 and len(distances) == 0
+
+
+def test_aggregate_matches_brute_force():
+    # 0.001 degree cells give 360,000 columns: a row * 100_000 + col key would merge distinct cells.
+    rng = np.random.default_rng(5)
+    latitudes, longitudes = rng.uniform(10, 10.01, 2_000), rng.uniform(-180, 180, 2_000)
+    grid = GridIndex(latitudes, longitudes)
+    cell_degrees = 0.001
+    mean_lat, mean_lon, counts, first = grid.aggregate(np.arange(len(latitudes)), cell_degrees)
+    cells = {}
+    for position, (latitude, longitude) in enumerate(zip(latitudes, longitudes)):
+        key = (np.floor((latitude + 90) / cell_degrees), np.floor((longitude + 180) / cell_degrees))
+        cells.setdefault(key, []).append(position)
+    assert len(counts) == len(cells) and counts.sum() == len(latitudes)
+    for latitude, longitude, count, position in zip(mean_lat, mean_lon, counts, first):
+        members = cells[(np.floor((latitudes[position] + 90) / cell_degrees),
+                         np.floor((longitudes[position] + 180) / cell_degrees))]
+        assert count == len(members) and position == members[0]
+        assert np.isclose(latitude, latitudes[members].mean()) and np.isclose(longitude, longitudes[members].mean())
@@ -0,0 +1,56 @@
+import pandas as pd
+
+from utils.states import STATE_IDS, apply_state_dimension, resolve_states, rows_in_state, state_bit
+
+
+def resolve_one(label):
+    return resolve_states([label]).iloc[0]
+
+
+def test_spellings_resolve_to_canonical_states():
+    cases = {
+        "Orissa": "Odisha",
+        "Uttarakhand Formerly Uttaranchal": "Uttarakhand",
+        "Jammu & Kashmir": "Jammu and Kashmir",
+        "J&K": "Jammu and Kashmir",
+        " tamilnadu ": "Tamil Nadu",
+    }
+    for label, name in cases.items():
+        row = resolve_one(label)
+        assert row["label"] == name, label
+        assert row["state_id"] == STATE_IDS[name] and row["mask"] == state_bit(STATE_IDS[name]), label
+
+
+def test_compound_label_keeps_every_state():
+    row = resolve_one("Odisha, West Bengal")
+    odisha, west_bengal = STATE_IDS["Odisha"], STATE_IDS["West Bengal"]
+    assert row["label"] == "Odisha, West Bengal"
+    assert row["state_id"] == odisha  # the first state
+    assert row["mask"] == state_bit(odisha) | state_bit(west_bengal)
+    df = apply_state_dimension(pd.DataFrame({"state": ["Odisha, West Bengal", "Orissa", "Bihar"]}), "state")
+    assert df["state_mask"].iloc[0] == row["mask"] and df["state_id"].iloc[0] == odisha
+    assert rows_in_state(df, west_bengal).tolist() == [True, False, False]
+    assert rows_in_state(df, odisha).tolist() == [True, True, False]
+
+
+def test_missing_labels_resolve_to_no_state(capsys):
+    resolved = resolve_states(pd.Series([None, "", float("nan")]))
+    assert resolved["label"].tolist() == ["N/A", "N/A", "N/A"]
+    assert resolved["state_id"].isna().all() and (resolved["mask"] == 0).all()
+    assert capsys.readouterr().out == ""
+
+
+def test_unknown_label_warns_once(capsys):
+    resolved = resolve_states(["Atlantis", "Atlantis", "Kerala"])
+    assert resolved["label"].tolist() == ["Atlantis", "Atlantis", "Kerala"]
+    assert resolved["state_id"].isna().tolist() == [True, True, False]
+    assert resolved["mask"].tolist()[:2] == [0, 0]
+    resolve_states(["Atlantis"])
+    assert capsys.readouterr().out.count("'Atlantis'") == 1
+
+
+def test_result_is_aligned_with_the_input_index():
+    labels = pd.Series(["Orissa", None, "Goa"], index=[10, 20, 30])
+    resolved = resolve_states(labels)
+    assert resolved.index.tolist() == [10, 20, 30]
+    assert resolved["label"].tolist() == ["Odisha", "N/A", "Goa"]
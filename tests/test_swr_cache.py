@@ -0,0 +1,127 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from utils.swr_cache import StaleWhileRevalidateCache
+
+
+@pytest.fixture(autouse=True)
+def no_telemetry_log(monkeypatch):
+    monkeypatch.setattr("utils.telemetry.TELEMETRY_LOG_PATH", "off")
+
+
+class CountingLoader:
+    def __init__(self, make_value=lambda calls: pd.DataFrame({"x": [1, 2, 3]}), delay=0.0):
+        self.make_value, self.delay, self.calls = make_value, delay, 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+            calls = self.calls
+        time.sleep(self.delay)
+        return self.make_value(calls)
+
+
+def wait_for_refreshes():
+    for thread in threading.enumerate():
+        if thread.name == "swr-refresh":
+            thread.join()
+
+
+def test_cold_key_loads_once_for_concurrent_callers():
+    cache = StaleWhileRevalidateCache()
+    loader = CountingLoader(delay=0.05)
+    start = threading.Barrier(16)
+    results = []
+
+    def call():
+        start.wait()
+        results.append(cache.get("sites", loader))
+
+    threads = [threading.Thread(target=call) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert loader.calls == 1
+    assert len(results) == 16 and all(result is results[0] for result in results)
+
+
+def test_expired_ttl_serves_stale_value_and_refreshes_once():
+    cache = StaleWhileRevalidateCache(ttl=0)  # every get after the first load sees a stale entry
+    loader = CountingLoader(make_value=lambda calls: pd.DataFrame({"x": [calls]}), delay=0.05)
+    first = cache.get("sites", loader)
+    stale = [cache.get("sites", loader) for _ in range(20)]
+    assert all(value is first for value in stale)
+    wait_for_refreshes()
+    assert loader.calls == 2 and cache.stats["refreshes"] == 1
+    assert cache.get("sites", loader)["x"].tolist() == [2]
+
+
+def test_equal_reload_keeps_value_and_version():
+    cache = StaleWhileRevalidateCache(ttl=0)
+    loader = CountingLoader()
+    first = cache.get("sites", loader)
+    version = cache.version_of(first)
+    cache.get("sites", loader)
+    wait_for_refreshes()
+    assert loader.calls == 2
+    assert cache.get("sites", loader) is first
+    assert cache.version_of(first) == version
+
+
+def test_changed_reload_bumps_version():
+    cache = StaleWhileRevalidateCache(ttl=0)
+    loader = CountingLoader(make_value=lambda calls: pd.DataFrame({"x": [calls]}))
+    first = cache.get("sites", loader)
+    version = cache.version_of(first)
+    cache.get("sites", loader)
+    wait_for_refreshes()
+    second = cache.get("sites", loader)
+    assert second is not first and second["x"].tolist() == [2]
+    assert cache.version_of(second) != version
+    # The replaced value is no longer held, so it never matches a version twice.
+    assert cache.version_of(first) != cache.version_of(first)
+
+
+def test_version_of_is_per_key():
+    cache = StaleWhileRevalidateCache(ttl=0)
+    sites = cache.get("sites", CountingLoader(make_value=lambda calls: pd.DataFrame({"x": [calls]})))
+    crafts = cache.get("crafts", CountingLoader())
+    sites_version, crafts_version = cache.version_of(sites), cache.version_of(crafts)
+    assert sites_version != crafts_version
+    cache.get("sites", CountingLoader(make_value=lambda calls: pd.DataFrame({"x": [99]})))
+    wait_for_refreshes()
+    assert cache.version_of(cache.get("sites", CountingLoader())) != sites_version
+    assert cache.version_of(crafts) == crafts_version
+
+
+def test_failed_refresh_keeps_stale_value_and_backs_off():
+    cache = StaleWhileRevalidateCache(ttl=0)
+    value = cache.get("sites", CountingLoader())
+
+    def failing_loader():
+        failing_loader.calls += 1
+        raise RuntimeError("warehouse unavailable")
+    failing_loader.calls = 0
+
+    assert cache.get("sites", failing_loader) is value
+    wait_for_refreshes()
+    assert failing_loader.calls == 1 and cache.stats["refresh_failures"] == 1
+    # Within RETRY_AFTER_SECONDS the stale value is served without querying again.
+    for _ in range(5):
+        assert cache.get("sites", failing_loader) is value
+    wait_for_refreshes()
+    assert failing_loader.calls == 1
+
+
+def test_failed_cold_load_raises_until_retry():
+    cache = StaleWhileRevalidateCache()
+    loader = CountingLoader(make_value=lambda calls: 1 / 0)
+    for _ in range(3):
+        with pytest.raises(ZeroDivisionError):
+            cache.get("sites", loader)
+    assert loader.calls == 1
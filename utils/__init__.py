@@ -0,0 +1 @@
+"""Shared data helpers for the Cultural Canvas pages."""
@@ -0,0 +1,173 @@
+"""
+Filtered, paged Snowflake queries for the Art Forms Explorer.
+
+Instead of pulling whole DANCE_FINAL / CRAFT_IMAGE tables and filtering in pandas,
+the state, type and search filters become bound-parameter WHERE clauses and rows
+are fetched one keyset page at a time. Like the local search box, a search word
+matches the start of a word in the name or description, and rows whose name matches
+every word come first; within that, rows are ordered by (name, state).
+"""
+from collections import namedtuple
+
+import pandas as pd
+
+from utils.art_forms import transform_region_art_forms, transform_crafts, combine_art_forms
+from utils.search import tokenize_query
+from utils.states import STATE_IDS, labels_in_state
+
+# One UNION ALL branch per source table, selecting the same generic columns.
+# `aliases` maps the generic columns back to the names the art form transforms expect.
+ART_FORM_SOURCES = {
+    'Dance': {
+        'table': '"CULTURE_HERITAGE"."PUBLIC"."DANCE_FINAL"',
+        'rank': 0,  # local loading keeps the dance when a dance and a craft share (name, state)
+        'columns': {'NAME': '"DANCE"', 'STATE': '"REGION_STATE"', 'DESCRIPTION': '"DESCRIPTION"',
+                    'DISTRICT': 'NULL', 'VILLAGE': 'NULL', 'IMAGE_URL': '"IMAGE_URL"'},
+        'aliases': {'NAME': 'DANCE_NAME_SF', 'STATE': 'DANCE_REGION_STATE', 'DESCRIPTION': 'DANCE_DESC',
+                    'IMAGE_URL': 'DANCE_IMAGE_URL_SF'},
+    },
+    'Craft': {
+        'table': '"CULTURE_HERITAGE"."PUBLIC"."CRAFT_IMAGE"',
+        'rank': 1,
+        'columns': {'NAME': '"CRAFT"', 'STATE': '"STATE"', 'DESCRIPTION': '"DESCRIPTION"',
+                    'DISTRICT': '"DISTRICT"', 'VILLAGE': '"SUB_DISTRICT"', 'IMAGE_URL': '"IMAGE_URL"'},
+        'aliases': {'NAME': 'CRAFT_NAME_SF', 'STATE': 'CRAFT_STATE_SF', 'DESCRIPTION': 'CRAFT_DESCRIPTION_SF',
+                    'DISTRICT': 'CRAFT_DISTRICT_SF', 'VILLAGE': 'CRAFT_VILLAGE_SF', 'IMAGE_URL': 'CRAFT_IMAGE_URL_SF'},
+    },
+}
+
+# Characters that start a new word for the search (the local index splits on any non-word character).
+WORD_BOUNDARIES = (" ", "-", "/", "(", ",", ".", "'", '"', "&", "\n")
+
+ArtFormFilters = namedtuple("ArtFormFilters", ["state", "art_type", "terms"])
+
+
+def normalize_art_form_filters(selected_state, selected_type, search_term, state_labels=()):
+    """Hashable filter tuple: 'All ...' choices become None and search words are lowercased and sorted.
+
+    "Madhubani  Painting" and "painting madhubani" normalize to the same tuple, so they
+    share a cached result. A canonical state name becomes the sorted tuple of the raw
+    `state_labels` (as stored in Snowflake) that belong to it, so "Odisha" also matches
+    "Orissa" and "Odisha, West Bengal" rows.
+    """
+    state = None
+    if selected_state not in (None, "", "All States"):
+        state_id = STATE_IDS.get(selected_state)
+        matching = labels_in_state(state_labels, state_id) if state_id is not None else []
+        state = tuple(sorted(set(matching) | {str(selected_state)}))
+    art_type = None if selected_type in (None, "", "All Types") else str(selected_type)
+    return ArtFormFilters(state, art_type, tuple(sorted(tokenize_query(search_term or ""))))
+
+
+def _union_of_sources(art_type=None):
+    branches = []
+    for source_type, source in ART_FORM_SOURCES.items():
+        if art_type is not None and art_type != source_type:
+            continue
+        columns = source['columns']
+        selected = ", ".join(f"{expr} AS {alias}" for alias, expr in columns.items())
+        branches.append(
+            f"SELECT '{source_type}' AS ART_TYPE, {source['rank']} AS SOURCE_RANK, {selected}, "
+            f"COALESCE({columns['NAME']}, '') AS SORT_NAME, COALESCE(CAST({columns['STATE']} AS VARCHAR), '') AS SORT_STATE "
+            f"FROM {source['table']}"
+        )
+    return "\nUNION ALL\n".join(branches)
+
+
+def _like_patterns(term):
+    """Word-prefix ILIKE patterns for a search word: at the start of the text or after a word boundary.
+
+    LIKE wildcards in the word are escaped with '!'.
+    """
+    escaped = term.replace('!', '!!').replace('%', '!%').replace('_', '!_')
+    return [f"{escaped}%"] + [f"%{boundary}{escaped}%" for boundary in WORD_BOUNDARIES]
+
+
+def _word_prefix_condition(column, placeholders):
+    return "(" + " OR ".join(f"{column} ILIKE {p} ESCAPE '!'" for p in placeholders) + ")"
+
+
+def build_art_forms_page_query(filters, page_size, after=None):
+    """SQL and bound parameters for one page of art forms matching `filters`.
+
+    `after` is the (name rank, name, state) sort key of the last row of the previous page,
+    where name rank is 0 when the name matches every search word. One extra row is
+    requested so the caller can tell whether another page exists.
+    Returns (None, None) when the type filter matches no source table.
+    """
+    union = _union_of_sources(filters.art_type)
+    if not union:
+        return None, None
+
+    conditions, params = [], {'limit': int(page_size) + 1}
+    if filters.state is not None:
+        placeholders = ", ".join(f"%(state_{i})s" for i in range(len(filters.state)))
+        conditions.append(f"STATE IN ({placeholders})")
+        params.update({f'state_{i}': label for i, label in enumerate(filters.state)})
+    # Every search word must start a word of the name or the description, like the local search box.
+    name_conditions = []
+    for i, term in enumerate(filters.terms):
+        patterns = _like_patterns(term)
+        placeholders = [f"%(term_{i}_{j})s" for j in range(len(patterns))]
+        params.update({f'term_{i}_{j}': pattern for j, pattern in enumerate(patterns)})
+        name_conditions.append(_word_prefix_condition("NAME", placeholders))
+        conditions.append(f"({name_conditions[-1]} OR {_word_prefix_condition('DESCRIPTION', placeholders)})")
+    name_rank = f"CASE WHEN {' AND '.join(name_conditions)} THEN 0 ELSE 1 END" if name_conditions else "0"
+    if after is not None:
+        conditions.append(f"({name_rank} > %(after_rank)s OR ({name_rank} = %(after_rank)s AND "
+                          "(SORT_NAME > %(after_name)s OR (SORT_NAME = %(after_name)s AND SORT_STATE > %(after_state)s))))")
+        params['after_rank'], params['after_name'], params['after_state'] = after
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    query = f"""
+    SELECT ART_TYPE, NAME, STATE, DESCRIPTION, DISTRICT, VILLAGE, IMAGE_URL, {name_rank} AS NAME_RANK,
+           SORT_NAME, SORT_STATE
+    FROM (
+    {union}
+    )
+    {where}
+    QUALIFY ROW_NUMBER() OVER (PARTITION BY SORT_NAME, SORT_STATE ORDER BY SOURCE_RANK) = 1
+    ORDER BY NAME_RANK, SORT_NAME, SORT_STATE
+    LIMIT %(limit)s;
+    """
+    return query, params
+
+
+def build_art_form_states_query():
+    """SQL for the distinct states across all art form tables (for the state filter)."""
+    return f"""
+    SELECT DISTINCT STATE
+    FROM (
+    {_union_of_sources()}
+    )
+    WHERE STATE IS NOT NULL
+    ORDER BY STATE;
+    """
+
+
+def transform_art_forms_page(raw_df, page_size, state_coords, image_overrides=None):
+    """Turn a raw page query result into art form rows plus the keyset cursor of the next page.
+
+    The cursor is None when this is the last page.
+    """
+    raw_df = raw_df.rename(columns=str.upper)
+    if raw_df.empty:
+        return combine_art_forms([]), None
+    has_more = len(raw_df) > page_size
+    raw_df = raw_df.iloc[:page_size]
+    next_after = None
+    if has_more:
+        last = raw_df.iloc[-1]
+        next_after = (int(last['NAME_RANK']), last['SORT_NAME'], last['SORT_STATE'])
+
+    frames = []
+    dance_rows = raw_df[raw_df['ART_TYPE'] == 'Dance'].rename(columns=ART_FORM_SOURCES['Dance']['aliases'])
+    if not dance_rows.empty:
+        frames.append(transform_region_art_forms(
+            dance_rows, 'Dance', 'DANCE_NAME_SF', 'DANCE_REGION_STATE', 'DANCE_DESC', 'DANCE_IMAGE_URL_SF',
+            state_coords, image_overrides, default_description='Traditional dance form from {}.'))
+    craft_rows = raw_df[raw_df['ART_TYPE'] == 'Craft'].rename(columns=ART_FORM_SOURCES['Craft']['aliases'])
+    if not craft_rows.empty:
+        frames.append(transform_crafts(craft_rows, state_coords, image_overrides))
+    # Sources are transformed separately; the raw index restores the query's order.
+    return combine_art_forms([pd.concat(frames).sort_index()]), next_after
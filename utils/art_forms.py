@@ -0,0 +1,124 @@
+"""
+Column-wise transforms that turn raw Snowflake art form tables into the unified
+Art Forms Explorer frame.
+
+State labels are resolved through the shared state dimension (utils/states.py), so rows
+carry the canonical state name, its integer state_id/state_mask and region.
+"""
+import pandas as pd
+
+from utils.states import resolve_states
+
+ART_FORM_COLUMNS = [
+    'name', 'type', 'state', 'gi_tag', 'description', 'image_url', 'latitude', 'longitude',
+    'govt_scheme', 'allocation_amount', 'artisan_cooperative', 'district', 'village_equivalent',
+    'state_id', 'state_mask', 'region'
+]
+
+PLACEHOLDER_IMAGE_URL = 'https://via.placeholder.com/300x200.png?text='
+
+
+def _column(raw_df, col, default=None):
+    """Return `raw_df[col]`, or a constant series of `default` if the column is missing."""
+    if col in raw_df.columns:
+        return raw_df[col]
+    return pd.Series(default, index=raw_df.index, dtype=object)
+
+
+def _is_present(series):
+    """Mask of values that are non-null, non-blank and not the 'N/A' marker."""
+    as_str = series.astype(str).str.strip()
+    return series.notna() & (as_str != '') & (as_str != 'N/A')
+
+
+def resolve_image_urls(sf_image_urls, names, default_text, image_overrides=None):
+    """Vectorized image URL fallback: Snowflake URL, then override by name, then placeholder."""
+    stripped = sf_image_urls.where(sf_image_urls.notna()).astype(object)
+    has_url = stripped.notna()
+    stripped[has_url] = stripped[has_url].astype(str).str.strip()
+    has_url &= stripped.ne('')
+
+    urls = stripped.where(has_url)
+    if image_overrides:
+        urls = urls.fillna(names.map(image_overrides))
+
+    placeholder_text = names.astype(str).str.replace(' ', '+', regex=False).str.replace('/', '_', regex=False)
+    placeholder_text = placeholder_text.where(names.notna(), default_text)
+    return urls.fillna(PLACEHOLDER_IMAGE_URL + placeholder_text)
+
+
+def map_state_coordinates(resolved_states, state_coords=None):
+    """(latitude, longitude) series for resolved states: `state_coords` by canonical label, else the centroid."""
+    latitudes, longitudes = resolved_states['latitude'], resolved_states['longitude']
+    if state_coords:
+        labels = resolved_states['label']
+        latitudes = labels.map({state: coords[0] for state, coords in state_coords.items()}).astype(float).fillna(latitudes)
+        longitudes = labels.map({state: coords[1] for state, coords in state_coords.items()}).astype(float).fillna(longitudes)
+    return latitudes.astype(float), longitudes.astype(float)
+
+
+def _frame(raw_df, art_type, names, resolved_states, descriptions, image_urls, state_coords, districts='N/A', villages='N/A'):
+    latitudes, longitudes = map_state_coordinates(resolved_states, state_coords)
+    return pd.DataFrame({
+        'name': names, 'type': art_type, 'state': resolved_states['label'], 'gi_tag': False,
+        'description': descriptions, 'image_url': image_urls,
+        'latitude': latitudes, 'longitude': longitudes,
+        'govt_scheme': 'To be updated', 'allocation_amount': 'N/A', 'artisan_cooperative': 'To be updated',
+        'district': districts, 'village_equivalent': villages,
+        'state_id': resolved_states['state_id'], 'state_mask': resolved_states['mask'],
+        'region': resolved_states['region'],
+    }, index=raw_df.index, columns=ART_FORM_COLUMNS)
+
+
+def transform_region_art_forms(raw_df, art_type, name_col, state_col, desc_col, image_col,
+                               state_coords, image_overrides=None, default_description='Traditional art form from {}.'):
+    """Transform a name/region/description/image table (DANCE_FINAL, PAINTING) into art form rows."""
+    resolved_states = resolve_states(_column(raw_df, state_col))
+    names = _column(raw_df, name_col, f'Unknown {art_type}')
+    if desc_col in raw_df.columns:
+        descriptions = raw_df[desc_col]
+    else:
+        labels = resolved_states['label']
+        descriptions = labels.where(labels != 'N/A', 'India').map(default_description.format)
+    image_urls = resolve_image_urls(_column(raw_df, image_col), names, art_type, image_overrides)
+    return _frame(raw_df, art_type, names, resolved_states, descriptions, image_urls, state_coords)
+
+
+def transform_crafts(raw_df, state_coords, image_overrides=None):
+    """Transform CRAFT_IMAGE rows into art form rows, synthesizing missing descriptions from the location."""
+    names = _column(raw_df, 'CRAFT_NAME_SF', 'Unknown Craft')
+    descriptions = _column(raw_df, 'CRAFT_DESCRIPTION_SF', '')
+    resolved_states = resolve_states(_column(raw_df, 'CRAFT_STATE_SF', 'N/A'))
+    states = resolved_states['label']
+    districts = _column(raw_df, 'CRAFT_DISTRICT_SF', 'N/A')
+    villages = _column(raw_df, 'CRAFT_VILLAGE_SF', 'N/A')
+    image_urls = resolve_image_urls(_column(raw_df, 'CRAFT_IMAGE_URL_SF'), names, 'Craft', image_overrides)
+
+    needs_description = ~(descriptions.notna() & descriptions.astype(str).str.strip().ne(''))
+    if needs_description.any():
+        # Build ", village, district, state" from the parts that are present, then drop the leading ", ".
+        location = pd.Series('', index=raw_df.index[needs_description], dtype=object)
+        for part in (villages, districts, states):
+            part = part[needs_description]
+            location += (', ' + part.astype(str)).where(_is_present(part), '')
+        location = location.str[2:].where(location.ne(''), 'India')
+        synthesized = 'A traditional ' + names[needs_description].astype(str) + ' from ' + location + '.'
+        descriptions = descriptions.astype(object).copy()
+        descriptions[needs_description] = synthesized
+
+    return _frame(raw_df, 'Craft', names, resolved_states, descriptions, image_urls, state_coords,
+                  districts=districts, villages=villages)
+
+
+def combine_art_forms(frames):
+    """Concatenate transformed frames and drop duplicate (name, state) pairs, keeping the first.
+
+    Missing states become 'N/A', the marker the pages already treat as "no location".
+    """
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return pd.DataFrame(columns=ART_FORM_COLUMNS)
+    combined_df = pd.concat(frames, ignore_index=True)
+    combined_df['state'] = combined_df['state'].astype(object).fillna('N/A')
+    combined_df.drop_duplicates(subset=['name', 'state'], keep='first', inplace=True)
+    return combined_df
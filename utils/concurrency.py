@@ -0,0 +1,47 @@
+"""
+Run independent Snowflake loaders concurrently from a Streamlit script.
+
+The worker pool is created once per process and shared by every session, so a rerun
+with a warm cache only pays for handing its loaders to already-running threads.
+"""
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from streamlit.runtime.scriptrunner_utils.script_run_context import SCRIPT_RUN_CONTEXT_ATTR_NAME  # streamlit>=1.38
+
+LOADER_POOL_WORKERS = 32  # shared by all sessions; threads are started on demand
+
+_pool = ThreadPoolExecutor(max_workers=LOADER_POOL_WORKERS, thread_name_prefix="snowflake-loader")
+_worker = threading.local()
+
+
+def run_loaders_concurrently(loaders):
+    """Call each zero-argument loader in `loaders` (a name -> callable dict) on the shared worker pool.
+
+    Returns a dict of results in the same order. Worker threads are attached to the
+    calling script's run context for the duration of the call, so loaders can still use
+    st.error and st.connection. Total latency approaches that of the slowest loader
+    rather than the sum of all. Called from inside a loader, it runs the loaders in
+    turn instead of waiting on the pool it is running in.
+    """
+    if len(loaders) <= 1 or getattr(_worker, "active", False):
+        return {name: loader() for name, loader in loaders.items()}
+    ctx = get_script_run_ctx(suppress_warning=True)
+
+    def run(loader):
+        thread = threading.current_thread()
+        _worker.active = True
+        if ctx is not None:
+            add_script_run_ctx(thread, ctx)
+        try:
+            return loader()
+        finally:
+            _worker.active = False
+            setattr(thread, SCRIPT_RUN_CONTEXT_ATTR_NAME, None)  # pooled threads must not keep a finished run's context
+
+    # Each call gets an empty contextvars context, like a new thread, so Streamlit's
+    # per-thread state from one run never leaks into the next on a reused worker.
+    futures = {name: _pool.submit(contextvars.Context().run, run, loader) for name, loader in loaders.items()}
+    return {name: future.result() for name, future in futures.items()}
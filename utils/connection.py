@@ -0,0 +1,108 @@
+"""
+The connection the CULTURE_HERITAGE loaders query, chosen by CULTURAL_CANVAS_DATA_MODE:
+
+  live      (default) query Snowflake directly
+  snapshot  serve from the local snapshot; a background thread re-exports tables that
+            changed in Snowflake (exporting everything first if no snapshot exists)
+  offline   serve from the local snapshot only, never contacting Snowflake
+  fixtures  serve from the CSV fixtures in fixtures/culture_heritage (dev, CI, benchmarks)
+
+Each mode is a backend factory in BACKENDS; every backend's connection supports
+`query(sql, ttl=..., params=...)` and returns a pandas DataFrame.
+"""
+import os
+import threading
+import time
+
+import streamlit as st
+
+from utils.local_engine import DEFAULT_FIXTURE_DIR, FixtureConnection
+from utils.snapshot import (DEFAULT_SNAPSHOT_DIR, SnapshotConnection, read_manifest, export_snapshot, refresh_snapshot,
+                            probe_source_tables)
+from utils.swr_cache import culture_heritage_cache
+
+DATA_MODE = os.environ.get("CULTURAL_CANVAS_DATA_MODE", "live").strip().lower()
+SNAPSHOT_REFRESH_SECONDS = 3600
+
+
+@st.cache_resource(show_spinner="Opening local data snapshot...")
+def open_snapshot_connection(snapshot_dir, export_if_missing):
+    """Memory-map the snapshot once per process, exporting it from Snowflake first if allowed."""
+    if export_if_missing and read_manifest(snapshot_dir) is None:
+        export_snapshot(st.connection("snowflake"), snapshot_dir)
+    return SnapshotConnection(snapshot_dir)
+
+
+@st.cache_resource(show_spinner=False)
+def start_snapshot_refresher(snapshot_dir):
+    """Start (once per process) the thread that keeps the snapshot in step with Snowflake."""
+    snapshot_conn = open_snapshot_connection(snapshot_dir, True)
+
+    def refresh_forever():
+        while True:
+            try:
+                _, changed = refresh_snapshot(st.connection("snowflake"), snapshot_dir)
+                if changed:
+                    snapshot_conn.reload()
+                    culture_heritage_cache.clear()  # loaders re-read the new snapshot on their next call
+            except Exception as e:
+                print(f"Warning: snapshot refresh failed, serving snapshot {snapshot_conn.version}: {e}")
+            time.sleep(SNAPSHOT_REFRESH_SECONDS)
+
+    threading.Thread(target=refresh_forever, name="snapshot-refresh", daemon=True).start()
+    return True
+
+
+@st.cache_resource(show_spinner=False)
+def open_fixture_connection(fixture_dir):
+    """Load the CSV fixtures into the embedded engine once per process."""
+    return FixtureConnection(fixture_dir)
+
+
+# --- Backends ---
+def _live_connection():
+    return st.connection("snowflake")
+
+
+def _snapshot_connection():
+    start_snapshot_refresher(DEFAULT_SNAPSHOT_DIR)
+    return open_snapshot_connection(DEFAULT_SNAPSHOT_DIR, True)
+
+
+def _offline_connection():
+    return open_snapshot_connection(DEFAULT_SNAPSHOT_DIR, False)
+
+
+def _fixtures_connection():
+    return open_fixture_connection(DEFAULT_FIXTURE_DIR)
+
+
+BACKENDS = {
+    "live": _live_connection,
+    "snapshot": _snapshot_connection,
+    "offline": _offline_connection,
+    "fixtures": _fixtures_connection,
+}
+
+
+def register_backend(name, factory):
+    """Make `factory` (a zero-argument callable returning a connection) selectable as data mode `name`."""
+    BACKENDS[name.strip().lower()] = factory
+
+
+def get_culture_heritage_connection(mode=None):
+    """Connection for the CULTURE_HERITAGE loaders in `mode` (default: the configured data mode)."""
+    mode = mode or DATA_MODE
+    if mode not in BACKENDS:
+        raise ValueError(f"CULTURAL_CANVAS_DATA_MODE must be one of {', '.join(BACKENDS)}, not {mode!r}")
+    return BACKENDS[mode]()
+
+
+def table_fingerprint(conn, table):
+    """Cheap change-detection fingerprint of a CULTURE_HERITAGE.PUBLIC table: (row count, last altered).
+
+    Read from table metadata, so it costs no table scan. None if the table is not found,
+    which makes the caller reload in full.
+    """
+    probe = probe_source_tables(conn, [table]).get(table)
+    return None if probe is None else (probe["source_row_count"], probe["last_altered"])
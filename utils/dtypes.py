@@ -0,0 +1,90 @@
+"""
+Schema-driven dtype compaction for the frames the loaders cache.
+
+Snowflake results arrive with every text column as Python strings and NUMBER columns
+as Decimal objects. `compact_dtypes(df, table)` converts the columns listed in
+TABLE_SCHEMAS:
+
+  category  low-cardinality labels (state, type, district...): one small integer code
+            per row, so equality filters compare integers instead of strings
+  float64   coordinates and rates; missing values are NaN rather than pd.NA, because
+            folium and the pages' `pd.notna(...) and value` checks expect plain floats
+  Int64     counts, as nullable integers
+
+and records the memory saved per table for memory_report().
+"""
+import threading
+
+import pandas as pd
+
+CATEGORY = "category"
+FLOAT = "float64"
+INT = "Int64"
+SMALL_INT = "Int16"
+
+TABLE_SCHEMAS = {
+    "crafts": {
+        "CRAFT_STATE_SF": CATEGORY, "CRAFT_DISTRICT_SF": CATEGORY, "CRAFT_VILLAGE_SF": CATEGORY,
+    },
+    "dances": {"DANCE_REGION_STATE": CATEGORY},
+    "unesco_sites": {
+        "City": CATEGORY, "District": CATEGORY, "State/UT": CATEGORY, "Latitude": FLOAT, "Longitude": FLOAT,
+        "region": CATEGORY,
+    },
+    "festivals": {"STATE": CATEGORY, "TIME_OF_YEAR": CATEGORY, "region": CATEGORY},
+    "tourism_trends": {
+        "YEAR_NUM": SMALL_INT, "DOMESTIC_TOURIST_VISITS": INT, "FOREIGN_TOURIST_VISITS": INT,
+        "ANNUAL_GROWTH_RATE_DOMESTIC": FLOAT, "ANNUAL_GROWTH_RATE_FOREIGN": FLOAT,
+    },
+    "art_forms": {
+        "type": CATEGORY, "state": CATEGORY, "district": CATEGORY, "village_equivalent": CATEGORY,
+        "govt_scheme": CATEGORY, "allocation_amount": CATEGORY, "artisan_cooperative": CATEGORY,
+        "latitude": FLOAT, "longitude": FLOAT, "region": CATEGORY,
+    },
+}
+
+_report = {}
+_report_lock = threading.Lock()
+
+
+def _convert(series, dtype):
+    if dtype == CATEGORY:
+        return series if isinstance(series.dtype, pd.CategoricalDtype) else series.astype(CATEGORY)
+    numeric = pd.to_numeric(series, errors="coerce")
+    if dtype == FLOAT:
+        return numeric.astype(FLOAT)
+    return numeric.astype(dtype)
+
+
+def compact_dtypes(df, table):
+    """Return `df` with the columns in TABLE_SCHEMAS[table] converted to compact dtypes.
+
+    Columns that are missing or fail to convert are left as they are.
+    """
+    schema = TABLE_SCHEMAS.get(table, {})
+    if df.empty or not schema:
+        return df
+    bytes_before = int(df.memory_usage(deep=True).sum())
+    df = df.copy()
+    for col, dtype in schema.items():
+        if col not in df.columns:
+            continue
+        try:
+            df[col] = _convert(df[col], dtype)
+        except (TypeError, ValueError) as e:
+            print(f"Warning: could not convert {table}.{col} to {dtype}: {e}")
+    bytes_after = int(df.memory_usage(deep=True).sum())
+    with _report_lock:
+        _report[table] = {"rows": len(df), "bytes_before": bytes_before, "bytes_after": bytes_after}
+    return df
+
+
+def memory_report():
+    """Memory of each compacted table before and after compaction, as a DataFrame."""
+    with _report_lock:
+        report = dict(_report)
+    if not report:
+        return pd.DataFrame()
+    df = pd.DataFrame.from_dict(report, orient="index")
+    df["saved_pct"] = (100 * (1 - df["bytes_after"] / df["bytes_before"])).round(1)
+    return df.sort_index()
@@ -0,0 +1,102 @@
+"""
+Visiting order for a set of heritage sites (a small travelling-salesman tour).
+
+plan_itinerary() builds the pairwise great-circle distance matrix of the stops
+(utils/spatial.haversine_matrix_km). Up to EXACT_MAX_STOPS stops it compares every
+order. Longer itineraries start from a nearest-neighbour tour and improve it with
+2-opt until no segment reversal shortens it or the time budget runs out. Each 2-opt
+pass scores every (i, j) reversal at once with array arithmetic, so a 200-stop
+itinerary takes well under a second.
+
+Tours start at the first stop. An open tour ends wherever is shortest; a round trip
+returns to the start. For an open tour the end is a virtual node at distance 0 from
+every stop, so both cases share one 2-opt loop.
+"""
+import itertools
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from utils.spatial import haversine_matrix_km
+
+MAX_STOPS = 200
+EXACT_MAX_STOPS = 8  # 7! = 5,040 orders of the other stops, a few milliseconds
+TIME_BUDGET_SECONDS = 0.5
+
+Itinerary = namedtuple("Itinerary", ["order", "legs_km", "total_km", "method", "improvements", "elapsed_ms"])
+
+
+def exact_tour(distances, round_trip=False):
+    """Shortest visiting order starting at stop 0, found by comparing every order of the other stops."""
+    n = len(distances)
+    if n < 3:
+        return list(range(n))
+    rest = np.array(list(itertools.permutations(range(1, n))), dtype=np.intp)
+    start = np.zeros((len(rest), 1), dtype=np.intp)
+    paths = np.hstack([start, rest, start] if round_trip else [start, rest])
+    lengths = distances[paths[:, :-1], paths[:, 1:]].sum(axis=1)
+    return paths[int(np.argmin(lengths)), :n].tolist()
+
+
+def nearest_neighbour_tour(distances, start=0):
+    """Visit order that always moves to the closest unvisited stop."""
+    n = len(distances)
+    order = [start]
+    unvisited = np.ones(n, dtype=bool)
+    unvisited[start] = False
+    for _ in range(n - 1):
+        candidates = np.where(unvisited, distances[order[-1]], np.inf)
+        order.append(int(np.argmin(candidates)))
+        unvisited[order[-1]] = False
+    return order
+
+
+def two_opt(order, distances, round_trip=False, deadline=None):
+    """Improve `order` (first stop fixed) by best-improvement 2-opt moves. Returns (order, moves applied)."""
+    n = len(order)
+    if n < 3:
+        return list(order), 0
+    # Pad the matrix with the tour's closing node: the start for a round trip, else a free virtual end.
+    closing = order[0] if round_trip else n
+    padded = np.zeros((n + 1, n + 1))
+    padded[:n, :n] = distances
+    path = np.array(list(order) + [closing])
+    i, j = np.triu_indices(n, k=1)
+    keep = i >= 1  # reversing path[i..j] with 1 <= i < j <= n - 1 keeps the start in place
+    i, j = i[keep], j[keep]
+    moves = 0
+    while deadline is None or time.perf_counter() < deadline:
+        a, b, c, d = path[i - 1], path[i], path[j], path[j + 1]
+        delta = padded[a, c] + padded[b, d] - padded[a, b] - padded[c, d]
+        best = int(np.argmin(delta))
+        if delta[best] >= -1e-9:
+            break
+        path[i[best]:j[best] + 1] = path[i[best]:j[best] + 1][::-1].copy()
+        moves += 1
+    return path[:n].tolist(), moves
+
+
+def plan_itinerary(latitudes, longitudes, round_trip=False, time_budget=TIME_BUDGET_SECONDS):
+    """Shortest visiting order found for the stops within `time_budget` seconds, starting at stop 0.
+
+    Returns an Itinerary: `order` indexes the inputs, `legs_km` holds the distance of each leg
+    (including the way back for a round trip) and `total_km` their sum. `method` is "exact"
+    up to EXACT_MAX_STOPS stops (the order is optimal) and "2-opt" beyond.
+    """
+    started = time.perf_counter()
+    latitudes, longitudes = np.asarray(latitudes, dtype=float), np.asarray(longitudes, dtype=float)
+    if len(latitudes) > MAX_STOPS:
+        raise ValueError(f"An itinerary can have at most {MAX_STOPS} stops, not {len(latitudes)}")
+    if len(latitudes) == 0:
+        return Itinerary([], [], 0.0, "exact", 0, 0.0)
+    distances = haversine_matrix_km(latitudes, longitudes)
+    if len(latitudes) <= EXACT_MAX_STOPS:
+        method, order, improvements = "exact", exact_tour(distances, round_trip), 0
+    else:
+        order = nearest_neighbour_tour(distances)
+        order, improvements = two_opt(order, distances, round_trip, deadline=started + time_budget)
+        method = "2-opt"
+    stops = order + order[:1] if round_trip and len(order) > 1 else order
+    legs = distances[stops[:-1], stops[1:]].tolist()
+    return Itinerary(order, legs, float(sum(legs)), method, improvements, (time.perf_counter() - started) * 1000)
@@ -0,0 +1,116 @@
+"""
+Embedded SQL engine that stands in for the CULTURE_HERITAGE Snowflake database.
+
+LocalEngineConnection serves in-memory Arrow tables through DuckDB and answers the
+pages' existing SQL unchanged: tables are exposed as CULTURE_HERITAGE.PUBLIC.<table>
+(and unqualified), and pyformat parameters (%(name)s) are rebound as DuckDB named
+parameters. Subclasses decide where the tables come from:
+
+  FixtureConnection   CSV fixtures checked into the repo (dev, CI, benchmarks)
+  SnapshotConnection  the exported snapshot, see utils/snapshot.py
+"""
+import abc
+import hashlib
+import os
+import re
+import threading
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+
+ENGINE_DATABASE = "CULTURE_HERITAGE"
+ENGINE_SCHEMA = "PUBLIC"
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_FIXTURE_DIR = os.environ.get(
+    "CULTURAL_CANVAS_FIXTURE_DIR", os.path.join(REPO_ROOT, "fixtures", "culture_heritage"))
+
+
+class LocalEngineConnection(abc.ABC):
+    """Read-only stand-in for st.connection("snowflake") backed by an embedded DuckDB."""
+
+    backend = "local"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reload()
+
+    @abc.abstractmethod
+    def load_tables(self):
+        """Return ({table name: pyarrow.Table}, version string). Implemented by subclasses."""
+
+    def reload(self):
+        """Re-read the source tables (e.g. after a refresh) and rebuild the catalog."""
+        import duckdb  # optional dependency, only needed outside live mode
+
+        tables, version = self.load_tables()
+        db = duckdb.connect()
+        db.execute(f"ATTACH ':memory:' AS {ENGINE_DATABASE}; CREATE SCHEMA {ENGINE_DATABASE}.{ENGINE_SCHEMA};")
+        for name, table in tables.items():
+            db.register(f"source_{name}", table)
+            db.execute(f'CREATE VIEW {ENGINE_DATABASE}.{ENGINE_SCHEMA}."{name}" AS SELECT * FROM source_{name}')
+        with self._lock:
+            self._tables, self._db, self._version = tables, db, version
+
+    @property
+    def version(self):
+        return self._version
+
+    def probe_tables(self, tables):
+        """Answer utils.snapshot.probe_source_tables locally.
+
+        The local tables only change on reload(), so the engine version stands in for LAST_ALTERED.
+        """
+        with self._lock:
+            local_tables, version = self._tables, self._version
+        return {name: {"last_altered": version, "source_row_count": local_tables[name].num_rows}
+                for name in tables if name in local_tables}
+
+    def query(self, sql, ttl=None, params=None, **kwargs):
+        """Run `sql` against the local tables; `ttl` and other st.connection options are ignored."""
+        with self._lock:
+            db, tables = self._db, self._tables
+        cursor = db.cursor()  # one DuckDB connection per query, so sessions can query concurrently
+        try:
+            for name, table in tables.items():
+                cursor.register(f"source_{name}", table)  # registrations are per connection
+            cursor.execute(f"USE {ENGINE_DATABASE}.{ENGINE_SCHEMA}")
+            if params:
+                sql = re.sub(r"%\((\w+)\)s", r"$\1", sql).replace("%%", "%")
+            return cursor.execute(sql, params or {}).df()
+        finally:
+            cursor.close()
+
+
+def read_fixture_table(path):
+    """Read one fixture CSV. Only empty fields are NULL, so values like 'N/A' survive as text."""
+    table = pa_csv.read_csv(path, convert_options=pa_csv.ConvertOptions(
+        null_values=[""], strings_can_be_null=True, quoted_strings_can_be_null=False))
+    # A column with no values at all is inferred as the null type; Snowflake would call it VARCHAR.
+    for i, field in enumerate(table.schema):
+        if pa.types.is_null(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(pa.string()))
+    return table
+
+
+class FixtureConnection(LocalEngineConnection):
+    """Engine seeded from <TABLE>.csv fixture files with the same schemas as the Snowflake tables."""
+
+    backend = "fixtures"
+
+    def __init__(self, fixture_dir=DEFAULT_FIXTURE_DIR):
+        self.fixture_dir = fixture_dir
+        super().__init__()
+
+    def load_tables(self):
+        file_names = sorted(f for f in os.listdir(self.fixture_dir) if f.endswith(".csv"))
+        if not file_names:
+            raise FileNotFoundError(f"No CULTURE_HERITAGE fixture files in {self.fixture_dir}")
+        digest = hashlib.sha256()
+        tables = {}
+        for file_name in file_names:
+            path = os.path.join(self.fixture_dir, file_name)
+            with open(path, "rb") as f:
+                digest.update(f.read())
+            tables[file_name[:-len(".csv")]] = read_fixture_table(path)
+        return tables, digest.hexdigest()[:12]
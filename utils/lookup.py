@@ -0,0 +1,32 @@
+"""
+Primary-key index for the detail panels.
+
+A detail view looks up one row by its key (an art form or site name) on every rerun
+while it is open. PrimaryKeyIndex maps each key to the position of its first row once
+per dataset version, so the lookup is a dict access instead of a column scan.
+"""
+import numpy as np
+import pandas as pd
+
+
+class PrimaryKeyIndex:
+    """key -> first row position of `df[key_column]`; the frame must not change after indexing."""
+
+    def __init__(self, df, key_column, version=None):
+        self.df = df
+        self.key_column = key_column
+        self.version = version
+        keys = pd.Series(df[key_column].to_numpy(dtype=object)) if key_column in df.columns else pd.Series(dtype=object)
+        first = keys[keys.notna() & ~keys.duplicated(keep='first')]  # duplicate keys resolve to their first row
+        self.positions = dict(zip(first.to_numpy(), first.index.to_numpy(dtype=np.int64)))
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __contains__(self, key):
+        return key in self.positions
+
+    def row(self, key):
+        """The first row with `key` as a Series, or None if there is none."""
+        position = self.positions.get(key)
+        return None if position is None else self.df.iloc[position]
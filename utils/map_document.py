@@ -0,0 +1,151 @@
+"""
+Render a folium map for st_folium once and reuse the result across reruns.
+
+st_folium renders the whole map (every marker, popup and layer) into a Leaflet script
+on every call, so each rerun of a page pays the full map construction cost even when
+the map did not change. MapDocument runs the same rendering steps once; a page caches
+it per (data version, layer options) and show_map_document() hands the stored script
+to the st_folium component. The component still returns clicks, bounds and zoom.
+A page can pass small folium.FeatureGroups along with the document; the component
+swaps them in on the existing map instead of remounting it (viewport and itinerary
+layers).
+
+The rendering steps are streamlit-folium internals, tested against the range pinned in
+requirements.txt. If they are missing or their signatures changed (ImportError,
+TypeError, AttributeError), show_map_document() falls back to plain st_folium,
+re-rendering on every rerun.
+"""
+import copy
+import threading
+
+import folium
+import streamlit as st
+from streamlit_folium import st_folium
+
+try:
+    from streamlit_folium import (_component_func, _get_feature_group_string, _get_header, _get_html,
+                                  _get_map_string, generate_js_hash, get_full_id)
+except ImportError:
+    _component_func = None
+
+INTERNALS_CHANGED = (TypeError, AttributeError)  # raised by streamlit-folium internals whose signatures changed
+
+# Set once the component call itself fails; documents are shared by every session, so the
+# fallback is recorded here instead of on them.
+_component_call_failed = False
+_component_call_failed_lock = threading.Lock()
+
+
+class MapDocument:
+    """The rendered Leaflet script, header, HTML and asset links of one folium map. Read-only once built."""
+
+    def __init__(self, fig):
+        self.fig = fig
+        self.rendered = False
+        if _component_func is None:
+            return
+        try:
+            self._render(fig)
+        except INTERNALS_CHANGED as e:
+            print(f"Warning: streamlit-folium internals changed, falling back to st_folium: {e}")
+            return
+        self.rendered = True
+
+    def _render(self, fig):
+        fig.get_root().render()
+        fig.render()
+        self.html = _get_html(fig)  # before _get_map_string, which alters the folium structure
+        self.header = _get_header(fig)
+        self.script = _get_map_string(fig)
+        self.map_id = get_full_id(fig)
+        self.css_links, self.js_links = _asset_links(fig)
+        try:
+            southwest, northeast = fig.get_bounds()
+        except AttributeError:
+            southwest, northeast = [None, None], [None, None]
+        self.bounds = {"_southWest": {"lat": southwest[0], "lng": southwest[1]},
+                       "_northEast": {"lat": northeast[0], "lng": northeast[1]}}
+        self.zoom = fig.options.get("zoom")
+        self._hashes = {}
+
+    def component_key(self, key):
+        """st_folium's key for this script under `key`, hashed once per key."""
+        if key not in self._hashes:
+            self._hashes[key] = generate_js_hash(self.script, key, False)
+        return self._hashes[key]
+
+
+def _asset_links(fig):
+    css_links, js_links = [], []
+
+    def walk(element):
+        if isinstance(element, folium.elements.JSCSSMixin):
+            yield element
+        for child in getattr(element, "_children", {}).values():
+            yield from walk(child)
+
+    for element in walk(fig):
+        css_links.extend(href for _, href in getattr(element, "default_css", []))
+        js_links.extend(src for _, src in getattr(element, "default_js", []))
+    return list(dict.fromkeys(css_links)), list(dict.fromkeys(js_links))
+
+
+def _feature_group_script(feature_groups):
+    # Rendered against a throwaway map so the cached document's map never gains the layers as children.
+    return "".join(_get_feature_group_string(feature_group, map=folium.Map(), idx=idx)
+                   for idx, feature_group in enumerate(feature_groups))
+
+
+def show_map_document(document, key, width=None, height=700, returned_objects=None, feature_group=None):
+    """Display a MapDocument like st_folium(document.fig, ..., feature_group_to_add=feature_group).
+
+    `feature_group` is a folium.FeatureGroup, a list of them, or None.
+    """
+    if isinstance(feature_group, folium.FeatureGroup):
+        feature_group = [feature_group]
+    feature_group = feature_group or None
+    if not document.rendered or _component_call_failed:
+        return _show_with_st_folium(document, key, width, height, returned_objects, feature_group)
+    defaults = {
+        "last_clicked": None, "last_object_clicked": None, "last_object_clicked_count": None,
+        "last_object_clicked_tooltip": None, "last_object_clicked_popup": None, "all_drawings": None,
+        "last_active_drawing": None, "bounds": document.bounds, "zoom": document.zoom,
+        "last_circle_radius": None, "last_circle_polygon": None, "selected_layers": None,
+        "selected_tags": None, "last_geocoder_result": None,
+    }
+    if returned_objects is not None:
+        defaults = {name: value for name, value in defaults.items() if name in returned_objects}
+    component_key = document.component_key(key)
+
+    def on_change():
+        st.session_state[key] = st.session_state.get(component_key, {})
+
+    try:
+        feature_group_script = None if feature_group is None else _feature_group_script(feature_group)
+        return _component_func(
+            script=document.script, header=document.header, html=document.html, id=document.map_id,
+            key=component_key, height=height, width=width, returned_objects=returned_objects, default=defaults,
+            zoom=None, center=None, feature_group=feature_group_script, return_on_hover=False,
+            layer_control=None, pixelated=False, css_links=document.css_links, js_links=document.js_links,
+            on_change=on_change, wrap_longitude=False,
+        )
+    except INTERNALS_CHANGED as e:
+        _note_component_call_failed(e)
+        return _show_with_st_folium(document, key, width, height, returned_objects, feature_group)
+
+
+def _note_component_call_failed(error):
+    global _component_call_failed
+    with _component_call_failed_lock:
+        if _component_call_failed:
+            return
+        _component_call_failed = True
+    print(f"Warning: streamlit-folium component call failed, falling back to st_folium: {error}")
+
+
+def _show_with_st_folium(document, key, width, height, returned_objects, feature_group):
+    # st_folium renders (and adds the feature groups to) the map it is given; the document's
+    # map is shared by every session, so it gets a copy unless the document never rendered it.
+    fig = document.fig if feature_group is None and _component_func is None else copy.deepcopy(document.fig)
+    return st_folium(fig, key=key, width=width, height=height, returned_objects=returned_objects,
+                     feature_group_to_add=feature_group)
@@ -0,0 +1,113 @@
+"""
+"Near this site" queries over UNESCO sites, crafts and festivals.
+
+NearbyPlaces keeps one GridIndex (utils/spatial.py) per kind of place, built once per
+version of the source tables, and answers radius and k-nearest queries in great-circle
+kilometres. UNESCO sites are indexed at their own coordinates. Crafts and festivals carry only a
+state, so they are placed at their state's centroid (utils/states.py) and flagged
+approximate; their distances are to the centre of their state.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.concurrency import run_loaders_concurrently
+from utils.connection import get_culture_heritage_connection, table_fingerprint
+from utils.spatial import GridIndex
+from utils.state_profiles import PROFILE_SOURCES, build_profile_source_query
+from utils.states import resolve_states
+from utils.swr_cache import culture_heritage_cache
+from utils.telemetry import instrument_loader
+
+NEARBY_RADIUS_KM = 50
+NEARBY_KINDS = ("unesco_sites", "crafts", "festivals")
+PLACE_COLUMNS = ["name", "state", "latitude", "longitude", "approximate"]
+
+
+def site_places(sites_df):
+    """Places frame of the UNESCO sites frame of the Cultural Hotspots page (exact coordinates)."""
+    if sites_df.empty:
+        return pd.DataFrame(columns=PLACE_COLUMNS)
+    return pd.DataFrame({
+        "name": sites_df["Name"].astype(object).to_numpy(),
+        "state": sites_df["State/UT"].astype(object).to_numpy() if "State/UT" in sites_df.columns else None,
+        "latitude": pd.to_numeric(sites_df["Latitude"], errors="coerce").to_numpy(dtype=float),
+        "longitude": pd.to_numeric(sites_df["Longitude"], errors="coerce").to_numpy(dtype=float),
+        "approximate": False,
+    })
+
+
+def state_places(df):
+    """Places frame of a (NAME, STATE) projection, each row at its state's centroid."""
+    if df.empty:
+        return pd.DataFrame(columns=PLACE_COLUMNS)
+    df = df.rename(columns=str.upper)
+    resolved = resolve_states(df["STATE"])
+    return pd.DataFrame({
+        "name": df["NAME"].astype(object).to_numpy(),
+        "state": resolved["label"].to_numpy(),
+        "latitude": resolved["latitude"].to_numpy(dtype=float),
+        "longitude": resolved["longitude"].to_numpy(dtype=float),
+        "approximate": True,
+    })
+
+
+class NearbyPlaces:
+    """Read-only per-kind spatial indexes over place frames; built once per version of the sources."""
+
+    def __init__(self, places, version=None):
+        self.version = version
+        self.places = {}
+        self.indexes = {}
+        for kind, frame in places.items():
+            frame = frame.dropna(subset=["name", "latitude", "longitude"]).reset_index(drop=True)
+            self.places[kind] = frame
+            self.indexes[kind] = GridIndex(frame["latitude"].to_numpy(), frame["longitude"].to_numpy())
+
+    def _result(self, kind, positions, distances):
+        result = self.places[kind].iloc[positions].reset_index(drop=True)
+        result["distance_km"] = np.round(distances, 1)
+        return result
+
+    def within(self, kind, latitude, longitude, radius_km=NEARBY_RADIUS_KM):
+        """Places of `kind` within radius_km, nearest first, with a distance_km column."""
+        if kind not in self.indexes:
+            return pd.DataFrame(columns=PLACE_COLUMNS + ["distance_km"])
+        return self._result(kind, *self.indexes[kind].within(latitude, longitude, radius_km))
+
+    def nearest(self, kind, latitude, longitude, k=5):
+        """The k places of `kind` nearest to the point, with a distance_km column."""
+        if kind not in self.indexes:
+            return pd.DataFrame(columns=PLACE_COLUMNS + ["distance_km"])
+        return self._result(kind, *self.indexes[kind].nearest(latitude, longitude, k))
+
+
+@st.cache_resource(max_entries=2, show_spinner="Indexing nearby places...")
+def _build_nearby_places(source_versions, _sites_df, _crafts_df, _festivals_df):
+    """Index once per set of source table versions; `source_versions` only keys the cache."""
+    places = {"unesco_sites": site_places(_sites_df), "crafts": state_places(_crafts_df),
+              "festivals": state_places(_festivals_df)}
+    return NearbyPlaces(places, version=source_versions)
+
+
+@instrument_loader("nearby_places")
+def load_nearby_places(sites_df):
+    """Nearby-place indexes over `sites_df` (as loaded through the cache) and the crafts and festivals tables.
+
+    Raises if the crafts or festivals projection fails to load.
+    """
+    conn = get_culture_heritage_connection()
+    queries = {kind: build_profile_source_query(PROFILE_SOURCES[kind]) for kind in ("crafts", "festivals")}
+
+    def source_loader(kind):
+        query = queries[kind]
+        return lambda: culture_heritage_cache.get(query, lambda: conn.query(query, ttl=0),
+                                                  fingerprint=lambda: table_fingerprint(conn, PROFILE_SOURCES[kind].table))
+
+    loaders = {kind: source_loader(kind) for kind in queries}
+    if all(culture_heritage_cache.is_loaded(query) for query in queries.values()):
+        results = {kind: loader() for kind, loader in loaders.items()}  # warm: no worker pool hop
+    else:
+        results = run_loaders_concurrently(loaders)
+    source_versions = tuple(culture_heritage_cache.version_of(df) for df in [sites_df, *results.values()])
+    return _build_nearby_places(source_versions, sites_df, results["crafts"], results["festivals"])
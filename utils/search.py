@@ -0,0 +1,227 @@
+"""
+Token-level inverted index for the Art Forms Explorer search box.
+
+Built once per dataset version; answers prefix, multi-term AND queries with
+relevance ranking without rescanning the name/description columns.
+"""
+import bisect
+import re
+
+import numpy as np
+import pandas as pd
+
+TOKEN_PATTERN = r"\w+"
+NAME_WEIGHT = 3           # a term found in the name outranks one found only in the description
+DESCRIPTION_WEIGHT = 1
+EXACT_TOKEN_BONUS = 1     # "kantha" ranks an exact token above a longer token it prefixes
+MAX_PROBE_TOKENS = 64     # prefix ranges wider than this are intersected through a dense score array
+
+
+def tokenize_query(query):
+    """Lowercase word tokens of a search query, in order, without duplicates."""
+    return list(dict.fromkeys(re.findall(TOKEN_PATTERN, str(query).lower())))
+
+
+def _token_pairs(series, weight):
+    tokens = series.fillna('').astype(str).str.lower().str.findall(TOKEN_PATTERN)
+    exploded = tokens.explode().dropna()
+    return pd.DataFrame({
+        'token': exploded.to_numpy(dtype=object),
+        'row': exploded.index.to_numpy(dtype=np.int64),
+        'weight': np.int16(weight),
+    })
+
+
+class ArtFormSearchIndex:
+    """Inverted index from lowercase tokens to row positions of an art forms frame.
+
+    Postings are stored contiguously in sorted-token order, so every token sharing a
+    prefix maps to a single slice of the postings array.
+    """
+
+    def __init__(self, df, version=None, text_columns=(('name', NAME_WEIGHT), ('description', DESCRIPTION_WEIGHT))):
+        self.version = version
+        self.num_rows = len(df)
+        positional = df.reset_index(drop=True)
+        frames = [_token_pairs(positional[col], weight) for col, weight in text_columns if col in positional.columns]
+        pairs = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=['token', 'row', 'weight'])
+
+        # Keep the best weight for each (token, row) pair.
+        pairs = pairs.sort_values('weight', ascending=False, kind='stable').drop_duplicates(['token', 'row'])
+        codes, vocab = pd.factorize(pairs['token'], sort=True)
+        order = np.lexsort((pairs['row'].to_numpy(), codes))
+
+        self.vocab = list(vocab)
+        self.postings = pairs['row'].to_numpy(dtype=np.intp)[order]  # intp: used directly as fancy indices
+        self.weights = pairs['weight'].to_numpy(dtype=np.int16)[order]
+        self.offsets = np.searchsorted(codes[order], np.arange(len(self.vocab) + 1))
+        self.weight_levels = sorted(set(weight for _, weight in text_columns))
+
+    def _token_range(self, term):
+        """[lo, hi) range of vocabulary ids whose token starts with `term`."""
+        lo = bisect.bisect_left(self.vocab, term)
+        return lo, bisect.bisect_left(self.vocab, term + '\U0010ffff', lo)
+
+    def _token_scores(self, token_id, term):
+        start, end = self.offsets[token_id], self.offsets[token_id + 1]
+        bonus = EXACT_TOKEN_BONUS if self.vocab[token_id] == term else 0
+        return self.postings[start:end], self.weights[start:end] + bonus
+
+    def _dense_scores(self, term, lo, hi):
+        """Per-row best score for `term` as a prefix (0 where it does not match)."""
+        dense = np.zeros(self.num_rows, dtype=np.int16)
+        if hi - lo == 1:
+            rows, scores = self._token_scores(lo, term)
+            dense[rows] = scores
+            return dense
+        if hi - lo <= MAX_PROBE_TOKENS:
+            for token_id in range(lo, hi):
+                rows, scores = self._token_scores(token_id, term)
+                dense[rows] = np.maximum(dense[rows], scores)
+            return dense
+        start, end = self.offsets[lo], self.offsets[hi]
+        rows, weights = self.postings[start:end], self.weights[start:end]
+        # Write the weight levels in ascending order so each row keeps its best one.
+        for level in self.weight_levels:
+            dense[rows[weights == level]] = level
+        if self.vocab[lo] == term:
+            rows, scores = self._token_scores(lo, term)
+            dense[rows] = np.maximum(dense[rows], scores)
+        return dense
+
+    def _term_matches(self, term, lo, hi):
+        """Sorted unique rows matching `term` as a prefix, with each row's best score."""
+        if hi - lo == 1:
+            # Postings of a single token are already sorted and unique.
+            return self._token_scores(lo, term)
+        dense = self._dense_scores(term, lo, hi)
+        rows = np.flatnonzero(dense)
+        return rows, dense[rows]
+
+    def _intersect(self, rows, scores, term, lo, hi):
+        """Keep the candidate rows that also match `term`, adding its score.
+
+        Few candidates are binary-searched in each token's sorted postings; many
+        candidates are looked up in a dense score array instead.
+        """
+        term_postings = self.offsets[hi] - self.offsets[lo]
+        if hi - lo <= MAX_PROBE_TOKENS and len(rows) * 16 < term_postings:
+            best = np.zeros(len(rows), dtype=np.int16)
+            for token_id in range(lo, hi):
+                token_rows, token_scores = self._token_scores(token_id, term)
+                if not len(token_rows):
+                    continue
+                positions = np.searchsorted(token_rows, rows).clip(max=len(token_rows) - 1)
+                found = token_rows[positions] == rows
+                best = np.where(found, np.maximum(best, token_scores[positions]), best)
+        else:
+            best = self._dense_scores(term, lo, hi)[rows]
+        keep = best > 0
+        return rows[keep], scores[keep] + best[keep]
+
+    def search(self, query, limit=None):
+        """Row positions matching every query term (as a token prefix), best match first.
+
+        Terms are processed rarest first, so later terms only probe the surviving candidates.
+        """
+        terms = tokenize_query(query)
+        empty = np.arange(0, dtype=np.intp)
+        if not terms or self.num_rows == 0:
+            return empty
+        ranges = [(term, *self._token_range(term)) for term in terms]
+        if any(lo == hi for _, lo, hi in ranges):
+            return empty
+        ranges.sort(key=lambda r: self.offsets[r[2]] - self.offsets[r[1]])
+
+        rows, scores = self._term_matches(*ranges[0])
+        for term, lo, hi in ranges[1:]:
+            if not len(rows):
+                return empty
+            rows, scores = self._intersect(rows, scores, term, lo, hi)
+
+        # Scores are small integers: bucket by score (highest first), keeping row order within a bucket.
+        levels = np.flatnonzero(np.bincount(scores))[::-1] if len(scores) else []
+        ranked = np.concatenate([rows[scores == level] for level in levels]) if len(levels) else empty
+        return ranked[:limit]
+
+
+# --- Typo-tolerant name search ---
+FUZZY_MIN_SIMILARITY = 0.5    # share of the query's trigrams a name must contain
+FUZZY_MAX_POSTINGS = 250_000  # posting budget per query; bounds latency regardless of catalogue size
+FUZZY_MAX_TRIGRAMS = 32
+
+
+def normalize_name(text):
+    """Lowercase and drop spaces/punctuation, so "Chikan kari" and "Chikankari" compare equal."""
+    return re.sub(r"[\W_]+", "", str(text).lower())
+
+
+def name_trigrams(normalized):
+    """Character trigrams of a normalized name, with '$' marking its start and end."""
+    padded = f"${normalized}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramNameIndex:
+    """Trigram index over distinct art form names for transliteration/typo tolerant lookup.
+
+    Used as a fallback when the token index finds nothing: "Madhubni" still finds
+    "Madhubani Painting" and "Chikan kari" finds "Chikankari".
+    """
+
+    def __init__(self, names, version=None):
+        self.version = version
+        names = pd.Series(names).reset_index(drop=True)
+        normalized = names.fillna('').astype(str).map(normalize_name)
+        codes, uniques = pd.factorize(normalized)
+        self.display_names = names.groupby(codes).first().tolist()
+
+        # Row positions grouped by distinct name id.
+        self.row_order = np.argsort(codes, kind='stable')
+        self.row_offsets = np.searchsorted(codes[self.row_order], np.arange(len(uniques) + 1))
+
+        postings = {}
+        self.trigram_counts = np.zeros(len(uniques), dtype=np.int32)
+        for name_id, name in enumerate(uniques):
+            grams = name_trigrams(name) if name else set()
+            self.trigram_counts[name_id] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(name_id)
+        self.postings = {gram: np.array(ids, dtype=np.intp) for gram, ids in postings.items()}
+
+    def match_names(self, query, limit=20, min_similarity=FUZZY_MIN_SIMILARITY):
+        """Distinct name ids similar to `query`, best first, as (ids, similarities).
+
+        Trigram posting lists are read rarest first until FUZZY_MAX_POSTINGS is spent;
+        the most common trigrams are the least discriminating, so they are the ones dropped.
+        """
+        normalized_query = normalize_name(query)
+        query_grams = sorted(name_trigrams(normalized_query))[:FUZZY_MAX_TRIGRAMS] if normalized_query else []
+        lists = sorted((self.postings[g] for g in query_grams if g in self.postings), key=len)
+        if not lists:
+            return np.arange(0, dtype=np.intp), np.zeros(0)
+        selected, spent = [], 0
+        for posting in lists:
+            if selected and spent + len(posting) > FUZZY_MAX_POSTINGS:
+                break
+            selected.append(posting)
+            spent += len(posting)
+        considered = len(query_grams) - (len(lists) - len(selected))
+
+        shared = np.bincount(np.concatenate(selected), minlength=len(self.trigram_counts))
+        candidates = np.flatnonzero(shared)
+        coverage = shared[candidates] / considered
+        keep = coverage >= min_similarity
+        candidates, coverage = candidates[keep], coverage[keep]
+        # Jaccard breaks ties in favour of names close to the query's length.
+        jaccard = shared[candidates] / (len(query_grams) + self.trigram_counts[candidates] - shared[candidates])
+        order = np.lexsort((-jaccard, -coverage))[:limit]
+        return candidates[order], coverage[order]
+
+    def search(self, query, limit=20):
+        """Row positions of the names most similar to `query`, plus those names, best first."""
+        name_ids, _ = self.match_names(query, limit=limit)
+        if not len(name_ids):
+            return np.arange(0, dtype=np.intp), []
+        positions = np.concatenate([self.row_order[self.row_offsets[i]:self.row_offsets[i + 1]] for i in name_ids])
+        return positions, [self.display_names[i] for i in name_ids]
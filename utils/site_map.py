@@ -0,0 +1,243 @@
+"""
+Folium map of the UNESCO (and other heritage) sites on the Cultural Hotspots page.
+
+Markers carry only their site key, the name, which is also their tooltip. There are
+no popups: st_folium reports a clicked marker's tooltip as last_object_clicked_tooltip
+and the page renders that site's details from its key index, so descriptions, badges
+and links never enter the map document.
+
+Three renderings:
+
+  markers    one folium.Marker with a DivIcon per site; every marker is a separate
+             block of generated JavaScript
+  clustered  all sites ship as one compact JSON array ([lat, lon, name] per row) and
+             a single callback builds the markers and clusters them in the browser,
+             so payload and render time grow with the data rather than with
+             per-marker code
+  viewport   a base map with a "Search this area" button plus a layer rebuilt for the
+             area it reports: markers only for the sites inside the viewport (widened
+             by VIEWPORT_MARGIN), looked up in a GridIndex, or one bubble per grid cell
+             when zoomed out or when the viewport holds too many sites
+
+Every rendering returns clicks only, so panning and zooming never rerun the page.
+The button reports the view through the click channel: it writes the bounds and zoom
+into the tooltip of a hidden layer and clicks it, so st_folium sends them as
+last_object_clicked_tooltip (see parse_search_area).
+
+"auto" clusters once a map has more than CLUSTER_THRESHOLD sites.
+"""
+import json
+import math
+
+from branca.element import MacroElement
+from jinja2 import Template
+
+import numpy as np
+import pandas as pd
+import folium
+from folium.plugins import FastMarkerCluster
+
+from utils.spatial import GridIndex
+
+MAP_CENTER = [20.5937, 78.9629]
+MAP_ZOOM = 5
+MAP_TILES = "cartodbpositron"
+CLUSTER_THRESHOLD = 200
+MAP_MODES = {"Auto": "auto", "Markers": "markers", "Clustered": "clustered", "Viewport": "viewport"}
+VIEWPORT_MARGIN = 0.25  # fraction of the viewport span added on every side
+VIEWPORT_MARKER_LIMIT = 500
+VIEWPORT_MARKER_ZOOM = 7  # below this zoom the viewport layer always aggregates
+
+# Values the map component sends back. It only sends when one of them changes, so
+# returning clicks alone means panning or zooming causes no rerun at all.
+CLICK_EVENTS = ["last_object_clicked", "last_object_clicked_tooltip"]
+SEARCH_AREA_PREFIX = "search-area:"
+
+MARKER_ICON_HTML = """<div style="background-color: #3498db; width: 12px; height: 12px; border-radius: 50%; border: 2px solid white; box-shadow: 0 0 4px rgba(0,0,0,0.3); position: relative;"><div style="position: absolute; top: 50%; left: 50%; transform: translate(-50%, -50%); width: 4px; height: 4px; background-color: white; border-radius: 50%;"></div></div>"""
+
+ITINERARY_ICON_HTML = """<div style="background-color: #e67e22; color: white; width: 22px; height: 22px; border-radius: 50%%; border: 2px solid white; box-shadow: 0 0 4px rgba(0,0,0,0.3); font-size: 11px; font-weight: bold; line-height: 18px; text-align: center;">%d</div>"""
+
+# Builds one clustered marker per row = [lat, lon, name].
+CLUSTER_CALLBACK = """function (row) {
+    var icon = L.divIcon({html: %(icon_html)s, iconSize: [12, 12], iconAnchor: [6, 6], className: ''});
+    var marker = L.marker(new L.LatLng(row[0], row[1]), {icon: icon});
+    marker.bindTooltip(String(row[2]).replace(/[&<>"']/g, function (c) {
+        return {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'}[c];
+    }));
+    return marker;
+}"""
+
+
+def site_rows(sites_df):
+    """[lat, lon, name] per site with valid coordinates, plus the names skipped for invalid ones."""
+    latitudes = np.asarray(sites_df["Latitude"], dtype=float)
+    longitudes = np.asarray(sites_df["Longitude"], dtype=float)
+    valid = np.isfinite(latitudes) & np.isfinite(longitudes)
+    names = ["Unknown Site" if pd.isna(name) else str(name) for name in sites_df["Name"].astype(object)]
+    skipped = [name for name, ok in zip(names, valid) if not ok]
+    rows = [[float(lat), float(lon), name]
+            for lat, lon, name, ok in zip(latitudes, longitudes, names, valid) if ok]
+    return rows, skipped
+
+
+def resolve_map_mode(mode, num_sites):
+    """'markers', 'clustered' or 'viewport' for a MAP_MODES value."""
+    if mode == "auto":
+        return "clustered" if num_sites > CLUSTER_THRESHOLD else "markers"
+    return mode
+
+
+def returned_map_events(rendering):
+    """st_folium returned_objects for a rendering: clicks only (viewport searches arrive as clicks too)."""
+    return CLICK_EVENTS
+
+
+class SearchAreaControl(MacroElement):
+    """"Search this area" button that reports the map's bounds and zoom as a click on a hidden layer."""
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        (function (map) {
+            var reporter = L.circleMarker([0, 0], {radius: 0, stroke: false, fill: false, interactive: false})
+                .bindTooltip({{ this.prefix|tojson }}).addTo(map);
+            var control = L.control({position: "topright"});
+            control.onAdd = function () {
+                var button = L.DomUtil.create("button", "search-area-button");
+                button.type = "button";
+                button.innerHTML = {{ this.label|tojson }};
+                button.style.cssText = "padding: 4px 10px; border: 2px solid rgba(0,0,0,0.2); " +
+                    "border-radius: 4px; background: white; cursor: pointer; font: 13px sans-serif;";
+                L.DomEvent.disableClickPropagation(button);
+                L.DomEvent.on(button, "click", function () {
+                    var b = map.getBounds();
+                    var view = [b.getSouth(), b.getWest(), b.getNorth(), b.getEast()].map(function (v) {
+                        return v.toFixed(5);
+                    });
+                    reporter.setTooltipContent({{ this.prefix|tojson }} + view.join(",") + "," + map.getZoom());
+                    reporter.fire("click", {latlng: map.getCenter()});
+                });
+                return button;
+            };
+            control.addTo(map);
+        })({{ this._parent.get_name() }});
+        {% endmacro %}
+    """)
+
+    def __init__(self, label="🔍 Search this area"):
+        super().__init__()
+        self._name = "SearchAreaControl"
+        self.prefix = SEARCH_AREA_PREFIX
+        self.label = label
+
+
+def parse_search_area(tooltip):
+    """(bounds in st_folium's format, zoom) from a "Search this area" click's tooltip, or None for other clicks."""
+    if not isinstance(tooltip, str) or not tooltip.startswith(SEARCH_AREA_PREFIX):
+        return None
+    try:
+        south, west, north, east, zoom = (float(v) for v in tooltip[len(SEARCH_AREA_PREFIX):].split(","))
+    except ValueError:
+        return None
+    bounds = {"_southWest": {"lat": south, "lng": west}, "_northEast": {"lat": north, "lng": east}}
+    return bounds, int(zoom)
+
+
+def add_site_markers(m, rows):
+    """One DivIcon marker per row, keyed by its tooltip."""
+    for lat, lon, name in rows:
+        icon = folium.DivIcon(html=MARKER_ICON_HTML, icon_size=(12, 12), icon_anchor=(6, 6))
+        folium.Marker([lat, lon], tooltip=name, icon=icon).add_to(m)
+
+
+def add_clustered_sites(m, rows):
+    """All rows as one data array, turned into clustered markers by the browser."""
+    callback = CLUSTER_CALLBACK % {"icon_html": json.dumps(MARKER_ICON_HTML)}
+    FastMarkerCluster(rows, callback=callback, name="Heritage sites", control=False).add_to(m)
+
+
+def build_base_map():
+    """The empty sites map: tiles, default view and scale."""
+    return folium.Map(location=MAP_CENTER, zoom_start=MAP_ZOOM, tiles=MAP_TILES, control_scale=True)
+
+
+def build_sites_map(sites_df, mode="auto"):
+    """The sites map in the given MAP_MODES rendering. Returns (map, rendering used, names skipped for bad coordinates).
+
+    "viewport" returns the base map and its "Search this area" button; its sites come
+    from build_viewport_layer().
+    """
+    m = build_base_map()
+    rows, skipped = site_rows(sites_df)
+    rendering = resolve_map_mode(mode, len(rows))
+    if rendering == "clustered":
+        add_clustered_sites(m, rows)
+    elif rendering == "markers":
+        add_site_markers(m, rows)
+    else:
+        SearchAreaControl().add_to(m)
+    return m, rendering, skipped
+
+
+def build_site_grid(sites_df):
+    """(GridIndex over the site rows, site rows, skipped names); index positions are row positions."""
+    rows, skipped = site_rows(sites_df)
+    grid = GridIndex([row[0] for row in rows], [row[1] for row in rows])
+    return grid, rows, skipped
+
+
+def viewport_box(bounds, margin=VIEWPORT_MARGIN):
+    """(south, west, north, east) of st_folium `bounds` widened by `margin` of its span, or None if incomplete."""
+    try:
+        south, west = bounds["_southWest"]["lat"], bounds["_southWest"]["lng"]
+        north, east = bounds["_northEast"]["lat"], bounds["_northEast"]["lng"]
+    except (KeyError, TypeError):
+        return None
+    if None in (south, west, north, east):
+        return None
+    lat_margin, lon_margin = (north - south) * margin, (east - west) * margin
+    return south - lat_margin, west - lon_margin, north + lat_margin, east + lon_margin
+
+
+def aggregate_cell_degrees(zoom):
+    """Bubble cell size for a zoom level: about a quarter of the visible map width per cell."""
+    return 64.0 / 2 ** zoom
+
+
+def build_viewport_layer(grid, rows, bounds=None, zoom=None):
+    """Layer of the sites in the viewport. Returns (FeatureGroup, markers drawn, bubbles drawn).
+
+    `bounds` and `zoom` come from the last "Search this area" click; without them (before
+    the first search) the whole index is treated as visible at MAP_ZOOM.
+    """
+    zoom = MAP_ZOOM if zoom is None else zoom
+    box = viewport_box(bounds) if bounds else None
+    positions = grid.positions if box is None else grid.query_bbox(*box)
+    layer = folium.FeatureGroup(name="Heritage sites", control=False)
+    if zoom >= VIEWPORT_MARKER_ZOOM and len(positions) <= VIEWPORT_MARKER_LIMIT:
+        add_site_markers(layer, [rows[position] for position in np.sort(positions)])
+        return layer, len(positions), 0
+    markers = bubbles = 0
+    for lat, lon, count, position in zip(*grid.aggregate(positions, aggregate_cell_degrees(zoom))):
+        if count == 1:
+            add_site_markers(layer, [rows[position]])
+            markers += 1
+            continue
+        folium.CircleMarker([float(lat), float(lon)], radius=min(8 + 3 * math.log2(count), 30), color="#2c3e50",
+                            weight=1, fill=True, fill_color="#3498db", fill_opacity=0.6,
+                            tooltip=f"{count} sites — zoom in").add_to(layer)
+        bubbles += 1
+    return layer, markers, bubbles
+
+
+def build_itinerary_layer(stops, round_trip=False):
+    """Layer drawing an itinerary: numbered stop markers joined by a polyline. `stops` = [lat, lon, name] in order."""
+    layer = folium.FeatureGroup(name="Itinerary", control=False)
+    path = [[lat, lon] for lat, lon, _ in stops]
+    if round_trip and len(path) > 1:
+        path.append(path[0])
+    if len(path) > 1:
+        folium.PolyLine(path, color="#e67e22", weight=3, opacity=0.8).add_to(layer)
+    for number, (lat, lon, name) in enumerate(stops, start=1):
+        icon = folium.DivIcon(html=ITINERARY_ICON_HTML % number, icon_size=(22, 22), icon_anchor=(11, 11))
+        folium.Marker([lat, lon], tooltip=name, icon=icon).add_to(layer)
+    return layer
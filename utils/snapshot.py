@@ -0,0 +1,230 @@
+"""
+Local columnar snapshot of the CULTURE_HERITAGE.PUBLIC tables.
+
+Each table is exported to an uncompressed Arrow IPC file named after its content hash,
+next to a manifest.json recording rows, columns, hashes, the source table's
+LAST_ALTERED time and an overall snapshot version. SnapshotConnection memory-maps
+the files, so the tables' buffers point into the page cache and every app process
+on the host shares one copy, and answers the pages' existing SQL with the embedded engine in
+utils/local_engine.py, so the app can run from the snapshot and only consult
+Snowflake to refresh changed tables.
+
+Run from the repository root (uses the app's Snowflake secrets):
+    python -m utils.snapshot export     # full export
+    python -m utils.snapshot refresh    # re-export only tables changed in Snowflake
+    python -m utils.snapshot status
+"""
+import argparse
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+from utils.local_engine import LocalEngineConnection
+
+SNAPSHOT_DATABASE = "CULTURE_HERITAGE"
+SNAPSHOT_SCHEMA = "PUBLIC"
+SNAPSHOT_TABLES = ["TOURISM_TRENDS", "CRAFT_IMAGE", "DANCE_FINAL", "UNESCO_INDIA_SITES", "FESTIVALS_FINAL"]
+SNAPSHOT_COMPRESSION = None  # compressed buffers would be decoded into private memory on read
+MANIFEST_NAME = "manifest.json"
+MANIFEST_FORMAT = 1
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SNAPSHOT_DIR = os.environ.get(
+    "CULTURAL_CANVAS_SNAPSHOT_DIR", os.path.join(REPO_ROOT, "snapshots", "culture_heritage"))
+
+
+# --- Manifest ---
+def read_manifest(snapshot_dir=DEFAULT_SNAPSHOT_DIR):
+    """The snapshot manifest as a dict, or None if no snapshot has been exported."""
+    try:
+        with open(os.path.join(snapshot_dir, MANIFEST_NAME), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _write_manifest(snapshot_dir, manifest):
+    path = os.path.join(snapshot_dir, MANIFEST_NAME)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(path + ".tmp", path)  # readers see the old or the new manifest, never a partial one
+
+
+def snapshot_version(tables):
+    """Short hash over every table's content hash; changes whenever any table does."""
+    digest = hashlib.sha256()
+    for name in sorted(tables):
+        digest.update(f"{name}:{tables[name]['sha256']}\n".encode())
+    return digest.hexdigest()[:12]
+
+
+# --- Export ---
+def _to_arrow(df):
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Mixed-type object columns (e.g. Decimal next to str) are stored as text.
+        df = df.copy()
+        for col in df.columns[df.dtypes == object]:
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+        return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def write_table_file(snapshot_dir, name, df, compression=SNAPSHOT_COMPRESSION):
+    """Write one table as an Arrow IPC file and return its manifest entry."""
+    table = _to_arrow(df)
+    tmp_path = os.path.join(snapshot_dir, f".{name}.arrow.tmp")
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with ipc.new_file(sink, table.schema, options=ipc.IpcWriteOptions(compression=compression)) as writer:
+            writer.write_table(table)
+    with open(tmp_path, "rb") as f:
+        sha256 = hashlib.sha256(f.read()).hexdigest()
+    # Content-addressed names: a refresh never overwrites a file another process has mapped.
+    file_name = f"{name}-{sha256[:12]}.arrow"
+    os.replace(tmp_path, os.path.join(snapshot_dir, file_name))
+    return {
+        "file": file_name, "sha256": sha256, "rows": table.num_rows, "columns": table.column_names,
+        "compression": compression,
+        "bytes": os.path.getsize(os.path.join(snapshot_dir, file_name)),
+        "exported_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def probe_source_tables(conn, tables=SNAPSHOT_TABLES):
+    """LAST_ALTERED and ROW_COUNT of the source tables, from Snowflake's INFORMATION_SCHEMA.
+
+    A metadata-only query: it does not scan the tables. Local engine connections answer it
+    themselves (see LocalEngineConnection.probe_tables).
+    """
+    if hasattr(conn, "probe_tables"):
+        return conn.probe_tables(tables)
+    names = ", ".join(f"'{name}'" for name in tables)
+    df = conn.query(f"""
+        SELECT TABLE_NAME, LAST_ALTERED, ROW_COUNT
+        FROM {SNAPSHOT_DATABASE}.INFORMATION_SCHEMA.TABLES
+        WHERE TABLE_SCHEMA = '{SNAPSHOT_SCHEMA}' AND TABLE_NAME IN ({names});
+    """, ttl=0)
+    df = df.rename(columns=str.upper)
+    return {
+        row.TABLE_NAME: {"last_altered": str(row.LAST_ALTERED),
+                         "source_row_count": None if pd.isna(row.ROW_COUNT) else int(row.ROW_COUNT)}
+        for row in df.itertuples(index=False)
+    }
+
+
+def _remove_unreferenced_files(snapshot_dir, manifest):
+    referenced = {entry["file"] for entry in manifest["tables"].values()}
+    for file_name in os.listdir(snapshot_dir):
+        if file_name.endswith(".arrow") and file_name not in referenced:
+            try:
+                os.remove(os.path.join(snapshot_dir, file_name))
+            except OSError:
+                pass  # still mapped by a reader on a platform that forbids it; removed next time
+
+
+def export_snapshot(conn, snapshot_dir=DEFAULT_SNAPSHOT_DIR, tables=SNAPSHOT_TABLES, probe=None):
+    """Export `tables` from Snowflake into the snapshot, keeping the other tables' entries."""
+    os.makedirs(snapshot_dir, exist_ok=True)
+    manifest = read_manifest(snapshot_dir) or {"format": MANIFEST_FORMAT, "tables": {}}
+    if probe is None:
+        try:
+            probe = probe_source_tables(conn, tables)
+        except Exception as e:
+            print(f"Warning: could not read table metadata, incremental refresh will re-export: {e}")
+            probe = {}
+    for name in tables:
+        df = conn.query(f'SELECT * FROM "{SNAPSHOT_DATABASE}"."{SNAPSHOT_SCHEMA}"."{name}";', ttl=0)
+        manifest["tables"][name] = {**write_table_file(snapshot_dir, name, df), **probe.get(name, {})}
+    manifest.update({
+        "database": SNAPSHOT_DATABASE, "schema": SNAPSHOT_SCHEMA,
+        "version": snapshot_version(manifest["tables"]),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    })
+    _write_manifest(snapshot_dir, manifest)
+    _remove_unreferenced_files(snapshot_dir, manifest)
+    return manifest
+
+
+def refresh_snapshot(conn, snapshot_dir=DEFAULT_SNAPSHOT_DIR):
+    """Re-export only the tables whose LAST_ALTERED changed since the snapshot.
+
+    Tables written with another compression (older snapshots used lz4) are re-exported too.
+
+    Returns (manifest, names of the re-exported tables).
+    """
+    manifest = read_manifest(snapshot_dir)
+    if manifest is None:
+        return export_snapshot(conn, snapshot_dir), list(SNAPSHOT_TABLES)
+    probe = probe_source_tables(conn)
+    changed = [
+        name for name in SNAPSHOT_TABLES
+        if name not in manifest["tables"]
+        or not os.path.exists(os.path.join(snapshot_dir, manifest["tables"][name]["file"]))
+        or name not in probe
+        or manifest["tables"][name].get("last_altered") != probe[name]["last_altered"]
+        or manifest["tables"][name].get("compression", "lz4") != SNAPSHOT_COMPRESSION
+    ]
+    if changed:
+        manifest = export_snapshot(conn, snapshot_dir, changed, probe)
+    return manifest, changed
+
+
+# --- Reading ---
+def open_table_file(path):
+    """Memory-map an Arrow IPC snapshot file; the table's buffers are zero-copy views of the map."""
+    return ipc.open_file(pa.memory_map(path, "r")).read_all()
+
+
+class SnapshotConnection(LocalEngineConnection):
+    """Read-only stand-in for st.connection("snowflake") backed by the local snapshot."""
+
+    backend = "snapshot"
+
+    def __init__(self, snapshot_dir=DEFAULT_SNAPSHOT_DIR):
+        self.snapshot_dir = snapshot_dir
+        super().__init__()
+
+    def load_tables(self):
+        manifest = read_manifest(self.snapshot_dir)
+        if manifest is None:
+            raise FileNotFoundError(
+                f"No CULTURE_HERITAGE snapshot in {self.snapshot_dir}; run `python -m utils.snapshot export`.")
+        tables = {name: open_table_file(os.path.join(self.snapshot_dir, entry["file"]))
+                  for name, entry in manifest["tables"].items()}
+        self.manifest = manifest
+        return tables, manifest["version"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["export", "refresh", "status"])
+    parser.add_argument("--dir", default=DEFAULT_SNAPSHOT_DIR, help="Snapshot directory.")
+    args = parser.parse_args()
+
+    if args.command == "status":
+        manifest = read_manifest(args.dir)
+        if manifest is None:
+            print(f"no snapshot in {args.dir}")
+            return
+        print(f"snapshot {manifest['version']} created {manifest['created_at']} in {args.dir}")
+        for name, entry in sorted(manifest["tables"].items()):
+            print(f"  {name:<20} {entry['rows']:>9,} rows {entry['bytes'] / 1024:>9,.1f} KiB  "
+                  f"last altered {entry.get('last_altered', 'unknown')}")
+        return
+
+    import streamlit as st
+    conn = st.connection("snowflake")
+    if args.command == "export":
+        manifest, changed = export_snapshot(conn, args.dir), SNAPSHOT_TABLES
+    else:
+        manifest, changed = refresh_snapshot(conn, args.dir)
+    print(f"snapshot {manifest['version']}: re-exported {', '.join(changed) or 'nothing (up to date)'}")
+
+
+if __name__ == "__main__":
+    main()
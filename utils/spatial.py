@@ -0,0 +1,121 @@
+"""
+Uniform lat/lon grid index over point sets (heritage sites, monuments).
+
+Points are bucketed into cell_degrees x cell_degrees cells and stored sorted by cell,
+so a bounding-box query touches only the occupied cells that overlap the box and then
+filters those points exactly, instead of testing every point. aggregate() groups a
+set of points into coarser cells for low-zoom summaries.
+
+within() and nearest() answer radius and k-nearest queries in great-circle kilometres:
+the radius becomes the bounding box of the circle on the sphere, and only the box's points
+get a (vectorized) haversine distance. nearest() widens the radius until it holds k
+points, so its result is exact.
+"""
+import numpy as np
+
+DEFAULT_CELL_DEGREES = 0.5
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = EARTH_RADIUS_KM * np.pi / 180.0
+HALF_CIRCUMFERENCE_KM = EARTH_RADIUS_KM * np.pi
+
+
+def haversine_km(latitude, longitude, latitudes, longitudes):
+    """Great-circle distances in km from one point to arrays of points."""
+    lat1, lon1 = np.radians(latitude), np.radians(longitude)
+    lat2, lon2 = np.radians(np.asarray(latitudes, dtype=float)), np.radians(np.asarray(longitudes, dtype=float))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def haversine_matrix_km(latitudes, longitudes):
+    """Pairwise great-circle distances in km between the points, as an (n, n) array."""
+    lat, lon = np.radians(np.asarray(latitudes, dtype=float)), np.radians(np.asarray(longitudes, dtype=float))
+    a = (np.sin((lat[:, None] - lat[None, :]) / 2) ** 2 +
+         np.cos(lat)[:, None] * np.cos(lat)[None, :] * np.sin((lon[:, None] - lon[None, :]) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class GridIndex:
+    """Static grid index over (latitude, longitude) arrays; positions refer to the input order."""
+
+    def __init__(self, latitudes, longitudes, cell_degrees=DEFAULT_CELL_DEGREES):
+        self.latitudes = np.asarray(latitudes, dtype=float)
+        self.longitudes = np.asarray(longitudes, dtype=float)
+        self.cell_degrees = float(cell_degrees)
+        valid = np.flatnonzero(np.isfinite(self.latitudes) & np.isfinite(self.longitudes))
+        rows, cols = self._cell(self.latitudes[valid], self.longitudes[valid])
+        order = np.lexsort((cols, rows))
+        self.positions = valid[order]  # point positions grouped by cell
+        cell_rows, cell_cols = rows[order], cols[order]
+        starts = np.empty(0, dtype=np.intp)
+        if len(order):
+            starts = np.flatnonzero(np.r_[True, (np.diff(cell_rows) != 0) | (np.diff(cell_cols) != 0)])
+        self.cell_rows, self.cell_cols = cell_rows[starts], cell_cols[starts]
+        self.cell_starts = starts
+        self.cell_ends = np.append(starts[1:], len(order)) if len(order) else starts
+
+    def __len__(self):
+        return len(self.positions)
+
+    def _cell(self, latitudes, longitudes):
+        return (np.floor((latitudes + 90.0) / self.cell_degrees).astype(np.int64),
+                np.floor((longitudes + 180.0) / self.cell_degrees).astype(np.int64))
+
+    def _points_in_cells(self, cell_mask):
+        starts, ends = self.cell_starts[cell_mask], self.cell_ends[cell_mask]
+        if len(starts) == 0:
+            return np.empty(0, dtype=np.intp)
+        return np.concatenate([self.positions[start:end] for start, end in zip(starts, ends)])
+
+    def query_bbox(self, south, west, north, east):
+        """Positions of the points inside the box, in cell order."""
+        row_lo, col_lo = self._cell(np.array([south]), np.array([west]))
+        row_hi, col_hi = self._cell(np.array([north]), np.array([east]))
+        cell_mask = ((self.cell_rows >= row_lo[0]) & (self.cell_rows <= row_hi[0]) &
+                     (self.cell_cols >= col_lo[0]) & (self.cell_cols <= col_hi[0]))
+        candidates = self._points_in_cells(cell_mask)
+        lat, lon = self.latitudes[candidates], self.longitudes[candidates]
+        return candidates[(lat >= south) & (lat <= north) & (lon >= west) & (lon <= east)]
+
+    def aggregate(self, positions, cell_degrees):
+        """Group `positions` into cell_degrees cells: (mean lat, mean lon, count, first position) arrays per cell."""
+        positions = np.asarray(positions, dtype=np.intp)
+        if len(positions) == 0:
+            empty = np.empty(0)
+            return empty, empty, np.empty(0, dtype=np.int64), np.empty(0, dtype=np.intp)
+        lat, lon = self.latitudes[positions], self.longitudes[positions]
+        rows = np.floor((lat + 90.0) / cell_degrees).astype(np.int64)
+        cols = np.floor((lon + 180.0) / cell_degrees).astype(np.int64)
+        _, first, inverse = np.unique(np.stack([rows, cols], axis=1), axis=0, return_index=True, return_inverse=True)
+        inverse = inverse.ravel()  # some numpy versions return it with the stacked shape
+        counts = np.bincount(inverse)
+        return (np.bincount(inverse, weights=lat) / counts, np.bincount(inverse, weights=lon) / counts,
+                counts, positions[first])
+
+    def within(self, latitude, longitude, radius_km):
+        """(positions, distances in km) of the points within radius_km, nearest first."""
+        angle = radius_km / EARTH_RADIUS_KM  # angular radius of the circle
+        lat_span = np.degrees(angle) * (1 + 1e-9)
+        north, south = latitude + lat_span, latitude - lat_span
+        if radius_km >= HALF_CIRCUMFERENCE_KM or np.sin(angle) >= np.cos(np.radians(latitude)):
+            candidates = self.positions  # the circle contains a pole: every longitude is in range
+        else:
+            # Widest longitude offset on the circle (reached north or south of its centre's latitude).
+            lon_span = np.degrees(np.arcsin(np.sin(angle) / np.cos(np.radians(latitude)))) * (1 + 1e-9)
+            candidates = self.query_bbox(south, longitude - lon_span, north, longitude + lon_span)
+            if longitude - lon_span < -180.0 or longitude + lon_span > 180.0:
+                candidates = self.positions  # crosses the antimeridian
+        distances = haversine_km(latitude, longitude, self.latitudes[candidates], self.longitudes[candidates])
+        inside = distances <= radius_km
+        candidates, distances = candidates[inside], distances[inside]
+        order = np.argsort(distances, kind="stable")
+        return candidates[order], distances[order]
+
+    def nearest(self, latitude, longitude, k, start_km=None):
+        """(positions, distances in km) of the k nearest points, nearest first."""
+        radius_km = start_km or self.cell_degrees * KM_PER_DEGREE
+        while True:
+            positions, distances = self.within(latitude, longitude, radius_km)
+            if len(positions) >= k or radius_km >= HALF_CIRCUMFERENCE_KM:
+                return positions[:k], distances[:k]
+            radius_km *= 2
@@ -0,0 +1,133 @@
+"""
+Materialized per-state profiles joining crafts, dances, festivals and UNESCO sites.
+
+A state overview used to mean running every page's loader and scanning each table for
+the state's rows. Instead, narrow (name, state) projections of the four tables are
+fetched through the stale-while-revalidate cache, resolved against the state dimension
+(utils/states.py) and aggregated once per version of those tables into StateProfiles: counts,
+top items and centroid per state_id, plus the latest national visitor figures from
+TOURISM_TRENDS (which has no state breakdown). Looking up a state is then a dict access.
+"""
+from collections import namedtuple
+
+import pandas as pd
+import streamlit as st
+
+from utils.concurrency import run_loaders_concurrently
+from utils.connection import get_culture_heritage_connection, table_fingerprint
+from utils.states import STATES, resolve_states, state_bit
+from utils.swr_cache import culture_heritage_cache
+from utils.telemetry import instrument_loader
+
+TOP_ITEMS = 5
+
+ProfileSource = namedtuple("ProfileSource", ["table", "name_column", "state_column"])
+
+# Each source contributes a "<key>" count and a "top_<key>" list to every profile.
+PROFILE_SOURCES = {
+    "crafts": ProfileSource("CRAFT_IMAGE", "CRAFT", "STATE"),
+    "dances": ProfileSource("DANCE_FINAL", "DANCE", "REGION_STATE"),
+    "festivals": ProfileSource("FESTIVALS_FINAL", "FESTIVAL_NAME", "STATE"),
+    "unesco_sites": ProfileSource("UNESCO_INDIA_SITES", "NAME", "STATE_UT"),
+}
+
+NATIONAL_VISITS_QUERY = """
+SELECT YEAR, DOMESTIC_TOURIST_VISITS, FOREIGN_TOURIST_VISITS
+FROM "CULTURE_HERITAGE"."PUBLIC"."TOURISM_TRENDS"
+ORDER BY YEAR DESC
+LIMIT 1;
+"""
+
+
+def build_profile_source_query(source):
+    return f"""
+    SELECT "{source.name_column}" AS NAME, "{source.state_column}" AS STATE
+    FROM "CULTURE_HERITAGE"."PUBLIC"."{source.table}";
+    """
+
+
+class StateProfiles:
+    """Read-only per-state aggregates, keyed by state_id; built once per version of the source tables."""
+
+    def __init__(self, sources, national_visits=None, version=None):
+        self.version = version
+        self.national = _national_visits(national_visits)
+        rows = []
+        for state in STATES:
+            rows.append({"state_id": state.id, "state": state.name, "kind": state.kind, "region": state.region,
+                         "latitude": state.latitude, "longitude": state.longitude})
+        table = pd.DataFrame(rows).set_index("state_id")
+        for key in PROFILE_SOURCES:
+            counts, top_items = _aggregate_by_state(sources.get(key, pd.DataFrame()))
+            table[key] = pd.Series(counts, dtype="int64").reindex(table.index, fill_value=0)
+            table[f"top_{key}"] = pd.Series(top_items, dtype=object).reindex(table.index)
+            table[f"top_{key}"] = table[f"top_{key}"].apply(lambda items: items if isinstance(items, list) else [])
+        table["heritage_items"] = table[list(PROFILE_SOURCES)].sum(axis=1)
+        self.table = table
+        self._by_id = {state_id: dict(row, state_id=state_id) for state_id, row in table.to_dict("index").items()}
+        self._by_name = {profile["state"]: profile for profile in self._by_id.values()}
+
+    def get(self, state_id):
+        """Profile dict of `state_id`, or None."""
+        return self._by_id.get(state_id)
+
+    def by_name(self, state_name):
+        """Profile dict of a canonical state name, or None."""
+        return self._by_name.get(state_name)
+
+    def represented(self):
+        """Profiles of the states with at least one craft, dance, festival or site, most items first."""
+        table = self.table[self.table["heritage_items"] > 0].sort_values(["heritage_items", "state"],
+                                                                          ascending=[False, True])
+        return [self._by_id[state_id] for state_id in table.index]
+
+
+def _aggregate_by_state(df):
+    """({state_id: row count}, {state_id: first TOP_ITEMS distinct names}) of a (NAME, STATE) frame."""
+    if df.empty:
+        return {}, {}
+    df = df.rename(columns=str.upper)
+    masks = resolve_states(df["STATE"])["mask"].to_numpy()
+    names = df["NAME"].astype(object)
+    counts, top_items = {}, {}
+    for state in STATES:
+        in_state = (masks & state_bit(state.id)) != 0  # multi-state rows count for each of their states
+        if in_state.any():
+            counts[state.id] = int(in_state.sum())
+            top_items[state.id] = sorted(names[in_state].dropna().astype(str).unique())[:TOP_ITEMS]
+    return counts, top_items
+
+
+def _national_visits(df):
+    if df is None or df.empty:
+        return None
+    latest = df.rename(columns=str.upper).iloc[0]
+    return {"year": int(latest["YEAR"]),
+            "domestic_visits": pd.to_numeric(latest["DOMESTIC_TOURIST_VISITS"], errors="coerce"),
+            "foreign_visits": pd.to_numeric(latest["FOREIGN_TOURIST_VISITS"], errors="coerce")}
+
+
+@st.cache_resource(max_entries=2, show_spinner="Building state profiles...")
+def _build_state_profiles(source_versions, _sources, _national_visits):
+    """Aggregate once per set of source table versions; `source_versions` only keys the cache."""
+    return StateProfiles(_sources, _national_visits, version=source_versions)
+
+
+@instrument_loader("state_profiles")
+def load_state_profiles():
+    """Per-state profiles of the current data, shared across sessions. Raises if a source fails to load."""
+    conn = get_culture_heritage_connection()
+
+    def source_loader(source):
+        query = build_profile_source_query(source)
+        return lambda: culture_heritage_cache.get(query, lambda: conn.query(query, ttl=0),
+                                                  fingerprint=lambda: table_fingerprint(conn, source.table))
+
+    loaders = {key: source_loader(source) for key, source in PROFILE_SOURCES.items()}
+    loaders["national_visits"] = lambda: culture_heritage_cache.get(
+        NATIONAL_VISITS_QUERY, lambda: conn.query(NATIONAL_VISITS_QUERY, ttl=0),
+        fingerprint=lambda: table_fingerprint(conn, "TOURISM_TRENDS"))
+    results = run_loaders_concurrently(loaders)
+    source_versions = tuple(culture_heritage_cache.version_of(df) for df in results.values())
+    national_visits = results.pop("national_visits")
+    return _build_state_profiles(source_versions, results, national_visits)
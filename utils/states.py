@@ -0,0 +1,223 @@
+"""
+Canonical state/UT dimension shared by every dataset.
+
+Each of India's 28 states and 8 union territories has a stable integer id, a canonical
+name, a region and a centroid. `apply_state_dimension(df, column)` resolves a raw state
+column at load time:
+
+  <column>    the canonical label ("Orissa" -> "Odisha", "Jammu & Kashmir" -> "Jammu and Kashmir");
+              multi-state values keep every part ("Odisha, West Bengal")
+  state_id    Int16 id of the (first) state, <NA> when the label is missing or unknown
+  state_mask  int64 bit set with bit `id` set for every state in the label, so "rows of
+              Odisha" is `(state_mask & state_bit(id)) != 0` even for multi-state rows
+  region      region of the (first) state
+
+so filters and cross-dataset joins compare integer keys, and coordinates come from one
+table instead of per-page dictionaries keyed by whichever spelling a page expected.
+Labels that match no state are reported once with a warning instead of silently
+losing their coordinates.
+"""
+import re
+import threading
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+State = namedtuple("State", ["id", "name", "kind", "region", "latitude", "longitude", "aliases"])
+
+# Ids are assigned once and never reused; append new entries at the end.
+STATES = [
+    State(1, "Andaman and Nicobar Islands", "UT", "East", 11.7401, 92.6586, ("andaman nicobar", "a and n islands")),
+    State(2, "Andhra Pradesh", "State", "South", 16.5, 80.6, ()),
+    State(3, "Arunachal Pradesh", "State", "North East", 27.1004, 93.6167, ()),
+    State(4, "Assam", "State", "North East", 26.2006, 92.9376, ()),
+    State(5, "Bihar", "State", "East", 25.4, 85.4, ()),
+    State(6, "Chandigarh", "UT", "North", 30.7333, 76.7794, ()),
+    State(7, "Chhattisgarh", "State", "Central", 21.3, 81.6, ("chattisgarh",)),
+    State(8, "Dadra and Nagar Haveli and Daman and Diu", "UT", "West", 20.3974, 72.8328,
+          ("dadra and nagar haveli", "daman and diu", "dnh and dd")),
+    State(9, "Delhi", "UT", "North", 28.6139, 77.2090, ("new delhi", "nct of delhi", "national capital territory of delhi")),
+    State(10, "Goa", "State", "West", 15.2993, 74.1240, ()),
+    State(11, "Gujarat", "State", "West", 22.3, 72.6, ()),
+    State(12, "Haryana", "State", "North", 29.0588, 76.0856, ()),
+    State(13, "Himachal Pradesh", "State", "North", 31.1048, 77.1734, ()),
+    State(14, "Jammu and Kashmir", "UT", "North", 34.1, 74.8, ("j and k", "jammu kashmir")),
+    State(15, "Jharkhand", "State", "East", 23.6102, 85.2799, ()),
+    State(16, "Karnataka", "State", "South", 15.3, 75.7, ("mysore state",)),
+    State(17, "Kerala", "State", "South", 10.8, 76.3, ()),
+    State(18, "Ladakh", "UT", "North", 34.1526, 77.5771, ()),
+    State(19, "Lakshadweep", "UT", "South", 10.5667, 72.6417, ()),
+    State(20, "Madhya Pradesh", "State", "Central", 23.2, 77.4, ()),
+    State(21, "Maharashtra", "State", "West", 19.2, 73.2, ()),
+    State(22, "Manipur", "State", "North East", 24.6637, 93.9063, ()),
+    State(23, "Meghalaya", "State", "North East", 25.4670, 91.3662, ()),
+    State(24, "Mizoram", "State", "North East", 23.1645, 92.9376, ()),
+    State(25, "Nagaland", "State", "North East", 26.1584, 94.5624, ()),
+    State(26, "Odisha", "State", "East", 20.3, 85.8, ("orissa",)),
+    State(27, "Puducherry", "UT", "South", 11.9416, 79.8083, ("pondicherry",)),
+    State(28, "Punjab", "State", "North", 31.1, 75.3, ()),
+    State(29, "Rajasthan", "State", "North", 27.0, 74.2, ()),
+    State(30, "Sikkim", "State", "North East", 27.5330, 88.5122, ()),
+    State(31, "Tamil Nadu", "State", "South", 11.1, 78.7, ("tamilnadu",)),
+    State(32, "Telangana", "State", "South", 18.1124, 79.0193, ("telengana",)),
+    State(33, "Tripura", "State", "North East", 23.9408, 91.9882, ()),
+    State(34, "Uttar Pradesh", "State", "North", 26.8, 80.9, ()),
+    State(35, "Uttarakhand", "State", "North", 30.0668, 79.0193, ("uttaranchal",)),
+    State(36, "West Bengal", "State", "East", 22.6, 88.4, ()),
+]
+
+STATES_BY_ID = {state.id: state for state in STATES}
+STATE_IDS = {state.name: state.id for state in STATES}
+
+# Labels that mean "no particular state"; they resolve to no id without a warning.
+NO_STATE_LABELS = {"", "n a", "na", "none", "null", "nan", "india", "pan india", "all india", "various", "unknown"}
+
+# A label naming several states, e.g. "Odisha, West Bengal".
+_PART_SEPARATORS = re.compile(r"\s*[,;/|]\s*")
+
+Resolution = namedtuple("Resolution", ["label", "state_id", "mask", "region", "latitude", "longitude"])
+
+
+def normalize_state_label(label):
+    """Lowercase, '&' -> 'and', no punctuation, bracketed notes or 'formerly ...' suffix."""
+    text = str(label).lower().replace("&", " and ")
+    text = re.sub(r"\(.*?\)", " ", text)
+    text = re.sub(r"\bformerly\b.*$", " ", text)  # "Uttarakhand Formerly Uttaranchal"
+    text = re.sub(r"[^a-z ]+", " ", text)
+    return " ".join(text.split())
+
+
+def _build_lookup():
+    lookup = {}
+    for state in STATES:
+        lookup[normalize_state_label(state.name)] = state.id
+        for alias in state.aliases:
+            lookup[normalize_state_label(alias)] = state.id
+    return lookup
+
+
+_LOOKUP = _build_lookup()
+_warned_labels = set()
+_warned_lock = threading.Lock()
+
+
+def canonical_state_id(label):
+    """Id of a single state/UT label in any known spelling, or None."""
+    if label is None or (not isinstance(label, str) and pd.isna(label)):
+        return None
+    return _LOOKUP.get(normalize_state_label(label))
+
+
+def state_bit(state_id):
+    """The state_mask bit of a state id."""
+    return 1 << int(state_id)
+
+
+def resolve_state_label(label):
+    """Resolve one raw label (possibly naming several states) against the dimension."""
+    if label is None or (not isinstance(label, str) and pd.isna(label)):
+        return Resolution("N/A", None, 0, None, None, None)
+    raw = str(label).strip()
+    if normalize_state_label(raw) in NO_STATE_LABELS:
+        return Resolution(raw or "N/A", None, 0, None, None, None)
+    ids = []
+    unknown = False
+    for part in _PART_SEPARATORS.split(raw):
+        normalized = normalize_state_label(part)
+        state_id = _LOOKUP.get(normalized)
+        if state_id is None:
+            unknown = unknown or normalized not in NO_STATE_LABELS
+        elif state_id not in ids:
+            ids.append(state_id)
+    if not ids:
+        if unknown:
+            _warn_unknown(raw)
+        return Resolution(raw or "N/A", None, 0, None, None, None)
+    if unknown:
+        _warn_unknown(raw)
+    states = [STATES_BY_ID[state_id] for state_id in ids]
+    mask = 0
+    for state_id in ids:
+        mask |= state_bit(state_id)
+    # A multi-state label sits at the mean of its states' centroids.
+    return Resolution(
+        ", ".join(state.name for state in states), ids[0], mask, states[0].region,
+        sum(state.latitude for state in states) / len(states),
+        sum(state.longitude for state in states) / len(states))
+
+
+def _warn_unknown(label):
+    with _warned_lock:
+        if label in _warned_labels:
+            return
+        _warned_labels.add(label)
+    print(f"Warning: state label {label!r} matches no state/UT in utils/states.py; add it as an alias")
+
+
+def resolve_states(labels):
+    """Resolve a series of raw labels: DataFrame of Resolution columns aligned with `labels`.
+
+    Each distinct label is resolved once, so this stays cheap for large tables.
+    """
+    labels = pd.Series(labels)
+    codes, uniques = pd.factorize(labels.astype(object), use_na_sentinel=True)
+    resolved = [resolve_state_label(label) for label in uniques] + [resolve_state_label(None)]
+    table = pd.DataFrame(resolved, columns=Resolution._fields)
+    table["state_id"] = table["state_id"].astype("Int16")
+    table["mask"] = table["mask"].astype("int64")
+    table["latitude"] = table["latitude"].astype(float)
+    table["longitude"] = table["longitude"].astype(float)
+    rows = table.take(codes)  # the NA sentinel -1 picks the trailing "N/A" resolution
+    rows.index = labels.index
+    return rows
+
+
+def apply_state_dimension(df, column):
+    """Return `df` with `column` canonicalized and state_id, state_mask and region added."""
+    if df.empty or column not in df.columns:
+        return df
+    resolved = resolve_states(df[column])
+    df = df.copy()
+    df[column] = resolved["label"]
+    df["state_id"] = resolved["state_id"]
+    df["state_mask"] = resolved["mask"]
+    df["region"] = resolved["region"]
+    return df
+
+
+def rows_in_state(df, state_id):
+    """Boolean mask of the rows of `df` (with a state_mask column) that belong to `state_id`."""
+    return (df["state_mask"].to_numpy() & state_bit(state_id)) != 0
+
+
+def build_state_row_index(df):
+    """{state_id: int array of the row positions of `df` in that state}, for filters that skip the scan.
+
+    Built once per dataset version; multi-state rows appear under each of their states.
+    """
+    masks = df["state_mask"].to_numpy()
+    index = {}
+    for state in STATES:
+        positions = np.flatnonzero((masks & state_bit(state.id)) != 0)
+        if len(positions):
+            index[state.id] = positions
+    return index
+
+
+def state_names(state_mask_values):
+    """Sorted canonical names of every state set in any of the given state_mask values."""
+    combined = 0
+    for mask in pd.unique(pd.Series(state_mask_values, dtype="int64")):
+        combined |= int(mask)
+    return sorted(state.name for state in STATES if combined & state_bit(state.id))
+
+
+def labels_in_state(labels, state_id):
+    """The raw labels (any spelling, including multi-state ones) that resolve to include `state_id`."""
+    return [label for label in labels if resolve_state_label(label).mask & state_bit(state_id)]
+
+
+def state_centroids():
+    """{canonical name: [latitude, longitude]} for every state/UT."""
+    return {state.name: [state.latitude, state.longitude] for state in STATES}
@@ -0,0 +1,186 @@
+"""
+Stale-while-revalidate cache for the CULTURE_HERITAGE Snowflake loaders.
+
+Once an entry's TTL expires, callers keep getting the stale value immediately while a
+single background thread fetches a fresh one. Only the very first load of a key makes
+callers wait, and concurrent callers of a cold key share that one load.
+
+A key may also have a fingerprint: a cheap callable (e.g. a table's row count and last
+change time) whose result is stored with the value. When the TTL expires the fingerprint
+is checked first, and the full loader only runs again if it changed.
+
+Every stored value has a version that changes only when a load brings different data
+(a reload that returns equal data keeps the old value object and version). Caches
+derived from loader results key on version_of(value), so they are rebuilt when their
+inputs change and not when some other table is loaded.
+"""
+import itertools
+import threading
+import time
+
+import pandas as pd
+
+from utils.telemetry import note_cache_outcome, record_refresh
+
+DEFAULT_TTL_SECONDS = 3600
+RETRY_AFTER_SECONDS = 60  # after a failed load, wait this long before querying Snowflake again
+
+
+class _Entry:
+    def __init__(self):
+        self.value = None
+        self.loaded_at = None   # time.monotonic() of the last successful load, None while cold
+        self.retry_at = 0.0
+        self.error = None       # exception of the last failed cold load, re-raised until retry_at
+        self.fingerprint = None  # fingerprint taken just before the value was loaded, None if unknown
+        self.version = None     # changes only when a load stores different data
+        self.refreshing = False
+        self.load_lock = threading.Lock()
+
+
+class StaleWhileRevalidateCache:
+    """Process-wide key -> value cache, shared by every session.
+
+    Cached values are handed to all sessions as-is, so callers must treat them as
+    read-only. A failed background refresh keeps the stale value; a failed cold load
+    raises, and keeps raising for RETRY_AFTER_SECONDS instead of re-querying on every rerun.
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL_SECONDS):
+        self.ttl = ttl
+        self.stats = {"refreshes": 0, "refreshes_avoided": 0, "refresh_failures": 0, "fingerprint_failures": 0}
+        self._entries = {}
+        self._versions = {}  # id(stored value) -> version, for version_of()
+        self._version_counter = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _entry(self, key):
+        with self._lock:
+            return self._entries.setdefault(key, _Entry())
+
+    def _store(self, entry, value, fingerprint):
+        with self._lock:
+            entry.loaded_at, entry.fingerprint = time.monotonic(), fingerprint
+            if entry.version is not None and _same_data(entry.value, value):
+                return  # equal data: keep the value object, so its version (and derived caches) stay valid
+            self._versions.pop(id(entry.value), None)
+            entry.value, entry.version = value, next(self._version_counter)
+            self._versions[id(value)] = entry.version
+
+    def version_of(self, value):
+        """Version of a value returned by get(); changes only when that key's data changes.
+
+        A value the cache does not (or no longer) hold gets a new version on every call, so
+        a derived cache never reuses a result built from other data.
+        """
+        with self._lock:
+            version = self._versions.get(id(value))
+            return version if version is not None else next(self._version_counter)
+
+    def is_loaded(self, key):
+        """True once `key` holds a value (fresh or stale), i.e. get() will return without waiting."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry.loaded_at is not None
+
+    def _count(self, stat):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _take_fingerprint(self, key, fingerprint):
+        if fingerprint is None:
+            return None
+        try:
+            return fingerprint()
+        except Exception as e:
+            self._count("fingerprint_failures")
+            print(f"Warning: change-detection probe failed for {_describe(key)!r}, reloading in full: {e}")
+            return None
+
+    def get(self, key, loader, fingerprint=None):
+        """Return the cached value for `key`, calling `loader()` only when it is missing or stale.
+
+        With a `fingerprint` callable, a stale value whose fingerprint is unchanged is kept
+        (and its TTL restarted) instead of being reloaded.
+        """
+        entry = self._entry(key)
+        loaded_at = entry.loaded_at
+        if loaded_at is not None:
+            if time.monotonic() - loaded_at >= self.ttl:
+                self._refresh_in_background(key, entry, loader, fingerprint)
+                note_cache_outcome("stale")
+            else:
+                note_cache_outcome("hit")
+            return entry.value
+
+        # Cold key: load in the foreground, once, however many sessions are waiting.
+        with entry.load_lock:
+            if entry.loaded_at is None:
+                if entry.error is not None and time.monotonic() < entry.retry_at:
+                    note_cache_outcome("error")
+                    raise entry.error
+                note_cache_outcome("miss")
+                try:
+                    # Fingerprint first: a change that lands mid-load then shows up as a change next time.
+                    new_fingerprint = self._take_fingerprint(key, fingerprint)
+                    self._store(entry, loader(), new_fingerprint)
+                except Exception as e:
+                    note_cache_outcome("error")
+                    entry.error, entry.retry_at = e, time.monotonic() + RETRY_AFTER_SECONDS
+                    raise
+                entry.error = None
+            else:
+                note_cache_outcome("hit")  # another session finished the load while this one waited
+            return entry.value
+
+    def _refresh_in_background(self, key, entry, loader, fingerprint=None):
+        with self._lock:
+            now = time.monotonic()
+            if entry.refreshing or now < entry.retry_at:
+                return
+            entry.refreshing = True
+
+        def refresh():
+            start = time.perf_counter()
+            outcome = "failed"
+            try:
+                new_fingerprint = self._take_fingerprint(key, fingerprint)
+                if new_fingerprint is not None and new_fingerprint == entry.fingerprint:
+                    # Unchanged since the last load: keep the value (and its version, so
+                    # derived caches stay valid) and restart its TTL.
+                    with self._lock:
+                        entry.loaded_at = time.monotonic()
+                    outcome = "unchanged"
+                    self._count("refreshes_avoided")
+                else:
+                    self._store(entry, loader(), new_fingerprint)
+                    outcome = "reloaded"
+                    self._count("refreshes")
+            except Exception as e:
+                entry.retry_at = time.monotonic() + RETRY_AFTER_SECONDS
+                self._count("refresh_failures")
+                print(f"Warning: background refresh failed, serving stale data for {_describe(key)!r}: {e}")
+            finally:
+                entry.refreshing = False
+            record_refresh(_describe(key), outcome, time.perf_counter() - start)
+
+        threading.Thread(target=refresh, name="swr-refresh", daemon=True).start()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+
+
+def _same_data(old, new):
+    if isinstance(old, pd.DataFrame) and isinstance(new, pd.DataFrame):
+        return old.columns.equals(new.columns) and old.dtypes.equals(new.dtypes) and old.equals(new)
+    return False
+
+
+def _describe(key):
+    return " ".join(str(key).split())[:80]
+
+
+# Shared by all pages: one entry per CULTURE_HERITAGE query.
+culture_heritage_cache = StaleWhileRevalidateCache()
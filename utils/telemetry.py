@@ -0,0 +1,191 @@
+"""
+Telemetry for the CULTURE_HERITAGE data loaders.
+
+`@instrument_loader("name")` records every call of a loader: wall time, rows, approximate
+bytes, cache outcome, data backend and session. Records are kept in a process-wide ring
+buffer for the debug sidebar panel (opt-in: add ?debug=1 to the URL or set
+CULTURAL_CANVAS_DEBUG=1). The JSON-lines log is opt-in too: it is written to
+CULTURAL_CANVAS_TELEMETRY_LOG if set (or "off"), else to logs/loader_telemetry.jsonl when
+CULTURAL_CANVAS_DEBUG=1.
+
+Cache outcomes:
+  hit    served from a cache without calling the backend
+  stale  served a stale value while a background refresh was started
+  miss   the backend was queried before returning
+  error  the loader raised
+
+Background refreshes of the stale-while-revalidate cache are logged as "refresh" events
+with outcome unchanged (skipped by the change-detection probe), reloaded or failed.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from utils.dtypes import memory_report
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEBUG_ENABLED = os.environ.get("CULTURAL_CANVAS_DEBUG", "").strip().lower() in ("1", "true", "yes")
+TELEMETRY_LOG_PATH = os.environ.get(
+    "CULTURAL_CANVAS_TELEMETRY_LOG",
+    os.path.join(REPO_ROOT, "logs", "loader_telemetry.jsonl") if DEBUG_ENABLED else "off")
+MAX_RECORDS = 1000
+BYTES_SAMPLE_ROWS = 1000
+
+_records = deque(maxlen=MAX_RECORDS)
+_log_lock = threading.Lock()
+_local = threading.local()
+
+
+def note_cache_outcome(outcome):
+    """Called by caches (or a cached function's body, which only runs on a miss) during a loader call."""
+    _local.outcome = outcome
+
+
+def approximate_bytes(value):
+    """In-memory size of a loader result, extrapolated from the first BYTES_SAMPLE_ROWS rows."""
+    if isinstance(value, pd.DataFrame):
+        if len(value) <= BYTES_SAMPLE_ROWS:
+            return int(value.memory_usage(deep=True, index=False).sum())
+        sample = value.iloc[:BYTES_SAMPLE_ROWS].memory_usage(deep=True, index=False).sum()
+        return int(sample * len(value) / BYTES_SAMPLE_ROWS)
+    if isinstance(value, (tuple, list)):
+        return sum(approximate_bytes(item) for item in value)
+    if isinstance(value, dict):
+        return sum(approximate_bytes(item) for item in value.values())
+    return 0
+
+
+def _count_rows(value):
+    if isinstance(value, pd.DataFrame):
+        return len(value)
+    items = list(value.values()) if isinstance(value, dict) else value
+    if isinstance(items, (tuple, list)):
+        if any(isinstance(item, pd.DataFrame) for item in items):
+            return sum(_count_rows(item) for item in items)  # e.g. (page, cursor) or {name: table}
+        return len(items) if isinstance(value, list) else 0
+    return 0
+
+
+def _current_session_id():
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx is not None else None
+
+
+def _current_backend():
+    from utils.connection import DATA_MODE  # imported late: utils.connection imports the caches that report here
+
+    return DATA_MODE
+
+
+def _append_to_log(record):
+    if not TELEMETRY_LOG_PATH or TELEMETRY_LOG_PATH.lower() == "off":
+        return
+    try:
+        with _log_lock:
+            os.makedirs(os.path.dirname(TELEMETRY_LOG_PATH) or ".", exist_ok=True)
+            with open(TELEMETRY_LOG_PATH, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+    except OSError as e:
+        print(f"Warning: could not write loader telemetry to {TELEMETRY_LOG_PATH}: {e}")
+
+
+def instrument_loader(name):
+    """Decorator recording a telemetry record for every call of a data loader."""
+    def decorator(loader):
+        @functools.wraps(loader)
+        def wrapper(*args, **kwargs):
+            outer_outcome = getattr(_local, "outcome", None)  # loaders may call other loaders
+            _local.outcome = None
+            start = time.perf_counter()
+            result, error = None, None
+            try:
+                result = loader(*args, **kwargs)
+                return result
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                raise
+            finally:
+                wall_ms = (time.perf_counter() - start) * 1000
+                outcome = "error" if error else (_local.outcome or "hit")
+                _local.outcome = outer_outcome
+                record = {
+                    "ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+                    "event": "load", "loader": name, "wall_ms": round(wall_ms, 2),
+                    "rows": _count_rows(result), "bytes": approximate_bytes(result),
+                    "cache": outcome, "backend": _current_backend(),
+                    "session": _current_session_id(), "error": error,
+                }
+                _records.append(record)
+                _append_to_log(record)
+        return wrapper
+    return decorator
+
+
+def record_refresh(key, outcome, wall_seconds):
+    """Log a background cache refresh: 'unchanged' (fingerprint matched), 'reloaded' or 'failed'."""
+    _append_to_log({
+        "ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+        "event": "refresh", "key": key, "outcome": outcome, "wall_ms": round(wall_seconds * 1000, 2),
+        "backend": _current_backend(),
+    })
+
+
+def get_records(session_id=None):
+    """Telemetry records still in the ring buffer, optionally only those of one session."""
+    records = list(_records)
+    if session_id is not None:
+        records = [r for r in records if r["session"] == session_id]
+    return records
+
+
+def summarize_records(records):
+    """Per-loader calls, hit rate and latency percentiles as a DataFrame."""
+    if not records:
+        return pd.DataFrame()
+    df = pd.DataFrame(records)
+    grouped = df.groupby("loader")
+    return pd.DataFrame({
+        "calls": grouped.size(),
+        "hit_rate": grouped["cache"].apply(lambda s: s.isin(["hit", "stale"]).mean()).round(2),
+        "p50_ms": grouped["wall_ms"].median().round(1),
+        "p95_ms": grouped["wall_ms"].quantile(0.95).round(1),
+        "max_ms": grouped["wall_ms"].max().round(1),
+        "last_rows": grouped["rows"].last(),
+        "last_kib": (grouped["bytes"].last() / 1024).round(1),
+    }).sort_values("p95_ms", ascending=False)
+
+
+def render_telemetry_panel():
+    """Sidebar panel with this session's loader telemetry; only shown when debugging is enabled."""
+    import streamlit as st
+
+    if not (DEBUG_ENABLED or st.query_params.get("debug") in ("1", "true")):
+        return
+    records = get_records(_current_session_id())
+    with st.sidebar.expander("🛠️ Loader telemetry", expanded=True):
+        if not records:
+            st.caption("No loader calls recorded in this session yet.")
+            return
+        st.caption(f"Backend: {records[-1]['backend']} • {len(records)} calls this session")
+        st.dataframe(summarize_records(records), use_container_width=True)
+        recent = pd.DataFrame(records[-20:][::-1])[["loader", "wall_ms", "rows", "bytes", "cache"]]
+        st.dataframe(recent, hide_index=True, use_container_width=True)
+        from utils.swr_cache import culture_heritage_cache  # imported late: the cache reports here
+
+        stats = culture_heritage_cache.stats
+        st.caption(f"Background refreshes: {stats['refreshes']} reloaded, {stats['refreshes_avoided']} "
+                   f"skipped as unchanged, {stats['refresh_failures']} failed")
+        memory = memory_report()
+        if not memory.empty:
+            st.caption("Cached table memory (bytes) before and after dtype compaction")
+            st.dataframe(memory, use_container_width=True)
+        if TELEMETRY_LOG_PATH and TELEMETRY_LOG_PATH.lower() != "off":
+            st.caption(f"Full log: `{TELEMETRY_LOG_PATH}`")